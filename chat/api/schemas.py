@@ -0,0 +1,117 @@
+# chat/api/schemas.py
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from ninja import ModelSchema, Field
+from ninja.schema import Schema
+from core.models import Profil
+from chat.models import Groupe, MembreGroupe, Message, Televersement
+
+
+class MessageAuteurSchema(ModelSchema):
+    """Champs d'affichage de l'auteur d'un message"""
+    photo_profil: Optional[str] = None
+
+    class Meta:
+        model = Profil
+        fields = ['id', 'nom_complet', 'photo_profil']
+
+    @staticmethod
+    def resolve_photo_profil(obj):
+        return obj.photo_profil.url if obj.photo_profil else None
+
+
+class MessageOutSchema(ModelSchema):
+    auteur: MessageAuteurSchema
+    fichier: Optional[str] = None
+
+    class Meta:
+        model = Message
+        fields = ['id', 'groupe', 'texte', 'fichier', 'type_fichier', 'created_at']
+
+    @staticmethod
+    def resolve_auteur(obj):
+        return obj.profil
+
+    @staticmethod
+    def resolve_fichier(obj):
+        return obj.fichier.url if obj.fichier else None
+
+
+class MessageCreateSchema(Schema):
+    """Message texte envoyé dans un groupe"""
+    texte: str = Field(..., min_length=1, max_length=5000)
+
+
+class DernierMessageSchema(Schema):
+    """Aperçu du dernier message d'un groupe"""
+    id: UUID
+    auteur: str
+    apercu: str
+    type_fichier: Optional[str] = None
+    created_at: datetime
+
+
+class BoiteReceptionSchema(ModelSchema):
+    """Groupe de la boîte de réception : aperçu du dernier message, non lus et rôle de l'utilisateur"""
+    photo_groupe: Optional[str] = None
+    dernier_message: Optional[DernierMessageSchema] = None
+    non_lus: int
+    role_membre: str
+
+    class Meta:
+        model = Groupe
+        fields = ['id', 'nom_groupe', 'photo_groupe', 'type_groupe', 'derniere_activite']
+
+    @staticmethod
+    def resolve_photo_groupe(obj):
+        return obj.photo_groupe.url if obj.photo_groupe else None
+
+    @staticmethod
+    def resolve_dernier_message(obj):
+        if obj.dernier_message_id is None:
+            return None
+        return {
+            'id': obj.dernier_message_id,
+            'auteur': obj.dernier_message_auteur,
+            'apercu': obj.dernier_message_apercu,
+            'type_fichier': obj.dernier_message_type_fichier,
+            'created_at': obj.derniere_activite,
+        }
+
+
+class LectureOutSchema(ModelSchema):
+    """Position de lecture de l'utilisateur dans un groupe"""
+
+    class Meta:
+        model = MembreGroupe
+        fields = ['groupe', 'dernier_message_lu', 'lu_jusqu_au', 'non_lus']
+
+
+class LectureSchema(Schema):
+    """Position de lecture ; sans `message_id`, le groupe est marqué lu jusqu'au dernier message"""
+    message_id: Optional[UUID] = None
+
+
+class TeleversementCreateSchema(Schema):
+    """Déclaration d'une pièce jointe avant l'envoi de ses morceaux"""
+    nom_fichier: str = Field(..., min_length=1, max_length=255)
+    taille: int = Field(..., gt=0)
+
+
+class TeleversementOutSchema(ModelSchema):
+    """État d'un téléversement : la reprise renvoie les morceaux manquants uniquement"""
+    morceaux_recus: List[int]
+
+    class Meta:
+        model = Televersement
+        fields = ['id', 'groupe', 'nom_fichier', 'taille', 'taille_morceau', 'nombre_morceaux', 'statut', 'message']
+
+    @staticmethod
+    def resolve_morceaux_recus(obj):
+        return getattr(obj, 'morceaux_recus', [])
+
+
+class TeleversementFinSchema(Schema):
+    """Légende facultative publiée avec la pièce jointe"""
+    texte: str = Field('', max_length=5000)
@@ -0,0 +1,140 @@
+# chat/api/views.py
+from typing import List
+from uuid import UUID
+from ninja import Router
+from ninja.pagination import paginate
+from django.http import HttpRequest
+from core.services.auth_service import jwt_auth
+from core.api.schemas import MessageSchema, ValidationErrorSchema
+from core.api.pagination import KeysetPagination
+from chat.services.message_service import message_service
+from chat.services.groupe_service import groupe_service
+from chat.services.televersement_service import televersement_service
+from .schemas import (
+    MessageOutSchema, MessageCreateSchema, BoiteReceptionSchema, LectureSchema, LectureOutSchema,
+    TeleversementCreateSchema, TeleversementOutSchema, TeleversementFinSchema
+)
+
+chat_router = Router(tags=["Messagerie"])
+
+
+@chat_router.get(
+    "/groupes",
+    response=List[BoiteReceptionSchema],
+    auth=jwt_auth,
+    summary="Boîte de réception : mes groupes par activité récente"
+)
+@paginate(KeysetPagination, ordering_field='derniere_activite')
+def inbox_endpoint(request: HttpRequest):
+    """
+    Groupes de l'utilisateur, du plus récemment actif au plus ancien, avec l'aperçu du dernier
+    message et le nombre de non lus. Une requête par page : aperçu et compteurs sont stockés
+    sur le groupe et l'adhésion, la table des messages n'est pas lue.
+    """
+    return groupe_service.inbox(acting_user=request.auth)  # type: ignore
+
+
+@chat_router.post(
+    "/groupes/{groupe_id}/lecture",
+    response={200: LectureOutSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Marquer les messages d'un groupe comme lus"
+)
+def mark_read_endpoint(request: HttpRequest, groupe_id: UUID, payload: LectureSchema):
+    return groupe_service.mark_read(acting_user=request.auth, groupe_id=groupe_id, message_id=payload.message_id)  # type: ignore
+
+
+@chat_router.get(
+    "/groupes/{groupe_id}/messages",
+    response=List[MessageOutSchema],
+    auth=jwt_auth,
+    summary="Historique des messages d'un groupe"
+)
+@paginate(KeysetPagination)
+def list_messages_endpoint(request: HttpRequest, groupe_id: UUID):
+    """
+    Du plus récent au plus ancien ; `next_cursor` permet de remonter l'historique.
+    """
+    return message_service.list_messages(acting_user=request.auth, groupe_id=groupe_id)  # type: ignore
+
+
+@chat_router.post(
+    "/groupes/{groupe_id}/messages",
+    response={201: MessageOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Envoyer un message dans un groupe"
+)
+def post_message_endpoint(request: HttpRequest, groupe_id: UUID, payload: MessageCreateSchema):
+    """
+    Enregistre le message puis le diffuse aux membres connectés (WebSocket /ws/chat/groupes/{groupe_id}/).
+    """
+    return 201, message_service.post_message(acting_user=request.auth, groupe_id=groupe_id, texte=payload.texte)  # type: ignore
+
+
+@chat_router.delete(
+    "/messages/{message_id}",
+    response={204: None, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Supprimer un message"
+)
+def delete_message_endpoint(request: HttpRequest, message_id: UUID):
+    message_service.delete_message(acting_user=request.auth, message_id=message_id)  # type: ignore
+    return 204, None
+
+# ==========================================
+# Pièces jointes : téléversement par morceaux
+# ==========================================
+
+@chat_router.post(
+    "/groupes/{groupe_id}/televersements",
+    response={201: TeleversementOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Démarrer le téléversement d'une pièce jointe"
+)
+def create_upload_endpoint(request: HttpRequest, groupe_id: UUID, payload: TeleversementCreateSchema):
+    """
+    Déclare le fichier ; la réponse indique la taille des morceaux et leur nombre.
+    Chaque morceau s'envoie ensuite avec PUT /chat/televersements/{id}/morceaux/{numero}.
+    """
+    return 201, televersement_service.create(
+        acting_user=request.auth, groupe_id=groupe_id, nom_fichier=payload.nom_fichier, taille=payload.taille  # type: ignore
+    )
+
+
+@chat_router.get(
+    "/televersements/{televersement_id}",
+    response={200: TeleversementOutSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="État d'un téléversement (reprise)"
+)
+def upload_status_endpoint(request: HttpRequest, televersement_id: UUID):
+    return televersement_service.get_status(acting_user=request.auth, televersement_id=televersement_id)  # type: ignore
+
+
+@chat_router.put(
+    "/televersements/{televersement_id}/morceaux/{numero}",
+    response={200: TeleversementOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Envoyer un morceau de pièce jointe"
+)
+def upload_chunk_endpoint(request: HttpRequest, televersement_id: UUID, numero: int):
+    """
+    Corps de la requête : les octets bruts du morceau (application/octet-stream), lus en flux.
+    En-tête X-Checksum-Sha256 : empreinte SHA-256 du morceau, en hexadécimal.
+    """
+    return televersement_service.write_chunk(
+        acting_user=request.auth, televersement_id=televersement_id, index=numero,  # type: ignore
+        stream=request, checksum=request.headers.get('X-Checksum-Sha256')  # type: ignore
+    )
+
+
+@chat_router.post(
+    "/televersements/{televersement_id}/fin",
+    response={201: MessageOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Finaliser un téléversement et publier la pièce jointe"
+)
+def complete_upload_endpoint(request: HttpRequest, televersement_id: UUID, payload: TeleversementFinSchema):
+    return 201, televersement_service.complete(
+        acting_user=request.auth, televersement_id=televersement_id, texte=payload.texte  # type: ignore
+    )
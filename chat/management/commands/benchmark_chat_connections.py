@@ -0,0 +1,76 @@
+# chat/management/commands/benchmark_chat_connections.py
+import asyncio
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from chat.realtime.pubsub import InMemoryPubSub
+from chat.realtime.websocket import GroupConnection, CLOSE_SLOW_CONSUMER
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge la couche temps réel avec des milliers de connexions WebSocket inactives simulées "
+        "(mémoire par connexion, temps de diffusion, déconnexion des clients lents)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=5000)
+        parser.add_argument('--messages', type=int, default=20)
+        parser.add_argument('--slow', type=int, default=10, help="Connexions dont le client ne lit jamais")
+        parser.add_argument('--queue-size', type=int, default=10)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(**options))
+
+    async def run(self, connections, messages, slow, queue_size, **options):
+        pubsub = InMemoryPubSub()
+        channel = 'chat.groupe.benchmark'
+        received = [0]
+        closed = []
+        expected = (connections - slow) * messages
+        all_delivered = asyncio.Event()
+        disconnect = asyncio.Event()
+        stalled = asyncio.Event()  # Jamais déclenché : l'envoi aux clients lents reste bloqué
+
+        def make_send(is_slow):
+            async def send(event):
+                if event['type'] == 'websocket.close':
+                    closed.append(event['code'])
+                elif is_slow:
+                    await stalled.wait()
+                else:
+                    received[0] += 1
+                    if received[0] == expected:
+                        all_delivered.set()
+            return send
+
+        async def receive():
+            await disconnect.wait()  # Connexion inactive : le client n'envoie rien
+            return {'type': 'websocket.disconnect'}
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tasks = []
+        for index in range(connections):
+            connection = GroupConnection(make_send(index < slow), queue_size)
+            pubsub.subscribe(channel, connection.deliver)
+            tasks.append(asyncio.ensure_future(connection.run(receive, None, None)))
+        await asyncio.sleep(0.1)
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / connections
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for number in range(messages):
+            pubsub.publish(channel, {'type': 'message', 'message': {'texte': f'message {number}'}})
+            await asyncio.sleep(0)
+        await asyncio.wait_for(all_delivered.wait(), timeout=120)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"{connections} connexions inactives : {per_connection / 1024:.1f} Ko par connexion")
+        self.stdout.write(
+            f"{messages} messages diffusés à {connections - slow} clients en {elapsed * 1000:.0f} ms "
+            f"({expected / elapsed:,.0f} envois/s)"
+        )
+        self.stdout.write(f"Clients lents déconnectés (file de {queue_size}) : {closed.count(CLOSE_SLOW_CONSUMER)}/{slow}")
+        disconnect.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_time_ordered_ids'),
+        ('core', '0002_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('deleted', False), ('est_supprime', False)), fields=['groupe', '-created_at', '-id'], name='message_groupe_date_idx'),
+        ),
+    ]
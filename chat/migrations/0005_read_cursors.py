@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_message_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membregroupe',
+            name='dernier_message_lu',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.AddField(
+            model_name='membregroupe',
+            name='lu_jusqu_au',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='membregroupe',
+            name='non_lus',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def populate_dernier_message(apps, schema_editor):
+    Groupe = apps.get_model('chat', 'Groupe')
+    Message = apps.get_model('chat', 'Message')
+    for groupe in Groupe.objects.all().iterator():
+        message = Message.objects.filter(groupe=groupe, deleted=False, est_supprime=False).select_related('profil').order_by(
+            '-created_at', '-id'
+        ).first()
+        if message is None:
+            Groupe.objects.filter(id=groupe.id).update(derniere_activite=groupe.created_at)
+            continue
+        Groupe.objects.filter(id=groupe.id).update(
+            derniere_activite=message.created_at,
+            dernier_message=message,
+            dernier_message_auteur=message.profil.nom_complet,
+            dernier_message_apercu=Truncator(message.texte or '').chars(140),
+            dernier_message_type_fichier=message.type_fichier,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_read_cursors'),
+        ('core', '0002_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupe',
+            name='dernier_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.AddField(
+            model_name='groupe',
+            name='dernier_message_apercu',
+            field=models.CharField(blank=True, default='', max_length=140),
+        ),
+        migrations.AddField(
+            model_name='groupe',
+            name='dernier_message_auteur',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='groupe',
+            name='dernier_message_type_fichier',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='groupe',
+            name='derniere_activite',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(populate_dernier_message, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='groupe',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['-derniere_activite', '-id'], name='groupe_activite_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membregroupe',
+            index=models.Index(fields=['profil', 'est_actif'], name='membre_groupe_profil_idx'),
+        ),
+    ]
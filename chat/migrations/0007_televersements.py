@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:32
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0006_inbox_snapshot'),
+        ('core', '0002_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Televersement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('nom_fichier', models.CharField(max_length=255)),
+                ('taille', models.PositiveBigIntegerField()),
+                ('taille_morceau', models.PositiveIntegerField()),
+                ('nombre_morceaux', models.PositiveIntegerField()),
+                ('statut', models.CharField(choices=[('en_cours', 'En cours'), ('assemblage', 'Assemblage'), ('termine', 'Terminé')], default='en_cours', max_length=20)),
+                ('groupe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='televersements', to='chat.groupe')),
+                ('message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message')),
+                ('profil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.profil')),
+            ],
+            options={
+                'db_table': 'televersement',
+                'indexes': [models.Index(fields=['updated_at'], name='televersement_maj_idx')],
+            },
+        ),
+    ]
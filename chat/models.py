@@ -1,5 +1,6 @@
 from django.db import models
-from core.models import ENSPMHubBaseModel
+from django.utils import timezone
+from core.models import ENSPMHubBaseModel, uuid7
 
 
 # ==========================================
@@ -19,9 +20,19 @@ class Groupe(ENSPMHubBaseModel):
     est_valide = models.BooleanField(default=False)
     type_groupe = models.CharField(max_length=20, choices=TYPE_GROUPE_CHOICES, default='prive')
     max_membres = models.PositiveIntegerField(null=True, blank=True)
+    # Aperçu du dernier message, tenu à jour par MessageService (envoi et suppression) :
+    # la boîte de réception se lit sans toucher à la table des messages
+    derniere_activite = models.DateTimeField(default=timezone.now)  # Date du dernier message, ou de création
+    dernier_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    dernier_message_auteur = models.CharField(max_length=255, blank=True, default='')
+    dernier_message_apercu = models.CharField(max_length=140, blank=True, default='')
+    dernier_message_type_fichier = models.CharField(max_length=20, null=True, blank=True)
 
     class Meta:
         db_table = 'groupe'
+        indexes = [
+            models.Index(fields=['-derniere_activite', '-id'], name='groupe_activite_idx', condition=models.Q(deleted=False)),
+        ]
 
 
 class MembreGroupe(ENSPMHubBaseModel):
@@ -33,10 +44,18 @@ class MembreGroupe(ENSPMHubBaseModel):
     date_adhesion = models.DateTimeField(auto_now_add=True)
     date_sortie = models.DateTimeField(null=True, blank=True)
     est_actif = models.BooleanField(default=True)
+    # Curseur de lecture : dernier message lu et sa date (copiée pour les recalculs ensemblistes)
+    dernier_message_lu = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    lu_jusqu_au = models.DateTimeField(null=True, blank=True)
+    non_lus = models.PositiveIntegerField(default=0)  # Tenu à jour par MessageService / GroupeService
 
     class Meta:
         db_table = 'membre_groupe'
         unique_together = ('profil', 'groupe')
+        indexes = [
+            # Point d'entrée de la boîte de réception : les groupes actifs d'un profil
+            models.Index(fields=['profil', 'est_actif'], name='membre_groupe_profil_idx'),
+        ]
 
 
 class Message(ENSPMHubBaseModel):
@@ -45,6 +64,7 @@ class Message(ENSPMHubBaseModel):
         ('powerpoint', 'PowerPoint'), ('video', 'Vidéo')
     ]
 
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)  # Table à forte croissance : UUID ordonné
     groupe = models.ForeignKey(Groupe, on_delete=models.CASCADE, related_name='messages')
     profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE)
     texte = models.TextField(null=True, blank=True)
@@ -55,6 +75,35 @@ class Message(ENSPMHubBaseModel):
     class Meta:
         db_table = 'message'
         ordering = ['created_at']
+        indexes = [
+            # Historique d'un groupe par curseur, du plus récent au plus ancien. Index partiel :
+            # les messages supprimés n'y figurent pas, la lecture n'a aucune ligne à écarter.
+            models.Index(
+                fields=['groupe', '-created_at', '-id'], name='message_groupe_date_idx',
+                condition=models.Q(deleted=False, est_supprime=False)
+            ),
+        ]
+
+
+class Televersement(ENSPMHubBaseModel):
+    """Téléversement par morceaux d'une pièce jointe, avant sa publication en message"""
+    STATUT_CHOICES = [('en_cours', 'En cours'), ('assemblage', 'Assemblage'), ('termine', 'Terminé')]
+
+    groupe = models.ForeignKey(Groupe, on_delete=models.CASCADE, related_name='televersements')
+    profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE)
+    nom_fichier = models.CharField(max_length=255)
+    taille = models.PositiveBigIntegerField()
+    taille_morceau = models.PositiveIntegerField()
+    nombre_morceaux = models.PositiveIntegerField()
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_cours')
+    message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        db_table = 'televersement'
+        indexes = [
+            # Nettoyage des téléversements abandonnés
+            models.Index(fields=['updated_at'], name='televersement_maj_idx'),
+        ]
 
 
 class ValidationGroupe(ENSPMHubBaseModel):
@@ -0,0 +1,140 @@
+# chat/realtime/pubsub.py
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('app')
+
+Callback = Callable[[dict], None]
+
+
+class InMemoryPubSub:
+    """
+    Diffusion en mémoire, limitée au processus courant (un seul worker ASGI).
+
+    `publish` peut être appelé depuis n'importe quel thread (code Django synchrone compris) :
+    les abonnés sont rappelés dans la boucle asyncio où ils se sont abonnés, avec un seul
+    réveil de chaque boucle par message, quel que soit le nombre d'abonnés.
+    """
+    def __init__(self, **options):
+        self._subscribers: Dict[str, Dict[asyncio.AbstractEventLoop, Set[Callback]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str, callback: Callback) -> Callable[[], None]:
+        """Abonne `callback` au canal (depuis une coroutine) ; retourne la fonction de désabonnement."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(channel, {}).setdefault(loop, set()).add(callback)
+
+        def unsubscribe():
+            with self._lock:
+                loops = self._subscribers.get(channel, {})
+                callbacks = loops.get(loop)
+                if callbacks is not None:
+                    callbacks.discard(callback)
+                    if not callbacks:
+                        del loops[loop]
+                    if not loops:
+                        self._subscribers.pop(channel, None)
+        return unsubscribe
+
+    @staticmethod
+    def _deliver(callbacks: List[Callback], message: dict):
+        for callback in callbacks:
+            callback(message)
+
+    def _dispatch(self, channel: str, message: dict):
+        with self._lock:
+            targets = [(loop, list(callbacks)) for loop, callbacks in self._subscribers.get(channel, {}).items()]
+        for loop, callbacks in targets:
+            try:
+                loop.call_soon_threadsafe(InMemoryPubSub._deliver, callbacks, message)
+            except RuntimeError:
+                pass  # Boucle fermée : ses abonnés disparaissent avec elle
+
+    def publish(self, channel: str, message: dict):
+        self._dispatch(channel, message)
+
+
+class SqlitePubSub(InMemoryPubSub):
+    """
+    Diffusion entre plusieurs workers d'une même machine, via un fichier SQLite partagé.
+
+    Les messages publiés sont insérés dans une table ; chaque processus abonné la relit
+    toutes les `poll_interval` secondes depuis son dernier identifiant lu (une requête par
+    processus, quel que soit le nombre de connexions) et distribue localement. Les lignes
+    de plus de `retention` secondes sont purgées. Solution locale, sans serveur : un
+    broker dédié (Redis...) se branche de la même manière via CHAT_PUBSUB.
+    """
+    def __init__(self, path: Optional[str] = None, poll_interval: float = 0.1, retention: int = 60, **options):
+        super().__init__(**options)
+        self.path = path or os.path.join(settings.BASE_DIR, 'chat_pubsub.db')
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._poller: Optional[threading.Thread] = None
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS pubsub_message ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, payload TEXT NOT NULL, created REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def subscribe(self, channel: str, callback: Callback) -> Callable[[], None]:
+        unsubscribe = super().subscribe(channel, callback)
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='chat-pubsub-poller', daemon=True)
+                self._poller.start()
+        return unsubscribe
+
+    def publish(self, channel: str, message: dict):
+        # Pas de distribution locale directe : le poller de ce processus la fera, comme pour les autres
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT INTO pubsub_message (channel, payload, created) VALUES (?, ?, ?)',
+                (channel, json.dumps(message), time.time())
+            )
+
+    def _poll(self):
+        connection = self._connect()
+        last_id = connection.execute('SELECT COALESCE(MAX(id), 0) FROM pubsub_message').fetchone()[0]
+        last_purge = time.monotonic()
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                rows = connection.execute(
+                    'SELECT id, channel, payload FROM pubsub_message WHERE id > ? ORDER BY id', (last_id,)
+                ).fetchall()
+                for row_id, channel, payload in rows:
+                    last_id = row_id
+                    self._dispatch(channel, json.loads(payload))
+                if time.monotonic() - last_purge > self.retention:
+                    with connection:
+                        connection.execute('DELETE FROM pubsub_message WHERE created < ?', (time.time() - self.retention,))
+                    last_purge = time.monotonic()
+            except sqlite3.Error as e:
+                logger.warning(f"Lecture du pub/sub SQLite impossible : {e}")
+
+
+_pubsub = None
+_pubsub_lock = threading.Lock()
+
+
+def get_pubsub():
+    """Retourne l'instance du backend configuré dans settings.CHAT_PUBSUB (créée au premier appel)."""
+    global _pubsub
+    with _pubsub_lock:
+        if _pubsub is None:
+            config = settings.CHAT_PUBSUB
+            _pubsub = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+        return _pubsub
@@ -0,0 +1,190 @@
+# chat/realtime/websocket.py
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Optional, Tuple
+from urllib.parse import parse_qs
+from uuid import UUID
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from core.api.exceptions import BaseAPIException
+from core.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from core.services.auth_service import JWTAuthBearer
+from chat.realtime.pubsub import get_pubsub
+from chat.services.message_service import MessageService
+
+logger = logging.getLogger('app')
+
+GROUPE_PATH = re.compile(r'^/ws/chat/groupes/(?P<groupe_id>[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})/?$')
+
+# Codes de fermeture applicatifs (plage 4000-4999)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_SLOW_CONSUMER = 4008
+
+
+def _db(func):
+    """
+    Exécute `func` dans un thread du pool, puis ferme les connexions base de données de ce thread.
+    thread_sensitive=False : les appels des différentes connexions ne sont pas sérialisés
+    sur l'unique thread synchrone du worker (comme OrganisationPageService._in_thread).
+    close_old_connections() ne suffirait pas : il ne ferme que les connexions expirées
+    (CONN_MAX_AGE) ou en erreur, et celles des threads du pool resteraient ouvertes.
+    """
+    def wrapped(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return sync_to_async(wrapped, thread_sensitive=False)
+
+
+def _authenticate(token: Optional[str], groupe_id: UUID) -> Tuple[Optional[User], Optional[UUID], int]:
+    """
+    Retourne l'utilisateur et son profil si le jeton est valide et qu'il est membre actif du groupe,
+    sinon le code de fermeture.
+    """
+    user = JWTAuthBearer().authenticate(None, token) if token else None
+    if user is None:
+        return None, None, CLOSE_UNAUTHORIZED
+    membership = MessageService.get_membership(user, groupe_id)
+    if membership is None:
+        return None, None, CLOSE_FORBIDDEN
+    return user, membership.profil_id, 0  # type: ignore
+
+
+class GroupConnection:
+    """
+    Connexion WebSocket d'un membre à un groupe.
+
+    Les messages diffusés sont déposés dans une file bornée (CHAT_WS_QUEUE_SIZE) vidée par
+    une seule tâche d'écriture. Un client qui ne lit pas assez vite remplit sa file : la
+    tâche d'écriture, bloquée sur son envoi, est annulée et le client déconnecté (code 4008)
+    plutôt que de faire grossir la mémoire du worker ; à la reconnexion, il relit l'historique.
+    Le membre est aussi déconnecté quand son jeton expire (4401) ou qu'il quitte le groupe
+    (4403) : événement `adhesion` publié par chat.signals, et revérification périodique de
+    l'adhésion pour les retraits faits sans signal.
+    """
+    CLOSE_TIMEOUT = 5  # secondes
+
+    def __init__(self, send, queue_size: int, profil_id: Optional[UUID] = None):
+        self.send = send
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.profil_id = profil_id
+        self.close_code: Optional[int] = None
+        self._writer: Optional[asyncio.Future] = None
+
+    def close(self, code: int):
+        """Demande la fermeture de la connexion avec `code` ; la première demande l'emporte."""
+        if self.close_code is not None:
+            return
+        self.close_code = code
+        if self._writer is not None:
+            self._writer.cancel()
+
+    def deliver(self, message: dict):
+        """Rappel du pub/sub (dans la boucle asyncio) : ne bloque jamais."""
+        if self.close_code is not None:
+            return
+        if message.get('type') == 'adhesion':
+            # Événement de contrôle, jamais relayé au client
+            if self.profil_id is not None and message.get('profil_id') == str(self.profil_id):
+                self.close(CLOSE_FORBIDDEN)
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close(CLOSE_SLOW_CONSUMER)
+
+    async def write(self):
+        while True:
+            message = await self.queue.get()
+            await self.send({'type': 'websocket.send', 'text': json.dumps(message)})
+
+    async def read(self, receive, user: User, groupe_id: UUID):
+        post_message = _db(MessageService.post_message)
+        while True:
+            event = await receive()
+            if event['type'] == 'websocket.disconnect':
+                return
+            if event['type'] != 'websocket.receive':
+                continue
+            try:
+                data = json.loads(event.get('text') or event.get('bytes') or '{}')
+                await post_message(user, groupe_id, str(data.get('texte') or ''))
+            except (ValueError, AttributeError):
+                self.deliver({'type': 'erreur', 'detail': "Format attendu : {\"texte\": \"...\"}"})
+            except BaseAPIException as e:
+                self.deliver({'type': 'erreur', 'detail': e.detail})
+
+    async def watch(self, user: User, groupe_id: UUID):
+        """Revérifie l'adhésion toutes les CHAT_WS_RECHECK_INTERVAL secondes."""
+        get_membership = _db(MessageService.get_membership)
+        while True:
+            await asyncio.sleep(settings.CHAT_WS_RECHECK_INTERVAL)
+            if await get_membership(user, groupe_id) is None:
+                self.close(CLOSE_FORBIDDEN)
+                return
+
+    async def run(self, receive, user: Optional[User], groupe_id: Optional[UUID], expires_at: Optional[float] = None):
+        """Lit et écrit jusqu'à la déconnexion du client, sa saturation, l'expiration du jeton ou son retrait du groupe."""
+        self._writer = asyncio.ensure_future(self.write())
+        if self.close_code is not None:
+            self._writer.cancel()
+        tasks = [asyncio.ensure_future(self.read(receive, user, groupe_id)), self._writer]
+        if user is not None:
+            tasks.append(asyncio.ensure_future(self.watch(user, groupe_id)))  # type: ignore
+        expiry = None
+        if expires_at is not None:
+            expiry = asyncio.get_running_loop().call_later(max(0.0, expires_at - time.time()), self.close, CLOSE_UNAUTHORIZED)
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self.close_code is not None:
+            logger.info(f"Connexion WebSocket fermée par le serveur (code {self.close_code}).")
+            try:
+                await asyncio.wait_for(
+                    self.send({'type': 'websocket.close', 'code': self.close_code}), GroupConnection.CLOSE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+async def websocket_application(scope, receive, send):
+    """
+    Application ASGI des WebSockets : /ws/chat/groupes/{groupe_id}/?token=<JWT d'accès>.
+    Le navigateur ne pouvant pas envoyer d'en-tête Authorization, le jeton passe dans l'URL.
+    """
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+
+    match = GROUPE_PATH.match(scope['path'])
+    if match is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+    groupe_id = UUID(match['groupe_id'])
+    token = parse_qs(scope.get('query_string', b'').decode()).get('token', [None])[0]
+
+    user, profil_id, refus = await _db(_authenticate)(token, groupe_id)
+    if refus:
+        await send({'type': 'websocket.close', 'code': refus})
+        return
+
+    connection = GroupConnection(send, settings.CHAT_WS_QUEUE_SIZE, profil_id)
+    unsubscribe = get_pubsub().subscribe(MessageService.channel(groupe_id), connection.deliver)
+    await send({'type': 'websocket.accept'})
+    try:
+        await connection.run(receive, user, groupe_id, expires_at=AccessToken(token)['exp'])  # type: ignore
+    finally:
+        unsubscribe()
@@ -0,0 +1,111 @@
+# chat/services/groupe_service.py
+import logging
+from typing import Optional
+from uuid import UUID
+from django.db.models import Count, F, FilteredRelation, IntegerField, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
+from core.models import User
+from core.api.exceptions import PermissionDeniedAPIException
+from chat.models import Groupe, MembreGroupe, Message
+
+logger = logging.getLogger('app')
+
+
+class GroupeService:
+    """
+    Service managing the user's groups and their read state.
+
+    Each membership carries a read cursor (last read message and its date) and a
+    denormalised unread counter: MessageService increments it for the other members in
+    the same transaction as the message, reading resets it from the cursor, and a periodic
+    reconciliation recomputes it. Listing the user's groups never reads the message table.
+    """
+    RECONCILE_BATCH_SIZE = 1000
+
+    @staticmethod
+    def _unread_count(after_cursor: bool):
+        """
+        Subquery counting the messages of the membership's group posted by others since the
+        member joined, after its read cursor when it is set. Messages older than the membership
+        were never counted by post_message, so the recount ignores them too.
+        """
+        messages = Message.objects.filter(
+            groupe_id=OuterRef('groupe_id'), est_supprime=False, created_at__gt=OuterRef('date_adhesion')
+        ).exclude(profil_id=OuterRef('profil_id'))
+        if after_cursor:
+            messages = messages.filter(
+                Q(created_at__gt=OuterRef('lu_jusqu_au'))
+                | Q(created_at=OuterRef('lu_jusqu_au'), id__gt=OuterRef('dernier_message_lu_id'))
+            )
+        return Coalesce(
+            Subquery(messages.order_by().values('groupe_id').annotate(total=Count('id')).values('total')),
+            Value(0), output_field=IntegerField()
+        )
+
+    @staticmethod
+    def inbox(acting_user: User) -> QuerySet:
+        """
+        Returns the user's groups with their last-message snapshot, unread counter and role.
+        One query joining membre_groupe_profil_idx to the group rows; ordering by latest
+        activity is left to the keyset paginator.
+        """
+        adhesion = Q(membres__profil=acting_user.profil, membres__est_actif=True)  # type: ignore
+        return Groupe.objects.annotate(adhesion=FilteredRelation('membres', condition=adhesion)).filter(
+            adhesion__isnull=False
+        ).annotate(non_lus=F('adhesion__non_lus'), role_membre=F('adhesion__role_membre'))
+
+    @staticmethod
+    def mark_read(acting_user: User, groupe_id: UUID, message_id: Optional[UUID] = None) -> MembreGroupe:
+        """
+        Moves the user's read cursor to `message_id` (the latest message by default) and
+        recomputes the unread counter from it. The cursor never moves backwards. Counting
+        from the cursor rather than resetting to 0 keeps a message posted meanwhile unread;
+        it only reads the index entries after the cursor.
+        """
+        membre = MembreGroupe.objects.filter(profil__user=acting_user, groupe_id=groupe_id, est_actif=True, groupe__deleted=False).first()
+        if membre is None:
+            raise PermissionDeniedAPIException("Vous n'êtes pas membre de ce groupe.")
+
+        messages = Message.objects.filter(groupe_id=groupe_id, est_supprime=False)
+        if message_id is None:
+            message = messages.order_by('-created_at', '-id').only('id', 'created_at').first()
+            if message is None:
+                return membre
+        else:
+            message = get_object_or_404(messages.only('id', 'created_at'), id=message_id)
+
+        position = (message.created_at, message.id)
+        if membre.lu_jusqu_au is not None and position <= (membre.lu_jusqu_au, membre.dernier_message_lu_id):
+            return membre
+
+        MembreGroupe.objects.filter(id=membre.id).update(dernier_message_lu=message, lu_jusqu_au=message.created_at)
+        MembreGroupe.objects.filter(id=membre.id).update(non_lus=GroupeService._unread_count(after_cursor=True))
+        membre.refresh_from_db(fields=['dernier_message_lu', 'lu_jusqu_au', 'non_lus'])
+        return membre
+
+    @staticmethod
+    def reconcile_unread_counts() -> int:
+        """
+        Recomputes every active membership's unread counter from its cursor, BATCH_SIZE rows per UPDATE.
+        Fixes drift (deleted messages, interrupted transactions). Returns the number of memberships processed.
+        """
+        processed = 0
+        last_id = None
+        while True:
+            batch = MembreGroupe.objects.filter(est_actif=True).order_by('id')
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            ids = list(batch.values_list('id', flat=True)[:GroupeService.RECONCILE_BATCH_SIZE])
+            if not ids:
+                break
+            rows = MembreGroupe.objects.filter(id__in=ids)
+            rows.filter(lu_jusqu_au__isnull=False).update(non_lus=GroupeService._unread_count(after_cursor=True))
+            rows.filter(lu_jusqu_au__isnull=True).update(non_lus=GroupeService._unread_count(after_cursor=False))
+            processed += len(ids)
+            last_id = ids[-1]
+        logger.info(f"Compteurs de messages non lus recalculés pour {processed} adhésion(s).")
+        return processed
+
+# Instantiate the service
+groupe_service = GroupeService()
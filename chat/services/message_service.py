@@ -0,0 +1,137 @@
+# chat/services/message_service.py
+import logging
+from typing import Optional
+from uuid import UUID
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.shortcuts import get_object_or_404
+from django.utils.text import Truncator
+from core.models import User
+from core.api.exceptions import BadRequestAPIException, PermissionDeniedAPIException
+from chat.models import Groupe, MembreGroupe, Message
+from chat.api.schemas import MessageOutSchema
+from chat.realtime.pubsub import get_pubsub
+
+logger = logging.getLogger('app')
+
+
+class MessageService:
+    """
+    Service managing group messages.
+    A posted message is stored, then broadcast on the group's pub/sub channel once the
+    transaction commits; connected members receive it through their WebSocket.
+    The other members' unread counters and the group's last-message snapshot are
+    updated in the same transaction.
+    """
+    APERCU_LENGTH = 140
+
+    @staticmethod
+    def channel(groupe_id) -> str:
+        """Canal pub/sub d'un groupe."""
+        return f"chat.groupe.{groupe_id}"
+
+    @staticmethod
+    def get_membership(acting_user: User, groupe_id: UUID) -> Optional[MembreGroupe]:
+        """Returns the user's active membership of the group, or None."""
+        return MembreGroupe.objects.filter(
+            profil__user=acting_user, groupe_id=groupe_id, est_actif=True, groupe__deleted=False
+        ).first()
+
+    @staticmethod
+    def list_messages(acting_user: User, groupe_id: UUID) -> QuerySet:
+        """
+        Returns the group's visible messages with their author's display fields (one query).
+        Ordering is left to the keyset paginator, which reads message_groupe_date_idx backwards.
+        """
+        if MessageService.get_membership(acting_user, groupe_id) is None:
+            raise PermissionDeniedAPIException("Vous n'êtes pas membre de ce groupe.")
+        return Message.objects.filter(groupe_id=groupe_id, est_supprime=False).select_related('profil').only(
+            'id', 'groupe_id', 'texte', 'fichier', 'type_fichier', 'created_at',
+            'profil__id', 'profil__nom_complet', 'profil__photo_profil'
+        )
+
+    @staticmethod
+    def _snapshot(message: Optional[Message]) -> dict:
+        """Champs d'aperçu du dernier message d'un groupe."""
+        if message is None:
+            return {'dernier_message': None, 'dernier_message_auteur': '', 'dernier_message_apercu': '', 'dernier_message_type_fichier': None}
+        return {
+            'dernier_message': message,
+            'dernier_message_auteur': message.profil.nom_complet,
+            'dernier_message_apercu': Truncator(message.texte or '').chars(MessageService.APERCU_LENGTH),
+            'dernier_message_type_fichier': message.type_fichier,
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def post_message(
+        acting_user: User, groupe_id: UUID, texte: str, fichier: Optional[str] = None, type_fichier: Optional[str] = None
+    ) -> Message:
+        """
+        Posts a message in a group the user is an active member of. `fichier` is the storage
+        name of an attachment already written by TeleversementService.
+        """
+        if MessageService.get_membership(acting_user, groupe_id) is None:
+            raise PermissionDeniedAPIException("Vous n'êtes pas membre de ce groupe.")
+        if not fichier and (not texte or not texte.strip()):
+            raise BadRequestAPIException("Le message est vide.")
+
+        message = Message.objects.create(
+            groupe_id=groupe_id, profil=acting_user.profil, texte=texte or None,  # type: ignore
+            fichier=fichier, type_fichier=type_fichier
+        )
+        # Un seul UPDATE pour tous les autres membres ; l'auteur a lu son propre message
+        members = MembreGroupe.objects.filter(groupe_id=groupe_id, est_actif=True)
+        members.exclude(profil=acting_user.profil).update(non_lus=F('non_lus') + 1)  # type: ignore
+        members.filter(profil=acting_user.profil).update(  # type: ignore
+            dernier_message_lu=message, lu_jusqu_au=message.created_at, non_lus=0
+        )
+        # Condition sur la date : un envoi concurrent plus récent n'est pas écrasé
+        Groupe.objects.filter(id=groupe_id, derniere_activite__lte=message.created_at).update(
+            derniere_activite=message.created_at, **MessageService._snapshot(message)
+        )
+        payload = {'type': 'message', 'message': MessageOutSchema.from_orm(message).model_dump(mode='json')}
+        transaction.on_commit(lambda: get_pubsub().publish(MessageService.channel(groupe_id), payload))
+        return message
+
+    @staticmethod
+    @transaction.atomic
+    def delete_message(acting_user: User, message_id: UUID):
+        """
+        Hides a message. Allowed to its author and to the group's moderators and admins.
+        If it was the group's last message, the snapshot falls back to the previous visible one.
+        """
+        message = get_object_or_404(Message.objects.select_related('profil'), id=message_id, est_supprime=False)
+        membership = MessageService.get_membership(acting_user, message.groupe_id)  # type: ignore
+        if membership is None or (
+            message.profil_id != membership.profil_id and membership.role_membre not in ('moderateur', 'admin')  # type: ignore
+        ):
+            raise PermissionDeniedAPIException("Vous ne pouvez pas supprimer ce message.")
+
+        if not Message.objects.filter(id=message.id, est_supprime=False).update(est_supprime=True):
+            return
+        # Les membres qui l'ont compté à l'envoi (actifs, déjà membres) et ne l'avaient pas encore lu
+        # ont un message non lu de moins
+        MembreGroupe.objects.filter(
+            groupe_id=message.groupe_id, est_actif=True, non_lus__gt=0, date_adhesion__lt=message.created_at  # type: ignore
+        ).exclude(profil_id=message.profil_id).filter(  # type: ignore
+            Q(lu_jusqu_au__isnull=True) | Q(lu_jusqu_au__lt=message.created_at)
+            | Q(lu_jusqu_au=message.created_at, dernier_message_lu_id__lt=message.id)
+        ).update(non_lus=F('non_lus') - 1)
+
+        groupe = Groupe.objects.select_for_update().get(id=message.groupe_id)  # type: ignore
+        if groupe.dernier_message_id == message.id:  # type: ignore
+            previous = Message.objects.filter(groupe_id=groupe.id, est_supprime=False).select_related('profil').order_by(
+                '-created_at', '-id'
+            ).first()
+            Groupe.objects.filter(id=groupe.id).update(
+                derniere_activite=previous.created_at if previous else groupe.created_at,
+                **MessageService._snapshot(previous)
+            )
+
+        payload = {'type': 'suppression', 'message_id': str(message.id)}
+        transaction.on_commit(lambda: get_pubsub().publish(MessageService.channel(message.groupe_id), payload))  # type: ignore
+        logger.info(f"Message {message.id} supprimé par {acting_user.email}.")
+
+# Instantiate the service
+message_service = MessageService()
@@ -0,0 +1,299 @@
+# chat/services/televersement_service.py
+import hashlib
+import logging
+import math
+import os
+import shutil
+import zipfile
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional, Tuple
+from uuid import UUID, uuid4
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from core.models import User
+from core.api.exceptions import BadRequestAPIException, PermissionDeniedAPIException
+from chat.models import Message, Televersement
+from chat.services.message_service import MessageService
+
+logger = logging.getLogger('app')
+
+
+class TeleversementService:
+    """
+    Service managing chunked, resumable uploads of chat attachments.
+
+    The client declares the file, PUTs its chunks (in any order) with the SHA-256 of each one,
+    then completes the upload. A chunk is streamed from the request to its own part file,
+    READ_SIZE bytes at a time, and only renamed into place once its size and checksum match:
+    the part files on disk are the upload state, so a client resumes by asking which chunks
+    are already there. On completion the parts are concatenated straight into media storage
+    with an in-kernel copy (copy_file_range), the file type is detected from the content and
+    the file is posted as a Message. Abandoned uploads are purged by a periodic task.
+    """
+    READ_SIZE = 64 * 1024
+    # Formats Office binaires (OLE) : même signature pour les trois, l'extension les distingue
+    OLE_TYPES = {'.doc': 'word', '.xls': 'excel', '.ppt': 'powerpoint'}
+    OOXML_TYPES = (('word/', 'word'), ('xl/', 'excel'), ('ppt/', 'powerpoint'))
+    # Marques ISO BMFF (`ftyp`) des images ; les autres sont des vidéos
+    IMAGE_BRANDS = (b'heic', b'heix', b'mif1', b'avif')
+
+    @staticmethod
+    def _directory(televersement_id: UUID) -> str:
+        return os.path.join(settings.CHAT_UPLOAD_DIR, str(televersement_id))
+
+    @staticmethod
+    def _part_path(televersement_id: UUID, index: int) -> str:
+        return os.path.join(TeleversementService._directory(televersement_id), f'{index:06d}.part')
+
+    @staticmethod
+    def _chunk_size(televersement: Televersement, index: int) -> int:
+        if index < televersement.nombre_morceaux - 1:
+            return televersement.taille_morceau
+        return televersement.taille - televersement.taille_morceau * (televersement.nombre_morceaux - 1)
+
+    @staticmethod
+    def _with_state(televersement: Televersement) -> Televersement:
+        """Attaches the indexes of the chunks already on disk (`morceaux_recus`)."""
+        try:
+            names = os.listdir(TeleversementService._directory(televersement.id))
+        except FileNotFoundError:
+            names = []
+        televersement.morceaux_recus = sorted(int(name[:-5]) for name in names if name.endswith('.part'))  # type: ignore
+        return televersement
+
+    @staticmethod
+    def _get_own(acting_user: User, televersement_id: UUID) -> Televersement:
+        televersement = get_object_or_404(Televersement, id=televersement_id)
+        if televersement.profil_id != acting_user.profil.id:  # type: ignore
+            raise PermissionDeniedAPIException("Ce téléversement ne vous appartient pas.")
+        return televersement
+
+    @staticmethod
+    def create(acting_user: User, groupe_id: UUID, nom_fichier: str, taille: int) -> Televersement:
+        """
+        Opens an upload session for a file of `taille` bytes in a group the user is a member of.
+        The server sets the chunk size; the response gives it with the number of chunks.
+        """
+        if MessageService.get_membership(acting_user, groupe_id) is None:
+            raise PermissionDeniedAPIException("Vous n'êtes pas membre de ce groupe.")
+        if taille > settings.CHAT_UPLOAD_MAX_SIZE:
+            raise BadRequestAPIException(f"La taille du fichier dépasse {settings.CHAT_UPLOAD_MAX_SIZE // (1024 * 1024)} MB.")
+        nom_fichier = os.path.basename(nom_fichier.replace('\\', '/')).strip()
+        if not nom_fichier:
+            raise BadRequestAPIException("Nom de fichier invalide.")
+
+        taille_morceau = settings.CHAT_UPLOAD_CHUNK_SIZE
+        televersement = Televersement.objects.create(
+            groupe_id=groupe_id, profil=acting_user.profil, nom_fichier=nom_fichier, taille=taille,  # type: ignore
+            taille_morceau=taille_morceau, nombre_morceaux=math.ceil(taille / taille_morceau)
+        )
+        os.makedirs(TeleversementService._directory(televersement.id), exist_ok=True)
+        return TeleversementService._with_state(televersement)
+
+    @staticmethod
+    def get_status(acting_user: User, televersement_id: UUID) -> Televersement:
+        """Returns the upload with the chunks already received, to resume after an interruption."""
+        return TeleversementService._with_state(TeleversementService._get_own(acting_user, televersement_id))
+
+    @staticmethod
+    def write_chunk(acting_user: User, televersement_id: UUID, index: int, stream: BinaryIO, checksum: Optional[str]) -> Televersement:
+        """
+        Streams chunk `index` from `stream` to disk and keeps it only if its size and SHA-256
+        (`checksum`, hexadecimal) match. Sending a chunk again replaces it.
+        """
+        televersement = TeleversementService._get_own(acting_user, televersement_id)
+        if televersement.statut != 'en_cours':
+            raise BadRequestAPIException("Ce téléversement est déjà finalisé.")
+        if not 0 <= index < televersement.nombre_morceaux:
+            raise BadRequestAPIException(f"Numéro de morceau invalide : 0 à {televersement.nombre_morceaux - 1}.")
+        if not checksum:
+            raise BadRequestAPIException("En-tête X-Checksum-Sha256 manquant.")
+
+        expected = TeleversementService._chunk_size(televersement, index)
+        part_path = TeleversementService._part_path(televersement.id, index)
+        # Écriture dans un fichier temporaire propre à la requête : deux envois du même morceau ne se mélangent pas
+        temp_path = f'{part_path}.{uuid4().hex}.tmp'
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with open(temp_path, 'wb') as output:
+                while written <= expected:
+                    # Un octet de plus que la taille attendue suffit à détecter un morceau trop long
+                    block = stream.read(min(TeleversementService.READ_SIZE, expected - written + 1))
+                    if not block:
+                        break
+                    written += len(block)
+                    digest.update(block)
+                    output.write(block)
+            if written != expected:
+                raise BadRequestAPIException(f"Le morceau {index} doit faire {expected} octets.")
+            if digest.hexdigest() != checksum.strip().lower():
+                raise BadRequestAPIException(f"Somme de contrôle du morceau {index} incorrecte : renvoyez-le.")
+            os.replace(temp_path, part_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        Televersement.objects.filter(id=televersement.id).update(updated_at=timezone.now())
+        return TeleversementService._with_state(televersement)
+
+    @staticmethod
+    def _append(source: int, target: int, size: int):
+        """Copies `size` bytes from `source` to the end of `target` inside the kernel when possible."""
+        remaining = size
+        try:
+            while remaining:
+                copied = os.copy_file_range(source, target, remaining)
+                if not copied:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            # Pas de copy_file_range (hors Linux) ou système de fichiers qui le refuse : copie par blocs
+            while remaining:
+                block = os.read(source, min(TeleversementService.READ_SIZE, remaining))
+                if not block:
+                    break
+                os.write(target, block)
+                remaining -= len(block)
+        if remaining:
+            raise OSError(f"Morceau tronqué : {remaining} octets manquants.")
+
+    @staticmethod
+    def _assemble(televersement: Televersement) -> Tuple[str, str]:
+        """Concatenates the parts into a new file of the media storage; returns its name and path."""
+        field = Message._meta.get_field('fichier')
+        name = field.generate_filename(None, televersement.nom_fichier)  # type: ignore
+        while True:
+            name = default_storage.get_available_name(name, max_length=field.max_length)  # type: ignore
+            path = default_storage.path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                break
+            except FileExistsError:
+                continue  # Nom pris entre-temps par un autre envoi
+
+        try:
+            for index in range(televersement.nombre_morceaux):
+                source = os.open(TeleversementService._part_path(televersement.id, index), os.O_RDONLY)
+                try:
+                    TeleversementService._append(source, target, TeleversementService._chunk_size(televersement, index))
+                finally:
+                    os.close(source)
+        except Exception:
+            os.close(target)
+            os.remove(path)
+            raise
+        os.close(target)
+        return name, path
+
+    @staticmethod
+    def _detect_type(path: str, nom_fichier: str) -> Optional[str]:
+        """Message.type_fichier from the file's signature, or None if the format is not accepted."""
+        with open(path, 'rb') as f:
+            head = f.read(16)
+        if (head.startswith((b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a'))
+                or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')):
+            return 'image'
+        if head.startswith(b'%PDF-'):
+            return 'pdf'
+        if head[4:8] == b'ftyp':
+            return 'image' if head[8:12] in TeleversementService.IMAGE_BRANDS else 'video'
+        if head.startswith(b'\x1a\x45\xdf\xa3') or (head[:4] == b'RIFF' and head[8:12] == b'AVI '):
+            return 'video'
+        if head.startswith(b'PK\x03\x04'):
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    names = archive.namelist()
+            except zipfile.BadZipFile:
+                return None
+            if '[Content_Types].xml' in names:
+                for prefix, type_fichier in TeleversementService.OOXML_TYPES:
+                    if any(name.startswith(prefix) for name in names):
+                        return type_fichier
+            return None
+        if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+            return TeleversementService.OLE_TYPES.get(os.path.splitext(nom_fichier)[1].lower())
+        return None
+
+    @staticmethod
+    def _discard(televersement_id: UUID):
+        shutil.rmtree(TeleversementService._directory(televersement_id), ignore_errors=True)
+        Televersement.all_objects.filter(id=televersement_id).delete()
+
+    @staticmethod
+    def complete(acting_user: User, televersement_id: UUID, texte: str = '') -> Message:
+        """
+        Assembles the received chunks and posts the file in the group, with `texte` as caption.
+        Completing an upload again returns the message already posted.
+        """
+        televersement = TeleversementService._get_own(acting_user, televersement_id)
+        if televersement.statut == 'termine' and televersement.message_id:  # type: ignore
+            return Message.objects.select_related('profil').get(id=televersement.message_id)  # type: ignore
+        received = set(TeleversementService._with_state(televersement).morceaux_recus)  # type: ignore
+        missing = [index for index in range(televersement.nombre_morceaux) if index not in received]
+        if missing:
+            raise BadRequestAPIException(f"Morceaux manquants : {', '.join(map(str, missing[:20]))}.")
+        # Réservation conditionnelle : deux finalisations simultanées n'assemblent pas deux fois.
+        # updated_at est rafraîchi pour que cleanup_expired ne supprime pas un envoi en cours d'assemblage
+        claimed = Televersement.objects.filter(id=televersement.id, statut='en_cours').update(
+            statut='assemblage', updated_at=timezone.now()
+        )
+        if not claimed:
+            raise BadRequestAPIException("Ce téléversement est déjà en cours de finalisation.")
+
+        path = None
+        try:
+            name, path = TeleversementService._assemble(televersement)
+            type_fichier = TeleversementService._detect_type(path, televersement.nom_fichier)
+            if type_fichier is None:
+                os.remove(path)
+                path = None
+                TeleversementService._discard(televersement.id)
+                raise BadRequestAPIException("Type de fichier non pris en charge : images, PDF, documents Office et vidéos uniquement.")
+            with transaction.atomic():
+                message = MessageService.post_message(
+                    acting_user, televersement.groupe_id, texte, fichier=name, type_fichier=type_fichier  # type: ignore
+                )
+                Televersement.objects.filter(id=televersement.id).update(statut='termine', message=message)
+        except Exception:
+            if path is not None:
+                os.remove(path)
+            Televersement.objects.filter(id=televersement.id, statut='assemblage').update(statut='en_cours', updated_at=timezone.now())
+            raise
+
+        shutil.rmtree(TeleversementService._directory(televersement.id), ignore_errors=True)
+        logger.info(f"Pièce jointe {name} ({televersement.taille} octets) publiée dans le groupe {televersement.groupe_id}.")  # type: ignore
+        return message
+
+    @staticmethod
+    def cleanup_expired(now: Optional[datetime] = None) -> int:
+        """
+        Deletes the uploads without activity for CHAT_UPLOAD_EXPIRY_HOURS, with their parts, and
+        the part directories left without an upload. Returns the number of uploads deleted.
+        """
+        cutoff = (now or timezone.now()) - timedelta(hours=settings.CHAT_UPLOAD_EXPIRY_HOURS)
+        expired = list(Televersement.all_objects.filter(updated_at__lt=cutoff).values_list('id', flat=True))
+        for televersement_id in expired:
+            TeleversementService._discard(televersement_id)
+
+        if os.path.isdir(settings.CHAT_UPLOAD_DIR):
+            for entry in os.scandir(settings.CHAT_UPLOAD_DIR):
+                if entry.stat().st_mtime >= cutoff.timestamp():
+                    continue
+                try:
+                    orphan = not Televersement.all_objects.filter(id=UUID(entry.name)).exists()
+                except ValueError:
+                    continue
+                if orphan:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+
+        if expired:
+            logger.info(f"{len(expired)} téléversement(s) abandonné(s) supprimé(s).")
+        return len(expired)
+
+# Instantiate the service
+televersement_service = TeleversementService()
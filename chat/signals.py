@@ -0,0 +1,17 @@
+# chat/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from chat.models import MembreGroupe
+from chat.realtime.pubsub import get_pubsub
+from chat.services.message_service import MessageService
+
+
+@receiver(post_save, sender=MembreGroupe)
+@receiver(post_delete, sender=MembreGroupe)
+def disconnect_removed_member(sender, instance, signal, **kwargs):
+    """Un membre retiré du groupe (inactif ou supprimé) est déconnecté de ses WebSockets, une fois la transaction validée."""
+    if signal is post_save and instance.est_actif and not instance.deleted:
+        return
+    payload = {'type': 'adhesion', 'profil_id': str(instance.profil_id)}
+    transaction.on_commit(lambda: get_pubsub().publish(MessageService.channel(instance.groupe_id), payload))
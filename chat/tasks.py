@@ -0,0 +1,20 @@
+# chat/tasks.py
+import logging
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task
+from chat.services.groupe_service import GroupeService
+from chat.services.televersement_service import TeleversementService
+
+logger = logging.getLogger('app')
+
+
+@db_periodic_task(crontab(minute='45', hour='3'))
+def reconcile_unread_counts_task():
+    """Recalcule chaque nuit les compteurs de messages non lus à partir des curseurs de lecture."""
+    GroupeService.reconcile_unread_counts()
+
+
+@db_periodic_task(crontab(minute='20'))
+def cleanup_uploads_task():
+    """Supprime chaque heure les téléversements de pièces jointes abandonnés et leurs morceaux."""
+    TeleversementService.cleanup_expired()
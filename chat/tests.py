@@ -0,0 +1,282 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.files.storage import default_storage
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+from core.models import User
+from core.api.exceptions import BadRequestAPIException
+from core.testing import create_user
+from chat.models import Groupe, MembreGroupe, Message, Televersement
+from chat.services.groupe_service import GroupeService
+from chat.realtime.websocket import CLOSE_FORBIDDEN, CLOSE_UNAUTHORIZED, websocket_application
+from chat.services.message_service import MessageService
+from chat.services.televersement_service import TeleversementService
+
+
+class UnreadCountersTests(TestCase):
+    def setUp(self):
+        self.auteur = create_user('auteur@example.com')
+        self.groupe = Groupe.objects.create(nom_groupe='Promo 2026', description='Groupe de test')
+        MembreGroupe.objects.create(profil=self.auteur.profil, groupe=self.groupe)  # type: ignore
+
+    def join(self, user: User) -> MembreGroupe:
+        return MembreGroupe.objects.create(profil=user.profil, groupe=self.groupe)  # type: ignore
+
+    def test_reconcile_ignores_messages_before_joining(self):
+        """Les messages antérieurs à l'adhésion ne deviennent pas non lus au recalcul."""
+        for i in range(5):
+            MessageService.post_message(self.auteur, self.groupe.id, f"message {i}")
+        membre = self.join(create_user('nouveau@example.com'))
+        self.assertEqual(membre.non_lus, 0)
+
+        GroupeService.reconcile_unread_counts()
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 0)
+
+        MessageService.post_message(self.auteur, self.groupe.id, "après l'adhésion")
+        GroupeService.reconcile_unread_counts()
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 1)
+
+    def test_post_increments_and_read_resets(self):
+        membre = self.join(create_user('lecteur@example.com'))
+        for i in range(3):
+            MessageService.post_message(self.auteur, self.groupe.id, f"message {i}")
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 3)
+
+        membre = GroupeService.mark_read(membre.profil.user, self.groupe.id)
+        self.assertEqual(membre.non_lus, 0)
+        self.assertIsNotNone(membre.lu_jusqu_au)
+        self.assertLessEqual(membre.lu_jusqu_au, timezone.now())
+
+    def test_delete_before_joining_keeps_later_unread(self):
+        """Supprimer un message antérieur à l'adhésion ne retire pas un vrai non lu du compteur."""
+        ancien = MessageService.post_message(self.auteur, self.groupe.id, "avant l'adhésion")
+        membre = self.join(create_user('nouveau@example.com'))
+        MessageService.post_message(self.auteur, self.groupe.id, "après l'adhésion")
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 1)
+
+        MessageService.delete_message(self.auteur, ancien.id)
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 1)
+
+    def test_delete_unread_message_decrements(self):
+        membre = self.join(create_user('lecteur@example.com'))
+        message = MessageService.post_message(self.auteur, self.groupe.id, "à supprimer")
+        MessageService.delete_message(self.auteur, message.id)
+        membre.refresh_from_db()
+        self.assertEqual(membre.non_lus, 0)
+        self.groupe.refresh_from_db()
+        self.assertIsNone(self.groupe.dernier_message_id)
+
+
+class GroupWebSocketTests(TransactionTestCase):
+    def setUp(self):
+        self.auteur = create_user('auteur@example.com')
+        self.lecteur = create_user('lecteur@example.com')
+        self.groupe = Groupe.objects.create(nom_groupe='Promo 2026', description='Groupe de test')
+        MembreGroupe.objects.create(profil=self.auteur.profil, groupe=self.groupe)  # type: ignore
+        self.membre = MembreGroupe.objects.create(profil=self.lecteur.profil, groupe=self.groupe)  # type: ignore
+
+    def connect(self, token: str) -> ApplicationCommunicator:
+        return ApplicationCommunicator(websocket_application, {
+            'type': 'websocket', 'path': f'/ws/chat/groupes/{self.groupe.id}/', 'query_string': f'token={token}'.encode(), 'headers': [],
+        })
+
+    def run_until_closed(self, token: str, remove_member) -> dict:
+        """Connecte le lecteur, applique `remove_member` puis retourne le premier événement reçu ensuite."""
+        async def scenario():
+            socket = self.connect(token)
+            await socket.send_input({'type': 'websocket.connect'})
+            self.assertEqual((await socket.receive_output(2))['type'], 'websocket.accept')
+            await remove_member()
+            event = await socket.receive_output(3)
+            await socket.wait(2)
+            return event
+        return async_to_sync(scenario)()
+
+    def test_deactivated_member_is_disconnected(self):
+        async def deactivate():
+            def save():
+                self.membre.est_actif = False
+                self.membre.save()
+            await sync_to_async(save)()
+        event = self.run_until_closed(str(AccessToken.for_user(self.lecteur)), deactivate)
+        self.assertEqual(event, {'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+
+    @override_settings(CHAT_WS_RECHECK_INTERVAL=0.2)
+    def test_bulk_removal_is_caught_by_recheck(self):
+        async def deactivate():
+            await sync_to_async(MembreGroupe.objects.filter(id=self.membre.id).update)(est_actif=False)
+        event = self.run_until_closed(str(AccessToken.for_user(self.lecteur)), deactivate)
+        self.assertEqual(event, {'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+
+    def test_expired_token_closes_socket(self):
+        token = AccessToken.for_user(self.lecteur)
+        token.set_exp(lifetime=timedelta(seconds=1))
+
+        async def nothing():
+            pass
+        event = self.run_until_closed(str(token), nothing)
+        self.assertEqual(event, {'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+
+    def test_members_receive_messages(self):
+        async def scenario():
+            socket = self.connect(str(AccessToken.for_user(self.lecteur)))
+            await socket.send_input({'type': 'websocket.connect'})
+            await socket.receive_output(2)
+            await sync_to_async(MessageService.post_message)(self.auteur, self.groupe.id, "bonjour")
+            event = await socket.receive_output(2)
+            await socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await socket.wait(2)
+            return json.loads(event['text'])
+        payload = async_to_sync(scenario)()
+        self.assertEqual(payload['message']['texte'], "bonjour")
+
+
+class TeleversementTests(TestCase):
+    def setUp(self):
+        self.auteur = create_user('auteur@example.com')
+        self.groupe = Groupe.objects.create(nom_groupe='Promo 2026', description='Groupe de test')
+        MembreGroupe.objects.create(profil=self.auteur.profil, groupe=self.groupe)  # type: ignore
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = self.settings(
+            MEDIA_ROOT=f'{directory.name}/media', CHAT_UPLOAD_DIR=f'{directory.name}/parts', CHAT_UPLOAD_CHUNK_SIZE=8
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_cleanup_spares_upload_being_assembled(self):
+        """Un envoi resté longtemps inactif puis finalisé n'est pas supprimé pendant son assemblage."""
+        contenu = b'%PDF-1.4 rapport de stage'
+        televersement = self.upload('rapport.pdf', contenu)
+        Televersement.objects.filter(id=televersement.id).update(updated_at=timezone.now() - timedelta(days=2))
+
+        assemble = TeleversementService._assemble
+
+        def assemble_during_cleanup(televersement):
+            self.assertEqual(TeleversementService.cleanup_expired(), 0)
+            return assemble(televersement)
+
+        with mock.patch.object(TeleversementService, '_assemble', side_effect=assemble_during_cleanup):
+            message = TeleversementService.complete(self.auteur, televersement.id)
+        self.assertEqual(message.type_fichier, 'pdf')
+        self.assertEqual(Televersement.objects.get(id=televersement.id).statut, 'termine')
+
+    def send(self, televersement, index: int, chunk: bytes, checksum=None):
+        return TeleversementService.write_chunk(
+            self.auteur, televersement.id, index, io.BytesIO(chunk), checksum or hashlib.sha256(chunk).hexdigest()
+        )
+
+    def upload(self, nom_fichier: str, contenu: bytes):
+        televersement = TeleversementService.create(self.auteur, self.groupe.id, nom_fichier, len(contenu))
+        for index in range(televersement.nombre_morceaux):
+            self.send(televersement, index, contenu[index * 8:(index + 1) * 8])
+        return televersement
+
+    def write_file(self, name: str, contenu: bytes) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(contenu)
+        return path
+
+    def zip_file(self, name: str, entries) -> str:
+        path = os.path.join(self.directory, name)
+        with zipfile.ZipFile(path, 'w') as archive:
+            for entry in entries:
+                archive.writestr(entry, b'<xml/>')
+        return path
+
+    def test_chunk_rejected_on_size_or_checksum(self):
+        televersement = TeleversementService.create(self.auteur, self.groupe.id, 'rapport.pdf', 20)
+        self.assertEqual((televersement.taille_morceau, televersement.nombre_morceaux), (8, 3))
+        for index, chunk, checksum in (
+            (0, b'1234567', None),                  # trop court
+            (0, b'123456789', None),                # trop long
+            (2, b'12345678', None),                 # le dernier morceau ne fait que 4 octets
+            (0, b'12345678', '0' * 64),             # somme de contrôle fausse
+        ):
+            with self.assertRaises(BadRequestAPIException):
+                self.send(televersement, index, chunk, checksum)
+        with self.assertRaises(BadRequestAPIException):
+            self.send(televersement, 3, b'1234')  # numéro hors limites
+        self.assertEqual(TeleversementService.get_status(self.auteur, televersement.id).morceaux_recus, [])
+        # Aucun fichier temporaire laissé sur le disque
+        self.assertEqual(os.listdir(TeleversementService._directory(televersement.id)), [])
+
+    def test_status_lists_received_chunks_for_resume(self):
+        contenu = b'%PDF-1.4 reprise apres coupure'
+        televersement = TeleversementService.create(self.auteur, self.groupe.id, 'rapport.pdf', len(contenu))
+        self.send(televersement, 3, contenu[24:])
+        self.send(televersement, 0, contenu[:8])
+        self.assertEqual(TeleversementService.get_status(self.auteur, televersement.id).morceaux_recus, [0, 3])
+        with self.assertRaisesMessage(BadRequestAPIException, 'Morceaux manquants : 1, 2.'):
+            TeleversementService.complete(self.auteur, televersement.id)
+
+        self.send(televersement, 1, contenu[8:16])
+        self.send(televersement, 2, contenu[16:24])
+        self.assertEqual(TeleversementService.get_status(self.auteur, televersement.id).morceaux_recus, [0, 1, 2, 3])
+
+    def test_complete_assembles_identical_file_once(self):
+        contenu = b'%PDF-1.4 ' + bytes(range(256)) * 3
+        televersement = self.upload('rapport.pdf', contenu)
+        message = TeleversementService.complete(self.auteur, televersement.id, "le rapport")
+        self.assertEqual((message.type_fichier, message.texte), ('pdf', "le rapport"))
+        with default_storage.open(message.fichier.name) as f:
+            self.assertEqual(f.read(), contenu)
+        self.assertFalse(os.path.exists(TeleversementService._directory(televersement.id)))
+
+        # Une seconde finalisation renvoie le même message sans rien republier
+        self.assertEqual(TeleversementService.complete(self.auteur, televersement.id).id, message.id)
+        self.assertEqual(Message.objects.filter(groupe=self.groupe).count(), 1)
+
+    def test_concurrent_complete_is_refused(self):
+        televersement = self.upload('rapport.pdf', b'%PDF-1.4 concurrent')
+        # Une autre requête a déjà réservé l'assemblage
+        Televersement.objects.filter(id=televersement.id).update(statut='assemblage')
+        with self.assertRaisesMessage(BadRequestAPIException, 'déjà en cours de finalisation'):
+            TeleversementService.complete(self.auteur, televersement.id)
+        self.assertFalse(Message.objects.filter(groupe=self.groupe).exists())
+
+    def test_executable_is_rejected_and_discarded(self):
+        televersement = self.upload('setup.pdf', b'MZ\x90\x00' + b'\x00' * 60)
+        with self.assertRaises(BadRequestAPIException):
+            TeleversementService.complete(self.auteur, televersement.id)
+        self.assertFalse(Televersement.all_objects.filter(id=televersement.id).exists())
+        self.assertFalse(Message.objects.filter(groupe=self.groupe).exists())
+        # Le fichier assemblé est supprimé avec l'envoi
+        self.assertEqual([files for _root, _dirs, files in os.walk(os.path.join(self.directory, 'media')) if files], [])
+
+    def test_detect_type(self):
+        detect = TeleversementService._detect_type
+        ole = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 8
+        cases = [
+            (self.zip_file('a.docx', ['[Content_Types].xml', 'word/document.xml']), 'a.docx', 'word'),
+            (self.zip_file('b.xlsx', ['[Content_Types].xml', 'xl/workbook.xml']), 'b.xlsx', 'excel'),
+            (self.zip_file('c.pptx', ['[Content_Types].xml', 'ppt/presentation.xml']), 'c.pptx', 'powerpoint'),
+            (self.zip_file('d.zip', ['readme.txt']), 'd.docx', None),
+            (self.write_file('e.doc', ole), 'e.doc', 'word'),
+            (self.write_file('f.xls', ole), 'f.XLS', 'excel'),
+            (self.write_file('g.msi', ole), 'g.msi', None),
+            (self.write_file('h.heic', b'\x00\x00\x00\x18ftypheic\x00\x00\x00\x00'), 'h.heic', 'image'),
+            (self.write_file('i.mp4', b'\x00\x00\x00\x18ftypisom\x00\x00\x00\x00'), 'i.mp4', 'video'),
+            (self.write_file('j.png', b'\x89PNG\r\n\x1a\n' + b'\x00' * 8), 'j.png', 'image'),
+            (self.write_file('k.exe', b'MZ\x90\x00' + b'\x00' * 12), 'k.pdf', None),
+            (self.write_file('l.sh', b'#!/bin/sh\nrm -rf /\n'), 'l.pdf', None),
+        ]
+        for path, nom_fichier, expected in cases:
+            with self.subTest(nom_fichier=nom_fichier):
+                self.assertEqual(detect(path, nom_fichier), expected)
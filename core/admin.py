@@ -5,6 +5,7 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.utils.safestring import mark_safe
 from core.models import User, Profil, AuditLog
+from core.services.soft_delete_service import soft_delete_service
 
 
 # ==========================================
@@ -97,23 +98,13 @@ class UserAdmin(BaseUserAdmin):
 
     @admin.action(description='Supprimer logiquement les utilisateurs')
     def soft_delete_users(self, request, queryset):
-        count = 0
-        for user in queryset.filter(deleted=False):
-            user.soft_delete()
-            if hasattr(user, 'profil'):
-                user.profil.soft_delete()
-            count += 1
-        self.message_user(request, f'{count} utilisateur(s) supprimé(s) logiquement.')
+        counts = soft_delete_service.soft_delete(queryset)
+        self.message_user(request, f"{counts['core.User']} utilisateur(s) supprimé(s) logiquement.")
 
     @admin.action(description='Restaurer les utilisateurs supprimés')
     def restore_users(self, request, queryset):
-        count = 0
-        for user in queryset.filter(deleted=True):
-            user.restore()
-            if hasattr(user, 'profil'):
-                user.profil.restore()
-            count += 1
-        self.message_user(request, f'{count} utilisateur(s) restauré(s).')
+        counts = soft_delete_service.restore(queryset)
+        self.message_user(request, f"{counts['core.User']} utilisateur(s) restauré(s).")
 
     # ======================================
     # Afficher tous les users (y compris soft-deleted)
@@ -0,0 +1,35 @@
+# core/api/cache.py
+import json
+from functools import wraps
+from typing import Callable, List, Optional, Type
+from django.http import HttpRequest, HttpResponse
+from ninja import Schema
+from ninja.responses import NinjaJSONEncoder
+from core.services.cache_service import cache_service
+
+
+def cached_response(namespace: str, schema: Type[Schema], tags: Callable[..., List[str]], timeout: Optional[int] = None):
+    """
+    Met en cache la réponse JSON sérialisée d'un endpoint public (GET anonyme).
+
+    La clé dépend du chemin et de tous les paramètres de requête (page, filtres...),
+    ainsi que des versions des tags renvoyés par `tags(**kwargs)`.
+    À placer sous le décorateur du router et au-dessus de @paginate le cas échéant.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(request: HttpRequest, **kwargs):
+            key = cache_service.build_key(
+                namespace,
+                [request.path, sorted(request.GET.lists())],
+                tags(**kwargs)
+            )
+
+            def compute() -> bytes:
+                result = func(request, **kwargs)
+                data = schema.model_validate(result, context={"request": request}).model_dump(by_alias=True)
+                return json.dumps(data, cls=NinjaJSONEncoder).encode()
+
+            return HttpResponse(cache_service.get_or_set(key, compute, timeout), content_type="application/json")
+        return wrapper
+    return decorator
@@ -0,0 +1,73 @@
+# core/api/pagination.py
+import base64
+import json
+from typing import Any, List, Optional
+from ninja import Field, Schema
+from ninja.pagination import PaginationBase
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest
+from core.api.exceptions import BadRequestAPIException
+
+
+class KeysetPagination(PaginationBase):
+    """
+    Pagination par curseur (keyset) sur le couple (ordering_field, id), du plus récent au plus ancien.
+
+    Contrairement à OFFSET, chaque page est une simple lecture d'index à partir du curseur :
+    le coût ne dépend pas de la profondeur de la page et aucun COUNT n'est exécuté.
+    `item_attribute` permet de renvoyer une relation de la ligne paginée (ex: `profil`
+    d'un abonnement) plutôt que la ligne elle-même.
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = Field(None, description="Curseur opaque retourné par la page précédente")
+        page_size: int = Field(20, ge=1, le=100)
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str] = None
+
+    def __init__(self, ordering_field: str = 'created_at', item_attribute: Optional[str] = None, **kwargs: Any) -> None:
+        self.ordering_field = ordering_field
+        self.item_attribute = item_attribute
+        super().__init__(**kwargs)
+
+    def _encode_cursor(self, obj) -> str:
+        value = getattr(obj, self.ordering_field)
+        raw = json.dumps([value.isoformat(), str(obj.pk)])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def _decode_cursor(self, queryset: QuerySet, cursor: str):
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            field = queryset.model._meta.get_field(self.ordering_field)
+            return field.to_python(value), queryset.model._meta.pk.to_python(pk)
+        except Exception:
+            raise BadRequestAPIException("Curseur de pagination invalide.")
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        pagination: Input,
+        request: HttpRequest,
+        **params: Any,
+    ) -> Any:
+        queryset = queryset.order_by(f'-{self.ordering_field}', '-pk')
+
+        if pagination.cursor:
+            value, pk = self._decode_cursor(queryset, pagination.cursor)
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__lt': value}) |
+                Q(**{self.ordering_field: value, 'pk__lt': pk})
+            )
+
+        # Une ligne de plus que la taille de page pour savoir s'il reste une page suivante
+        rows = list(queryset[:pagination.page_size + 1])
+        has_next = len(rows) > pagination.page_size
+        rows = rows[:pagination.page_size]
+
+        items = [getattr(row, self.item_attribute) for row in rows] if self.item_attribute else rows
+        return {
+            self.items_attribute: items,
+            "next_cursor": self._encode_cursor(rows[-1]) if has_next else None,
+        }
@@ -0,0 +1,76 @@
+# core/api/prefetch.py
+import typing
+from typing import Any, List, Optional, Tuple, Type
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from pydantic import BaseModel
+
+
+def _nested_schema(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Returns the schema nested in a field annotation (Schema, Optional[Schema], List[Schema]...)."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _plan(model: Type[Model], schema: Type[BaseModel], prefix: str = '') -> Tuple[List[str], List[Any]]:
+    """
+    Walks the nested schemas of `schema` and maps them to the relations of `model`.
+    Single-valued relations (FK, OneToOne) are joined; multi-valued ones (reverse FK, M2M)
+    are prefetched, each with its own queryset planned from the nested schema.
+    """
+    select: List[str] = []
+    prefetch: List[Any] = []
+
+    for name, field in schema.model_fields.items():
+        nested = _nested_schema(field.annotation)
+        if nested is None:
+            continue
+
+        attr = field.validation_alias if isinstance(field.validation_alias, str) else name
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation or model_field.related_model is None:
+            continue
+
+        path = f"{prefix}{attr}"
+        related_model = model_field.related_model
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(Prefetch(path, queryset=prefetch_for_schema(related_model._default_manager.all(), nested)))
+        else:
+            select.append(path)
+            nested_select, nested_prefetch = _plan(related_model, nested, prefix=f"{path}__")
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+
+    return select, prefetch
+
+
+def prefetch_for_schema(queryset: QuerySet, schema: Type[BaseModel], through: Optional[str] = None) -> QuerySet:
+    """
+    Applies the select_related / prefetch_related needed to serialize `queryset` with `schema`,
+    so that the number of queries does not depend on the number of rows.
+
+    `through` is used when the serialized objects are a relation of the queryset rows
+    (ex: the `profil` of each subscription serialized with ProfilOutSchema).
+    """
+    model = queryset.model
+    prefix = ''
+    if through:
+        for part in through.split('__'):
+            model = model._meta.get_field(part).related_model
+        queryset = queryset.select_related(through)
+        prefix = f"{through}__"
+
+    select, prefetch = _plan(model, schema, prefix=prefix)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
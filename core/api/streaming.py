@@ -0,0 +1,38 @@
+# core/api/streaming.py
+from itertools import islice
+from typing import AsyncIterator, Iterator
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, StreamingHttpResponse
+
+STREAM_BATCH_SIZE = 100  # morceaux produits par passage dans le thread synchrone
+
+
+async def _aiter(content: Iterator[str], batch_size: int) -> AsyncIterator[str]:
+    """
+    Consumes a synchronous generator from the event loop, a batch at a time.
+    Every batch runs in the same thread (thread_sensitive), so a server-side cursor opened by
+    the generator keeps using the same database connection.
+    """
+    next_batch = sync_to_async(lambda: list(islice(content, batch_size)))
+    try:
+        while True:
+            batch = await next_batch()
+            if not batch:
+                return
+            yield ''.join(batch)
+    finally:
+        close = getattr(content, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_response(request: HttpRequest, content: Iterator[str], **kwargs) -> StreamingHttpResponse:
+    """
+    StreamingHttpResponse that actually streams under both servers.
+    Under ASGI, Django buffers a synchronous iterator entirely before sending it; it gets an
+    asynchronous one instead. Under WSGI, the synchronous generator is passed as is.
+    """
+    if isinstance(request, ASGIRequest):
+        return StreamingHttpResponse(_aiter(content, STREAM_BATCH_SIZE), **kwargs)
+    return StreamingHttpResponse(content, **kwargs)
@@ -17,6 +17,7 @@ from core.api.schemas import (
     ValidationErrorSchema
 )
 from core.services.auth_service import jwt_auth
+from core.api.prefetch import prefetch_for_schema
 
 logger = logging.getLogger("app")
 
@@ -73,7 +74,7 @@ def create_user_endpoint(request: HttpRequest, payload: UserCreateAdminSchema):
 )
 @paginate(CustomPagination)
 def list_users_endpoint(request: HttpRequest, filters: Query[UserFilterSchema]):
-    users = User.objects.select_related('profil').filter(deleted=False)
+    users = prefetch_for_schema(User.objects.filter(deleted=False), UserDetailSchema)
     
     if filters.search:
         users = users.filter(
@@ -99,7 +100,7 @@ def list_users_endpoint(request: HttpRequest, filters: Query[UserFilterSchema]):
     summary="Récupère un utilisateur par son ID"
 )
 def get_user_endpoint(request: HttpRequest, user_id: str):
-    user = get_object_or_404(User.objects.select_related('profil'), id=user_id, deleted=False)
+    user = get_object_or_404(prefetch_for_schema(User.objects.all(), UserDetailSchema), id=user_id, deleted=False)
     return 200, user
 
 @users_router.put(
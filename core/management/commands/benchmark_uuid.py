@@ -0,0 +1,105 @@
+# core/management/commands/benchmark_uuid.py
+import random
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from core.models import uuid7
+
+
+class BenchUUID4(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cree_le = models.DateTimeField(db_index=True)
+    contenu = models.CharField(max_length=64)
+
+    class Meta:
+        app_label = 'core'
+        managed = False
+        db_table = 'bench_uuid_v4'
+
+
+class BenchUUID7(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    cree_le = models.DateTimeField(db_index=True)
+    contenu = models.CharField(max_length=64)
+
+    class Meta:
+        app_label = 'core'
+        managed = False
+        db_table = 'bench_uuid_v7'
+
+
+def uuid7_floor(moment: float) -> uuid.UUID:
+    """Plus petit uuid7 possible pour un instant donné (secondes Unix) : borne de parcours par plage."""
+    return uuid.UUID(int=(int(moment * 1000) & ((1 << 48) - 1)) << 80)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les clés primaires uuid4 et uuid7 sur deux tables jetables de même schéma : "
+        "insertion par lots, puis lecture des lignes récentes (par plage de clé en v7, par l'index "
+        "sur cree_le en v4, seul moyen d'y accéder). Les tables sont supprimées à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200_000)
+        parser.add_argument('--batch-size', type=int, default=1_000)
+        parser.add_argument('--scans', type=int, default=200, help="Lectures de plages récentes par table")
+        parser.add_argument('--window', type=int, default=1, help="Lots couverts par chaque plage lue")
+
+    def handle(self, *args, **options):
+        models_by_label = (('uuid4', BenchUUID4), ('uuid7', BenchUUID7))
+        with connection.schema_editor() as editor:
+            for _label, model in models_by_label:
+                editor.create_model(model)
+        try:
+            results = {}
+            for label, model in models_by_label:
+                insert, boundaries = self.insert(model, options)
+                scan, rows = self.scan(model, boundaries, options)
+                results[label] = (insert, scan, rows)
+        finally:
+            with connection.schema_editor() as editor:
+                for _label, model in models_by_label:
+                    editor.delete_model(model)
+
+        for label, (insert, scan, rows) in results.items():
+            self.stdout.write(
+                f"{label} : {options['rows']:,} lignes insérées en {insert:.2f} s "
+                f"({options['rows'] / insert:,.0f} lignes/s), {options['scans']} plages récentes lues en "
+                f"{scan * 1000:.1f} ms ({rows:,} lignes)"
+            )
+
+    def insert(self, model, options):
+        """Insère les lignes par lots et retourne la durée et l'instant de début de chaque lot."""
+        boundaries = []
+        start = time.perf_counter()
+        for offset in range(0, options['rows'], options['batch_size']):
+            boundaries.append(time.time())
+            now = datetime.now(dt_timezone.utc)
+            size = min(options['batch_size'], options['rows'] - offset)
+            with transaction.atomic():
+                model.objects.bulk_create([model(cree_le=now, contenu=f'ligne {offset + index}') for index in range(size)])
+        elapsed = time.perf_counter() - start
+        boundaries.append(time.time())
+        return elapsed, boundaries
+
+    def scan(self, model, boundaries, options):
+        """Lit des plages de lots parmi le dernier quart inséré."""
+        rng = random.Random(0)
+        window = options['window']
+        first = max(0, len(boundaries) * 3 // 4 - window)
+        rows = 0
+        start = time.perf_counter()
+        for _ in range(options['scans']):
+            index = rng.randint(first, len(boundaries) - 1 - window)
+            low, high = boundaries[index], boundaries[index + window]
+            if model is BenchUUID7:
+                queryset = model.objects.filter(id__gte=uuid7_floor(low), id__lt=uuid7_floor(high)).order_by('id')
+            else:
+                queryset = model.objects.filter(
+                    cree_le__gte=datetime.fromtimestamp(low, dt_timezone.utc), cree_le__lt=datetime.fromtimestamp(high, dt_timezone.utc)
+                ).order_by('cree_le')
+            rows += len(list(queryset.values_list('id', 'contenu')))
+        return time.perf_counter() - start, rows
@@ -0,0 +1,21 @@
+# core/middleware.py
+
+
+class PublicCacheCsrfMiddleware:
+    """
+    Ne pose pas le cookie CSRF sur les réponses publiques (Cache-Control: public).
+
+    InertiaMiddleware appelle get_token() à chaque requête, ce qui ajoute un Set-Cookie
+    et « Vary: Cookie » à toutes les réponses : un proxy inverse ne pourrait alors plus
+    mettre en cache les réponses anonymes (fil public). À placer entre CsrfViewMiddleware
+    et InertiaMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        cache_control = [directive.strip().lower() for directive in response.get('Cache-Control', '').split(',')]
+        if 'public' in cache_control:
+            request.META['CSRF_COOKIE_NEEDS_UPDATE'] = False
+        return response
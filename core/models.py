@@ -1,4 +1,6 @@
 # core/models.py
+import os
+import time
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
@@ -7,6 +9,26 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
 
+def uuid7() -> uuid.UUID:
+    """
+    UUID ordonné dans le temps (version 7, RFC 9562) : horodatage Unix en millisecondes
+    sur 48 bits, 12 bits de fraction de milliseconde, puis 62 bits aléatoires.
+    Les insertions successives arrivent en fin d'index au lieu d'une position aléatoire.
+    Compatible avec les colonnes UUID existantes (les anciens uuid4 restent valides).
+    """
+    milliseconds, remainder = divmod(time.time_ns(), 1_000_000)
+    sub_millisecond = remainder * 4096 // 1_000_000
+    random_bits = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (
+        (milliseconds & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | sub_millisecond << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
+
+
 # ==========================================
 # 1. MANAGERS
 # ==========================================
@@ -58,6 +80,9 @@ class ENSPMHubBaseModel(models.Model):
     """
     Modèle de base pour tous les modèles du projet.
     Intègre UUID, Timestamps et Soft Delete.
+
+    Les tables à forte croissance peuvent opter pour des identifiants ordonnés dans le temps
+    en redéclarant `id` avec `default=uuid7`.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Date de création"))
@@ -71,6 +96,10 @@ class ENSPMHubBaseModel(models.Model):
     objects = SoftDeleteManager()
     all_objects = AllObjectsManager()
 
+    # Relations qui suivent la suppression logique : liste de ('app.Modele', 'champ_fk')
+    # Exécutée par core.services.soft_delete_service
+    SOFT_DELETE_CASCADE = ()
+
     class Meta:
         abstract = True
 
@@ -121,6 +150,10 @@ class User(AbstractBaseUser, PermissionsMixin, ENSPMHubBaseModel):
 
     objects = CustomUserManager()
 
+    SOFT_DELETE_CASCADE = (
+        ('core.Profil', 'user'),
+    )
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
@@ -160,6 +193,12 @@ class Profil(ENSPMHubBaseModel):
     domaine = models.CharField(max_length=100, null=True, blank=True, verbose_name=_("Domaine"))
     bio = models.TextField(null=True, blank=True, verbose_name=_("Bio"))
 
+    SOFT_DELETE_CASCADE = (
+        ('core.LienReseauSocial', 'profil'),
+        ('organizations.MembreOrganisation', 'profil'),
+        ('organizations.AbonnementOrganisation', 'profil'),
+    )
+
     class Meta:
         verbose_name = _("Profil")
         db_table = 'profil'
@@ -208,6 +247,7 @@ class AuditLog(ENSPMHubBaseModel):
         VIEW = 'VIEW', _('View')
         ACCESS_DENIED = 'ACCESS_DENIED', _('Access denied')
 
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)  # Table à forte croissance : UUID ordonné
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
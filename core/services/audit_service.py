@@ -2,7 +2,7 @@
 import logging
 from core.models import AuditLog, User
 from django.http import HttpRequest
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 
 logger = logging.getLogger('app')
 
@@ -74,5 +74,44 @@ class AuditLogService:
         )
         return audit_log
 
+    @staticmethod
+    def log_actions_bulk(
+        user: User,
+        action: AuditLog.AuditAction,
+        entity_type: str,
+        entries: List[Dict[str, Any]],
+        request: Optional[HttpRequest] = None
+    ) -> List[AuditLog]:
+        """
+        Enregistre en une seule insertion la même action sur plusieurs entités.
+
+        :param user: L'utilisateur qui a effectué l'action.
+        :param action: Le type d'action (ex: AuditLog.AuditAction.UPDATE).
+        :param entity_type: Le type des entités affectées.
+        :param entries: Liste de dictionnaires {'entity_id', 'old_values', 'new_values'}.
+        :param request: L'objet HttpRequest pour les infos d'accès.
+        :return: Les objets AuditLog créés.
+        """
+        request_info = AuditLogService._extract_request_info(request)
+
+        audit_logs = AuditLog.objects.bulk_create([
+            AuditLog(
+                user=user,
+                action=action,
+                entity_type=entity_type,
+                entity_id=entry['entity_id'],
+                old_values=entry.get('old_values'),
+                new_values=entry.get('new_values'),
+                ip_address=request_info['ip_address'],
+                user_agent=request_info['user_agent']
+            )
+            for entry in entries
+        ])
+
+        logger.info(
+            f"Audit logs created: User {user.id} performed {action} on {len(audit_logs)} {entity_type}"
+        )
+        return audit_logs
+
 # Instance unique du service pour une utilisation globale
 audit_log_service = AuditLogService()
\ No newline at end of file
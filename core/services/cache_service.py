@@ -0,0 +1,102 @@
+# core/services/cache_service.py
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger('app')
+
+
+class CacheService:
+    """
+    Cache applicatif en lecture (read-through) avec invalidation par tags.
+
+    Chaque tag porte un numéro de version stocké dans le cache ; la clé d'une entrée
+    inclut les versions de ses tags. Invalider un tag revient à incrémenter sa version :
+    toutes les entrées qui en dépendent deviennent inaccessibles et expirent d'elles-mêmes.
+    Un verrou (cache.add) garantit qu'une clé froide n'est calculée qu'une seule fois.
+    """
+    KEY_PREFIX = 'rc'
+    LOCK_TIMEOUT = 10  # secondes
+    LOCK_POLL_INTERVAL = 0.05  # secondes
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"{CacheService.KEY_PREFIX}:tag:{tag}"
+
+    @staticmethod
+    def _tag_versions(tags: List[str]) -> List[int]:
+        """Returns the current version of each tag, initialising the missing ones."""
+        keys = [CacheService._tag_key(tag) for tag in tags]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # Version initiale horodatée : une version évincée ne peut pas revenir à une valeur déjà vue
+                cache.add(key, time.time_ns(), None)
+                versions[key] = cache.get(key)
+        return [versions[key] for key in keys]
+
+    @staticmethod
+    def build_key(namespace: str, parts: Iterable[Any], tags: List[str]) -> str:
+        """Builds a cache key from its parts and the current versions of its tags."""
+        raw = '|'.join(str(part) for part in parts)
+        versions = '.'.join(str(version) for version in CacheService._tag_versions(tags))
+        digest = hashlib.md5(f"{raw}|{versions}".encode()).hexdigest()
+        return f"{CacheService.KEY_PREFIX}:{namespace}:{digest}"
+
+    @staticmethod
+    def get_or_set(key: str, compute: Callable[[], Any], timeout: Optional[int] = None) -> Any:
+        """
+        Returns the cached value for `key`, computing and storing it on a miss.
+        Concurrent misses on the same key wait for the first computation instead of repeating it.
+        """
+        timeout = timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, CacheService.LOCK_TIMEOUT):
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+                return value
+            finally:
+                cache.delete(lock_key)
+
+        # Un autre worker calcule déjà cette clé : on attend son résultat
+        deadline = time.monotonic() + CacheService.LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(CacheService.LOCK_POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+        logger.warning(f"Attente du verrou de cache expirée pour {key}, calcul sans cache.")
+        return compute()
+
+    @staticmethod
+    def invalidate_tags(tags: Iterable[str]):
+        """Invalidates every entry depending on one of the given tags."""
+        for tag in tags:
+            key = CacheService._tag_key(tag)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    @staticmethod
+    def invalidate_tags_on_commit(tags: Iterable[str]):
+        """
+        Invalidates the tags once the current transaction commits (immediately outside a transaction).
+        Invalidating earlier would let a concurrent reader cache the pre-commit rows under the new versions.
+        """
+        tags = list(tags)
+        transaction.on_commit(lambda: CacheService.invalidate_tags(tags))
+
+
+# Instance unique du service pour une utilisation globale
+cache_service = CacheService()
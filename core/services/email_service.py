@@ -24,7 +24,8 @@ class EmailService:
         from_email: Optional[str] = None,
         cc_emails: Optional[List[str]] = None,
         bcc_emails: Optional[List[str]] = None,
-        attachments: Optional[List[tuple]] = None
+        attachments: Optional[List[tuple]] = None,
+        connection=None
     ) -> bool:
         """
         Envoie un email de manière synchrone.
@@ -38,6 +39,7 @@ class EmailService:
             cc_emails: Liste des destinataires en copie
             bcc_emails: Liste des destinataires en copie cachée
             attachments: Liste de tuples (filename, content, mimetype)
+            connection: Connexion SMTP ouverte à réutiliser (envois par lots), sinon une connexion par email
             
         Returns:
             bool: True si l'envoi a réussi, False sinon
@@ -66,7 +68,8 @@ class EmailService:
                 from_email=from_email,
                 to=to_emails,
                 cc=cc_emails or [],
-                bcc=bcc_emails or []
+                bcc=bcc_emails or [],
+                connection=connection
             )
             
             # Attacher la version HTML
@@ -0,0 +1,101 @@
+# core/services/soft_delete_service.py
+import logging
+from typing import Dict, List, Tuple, Type
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Exists, Model, OuterRef, QuerySet
+from django.utils import timezone
+
+logger = logging.getLogger('app')
+
+
+class SoftDeleteService:
+    """
+    Suppression logique en cascade, exécutée de manière ensembliste.
+
+    Chaque modèle déclare dans SOFT_DELETE_CASCADE les relations qui suivent sa suppression,
+    sous la forme ('app.Modele', 'champ_fk'). La cascade est planifiée niveau par niveau
+    sous forme de sous-requêtes, puis exécutée avec un UPDATE par relation, des feuilles
+    vers la racine, dans une seule transaction. Toutes les lignes d'une même cascade
+    reçoivent le même `deleted_at`, ce qui permet à la restauration de ne rétablir que
+    les lignes supprimées par la cascade (et non celles supprimées indépendamment avant).
+    """
+    MAX_DEPTH = 5
+
+    @staticmethod
+    def _plan(queryset: QuerySet, restore: bool) -> List[Tuple[Type[Model], QuerySet]]:
+        """
+        Returns the (model, queryset) pairs affected by the cascade, root first.
+        Nothing is evaluated here: each level is a subquery on the previous one.
+        """
+        model = queryset.model
+        root = model.all_objects.filter(pk__in=queryset.values('pk'), deleted=restore)
+        plan = [(model, root)]
+        level = [(model, root)]
+
+        for _depth in range(SoftDeleteService.MAX_DEPTH):
+            next_level = []
+            for parent_model, parent_qs in level:
+                for label, fk_name in parent_model.SOFT_DELETE_CASCADE:
+                    child_model = apps.get_model(label)
+                    if restore:
+                        # Seules les lignes supprimées en même temps que leur parent sont restaurées
+                        fk_attname = child_model._meta.get_field(fk_name).attname
+                        same_cascade = parent_qs.filter(pk=OuterRef(fk_attname), deleted_at=OuterRef('deleted_at'))
+                        child_qs = child_model.all_objects.filter(Exists(same_cascade), deleted=True)
+                    else:
+                        child_qs = child_model.all_objects.filter(
+                            **{f'{fk_name}__in': parent_qs.values('pk')}, deleted=False
+                        )
+                    next_level.append((child_model, child_qs))
+            if not next_level:
+                return plan
+            plan.extend(next_level)
+            level = next_level
+
+        raise ValueError(
+            f"La cascade de suppression de {model._meta.label} dépasse {SoftDeleteService.MAX_DEPTH} niveaux "
+            "(SOFT_DELETE_CASCADE cyclique ?)."
+        )
+
+    @staticmethod
+    def _run(queryset: QuerySet, restore: bool, dry_run: bool) -> Dict[str, int]:
+        plan = SoftDeleteService._plan(queryset, restore)
+        counts = {model._meta.label: 0 for model, _qs in plan}
+
+        if dry_run:
+            for model, level_qs in plan:
+                counts[model._meta.label] += level_qs.count()
+            return counts
+
+        values = {'deleted': False, 'deleted_at': None} if restore else {'deleted': True, 'deleted_at': timezone.now()}
+        with transaction.atomic():
+            # Des feuilles vers la racine : chaque niveau est sélectionné d'après l'état encore intact de son parent
+            for model, level_qs in reversed(plan):
+                counts[model._meta.label] += level_qs.update(**values)
+
+        logger.info(
+            f"{'Restauration' if restore else 'Suppression logique'} en cascade de {queryset.model._meta.label} : {counts}"
+        )
+        return counts
+
+    @staticmethod
+    def soft_delete(queryset: QuerySet, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Soft deletes the rows of `queryset` and every relation declared in SOFT_DELETE_CASCADE.
+        Returns the number of affected rows per model; with `dry_run`, only counts them.
+        Model signals are not sent: callers refresh derived data (caches, facets) themselves.
+        """
+        return SoftDeleteService._run(queryset, restore=False, dry_run=dry_run)
+
+    @staticmethod
+    def restore(queryset: QuerySet, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Restores the rows of `queryset` (use `all_objects`) and the related rows deleted with them.
+        Returns the number of affected rows per model; with `dry_run`, only counts them.
+        """
+        return SoftDeleteService._run(queryset, restore=True, dry_run=dry_run)
+
+
+# Instance unique du service pour une utilisation globale
+soft_delete_service = SoftDeleteService()
@@ -9,6 +9,7 @@ from django.core.files.storage import default_storage
 from django.conf import settings
 from core.models import User, Profil
 from core.services.audit_service import audit_log_service, AuditLog
+from core.services.soft_delete_service import soft_delete_service
 from core.services.email_service import EmailTemplates
 from PIL import Image
 from io import BytesIO
@@ -92,7 +93,8 @@ class UserService:
     @staticmethod
     @transaction.atomic
     def soft_delete_user(acting_user: User, user_to_delete: User, request=None):
-        user_to_delete.soft_delete()
+        # Le profil, ses liens, adhésions et abonnements suivent l'utilisateur (User.SOFT_DELETE_CASCADE)
+        soft_delete_service.soft_delete(User.objects.filter(id=user_to_delete.id))
         logger.info(f"Utilisateur (ID: {user_to_delete.id}) supprimé (soft delete) par {acting_user.email}.")
         audit_log_service.log_action(
             user=acting_user,
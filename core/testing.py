@@ -0,0 +1,9 @@
+# core/testing.py
+from core.models import Profil, User
+
+
+def create_user(email: str, role_systeme: str = 'user') -> User:
+    """Utilisateur actif avec son profil, pour les tests des applications."""
+    user = User.objects.create(email=email, est_actif=True, role_systeme=role_systeme)
+    Profil.objects.create(user=user, nom_complet=email.split('@')[0])
+    return user
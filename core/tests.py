@@ -0,0 +1,95 @@
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from core.models import LienReseauSocial, Profil, User
+from core.services.cache_service import cache_service
+from core.services.soft_delete_service import SoftDeleteService
+from core.testing import create_user
+from feeds.models import Commentaire, Post
+from organizations.models import AbonnementOrganisation, MembreOrganisation, Organisation
+
+
+class UserListQueryCountTests(TestCase):
+    """Le nombre de requêtes de la liste des utilisateurs ne dépend pas de la taille de la page."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('admin@example.com', role_systeme='admin_site')
+        for i in range(30):
+            create_user(f'utilisateur{i}@example.com')
+
+    def test_users_queries(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.admin)}'}
+        for page_size in (2, 25):
+            with self.assertNumQueries(3):
+                response = self.client.get('/api/v1/users/', {'page_size': page_size}, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['items']), page_size)
+
+
+class CacheInvalidationTests(TestCase):
+    def test_tags_invalidated_only_after_commit(self):
+        """Un lecteur concurrent ne peut pas remettre en cache les lignes d'avant le commit sous la nouvelle version."""
+        key = cache_service.build_key('test', ['detail'], ['organisations'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            cache_service.invalidate_tags_on_commit(tag for tag in ['organisations'])
+            self.assertEqual(cache_service.build_key('test', ['detail'], ['organisations']), key)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache_service.build_key('test', ['detail'], ['organisations']), key)
+
+
+class SoftDeleteCascadeTests(TestCase):
+    def setUp(self):
+        self.organisation = Organisation.objects.create(nom_organisation='Grande école', type_organisation='universite', statut='active')
+        self.user = create_user('membre@example.com')
+        profil = self.user.profil
+        self.liens = [
+            LienReseauSocial.objects.create(profil=profil, nom_reseau='GitHub', url='https://github.com/membre'),
+            LienReseauSocial.objects.create(profil=profil, nom_reseau='SiteWeb', url='https://membre.example.com'),
+        ]
+        MembreOrganisation.objects.create(profil=profil, organisation=self.organisation)
+        AbonnementOrganisation.objects.create(profil=profil, organisation=self.organisation)
+        # Lien supprimé indépendamment, avant la cascade
+        self.liens[1].soft_delete()
+
+    def test_cascade_reaches_every_declared_relation(self):
+        counts = SoftDeleteService.soft_delete(User.objects.filter(id=self.user.id))
+        self.assertEqual(counts, {
+            'core.User': 1, 'core.Profil': 1, 'core.LienReseauSocial': 1,
+            'organizations.MembreOrganisation': 1, 'organizations.AbonnementOrganisation': 1,
+        })
+        self.assertFalse(Profil.objects.filter(user=self.user).exists())
+        self.assertFalse(MembreOrganisation.objects.filter(organisation=self.organisation).exists())
+        self.assertFalse(AbonnementOrganisation.objects.filter(organisation=self.organisation).exists())
+        # Toute la cascade partage le même deleted_at
+        self.assertEqual(
+            Profil.all_objects.get(user=self.user).deleted_at, User.all_objects.get(id=self.user.id).deleted_at
+        )
+
+    def test_cascade_spans_several_levels(self):
+        post = Post.objects.create(contenu='Annonce', auteur_organisation=self.organisation)
+        Commentaire.objects.create(post=post, contenu='Bravo', auteur_profil=self.user.profil)
+        counts = SoftDeleteService.soft_delete(Organisation.objects.filter(id=self.organisation.id))
+        self.assertEqual(counts['feeds.Post'], 1)
+        self.assertEqual(counts['feeds.Commentaire'], 1)
+        self.assertFalse(Commentaire.objects.filter(post=post).exists())
+
+    def test_restore_only_brings_back_rows_of_the_same_cascade(self):
+        SoftDeleteService.soft_delete(User.objects.filter(id=self.user.id))
+        counts = SoftDeleteService.restore(User.all_objects.filter(id=self.user.id))
+        self.assertEqual(counts['core.LienReseauSocial'], 1)
+        self.assertTrue(LienReseauSocial.objects.filter(id=self.liens[0].id).exists())
+        self.assertFalse(LienReseauSocial.objects.filter(id=self.liens[1].id).exists())
+        self.assertTrue(MembreOrganisation.objects.filter(organisation=self.organisation).exists())
+        self.assertFalse(User.all_objects.get(id=self.user.id).deleted)
+
+    def test_dry_run_counts_without_writing(self):
+        queryset = User.objects.filter(id=self.user.id)
+        counts = SoftDeleteService.soft_delete(queryset, dry_run=True)
+        self.assertFalse(User.all_objects.get(id=self.user.id).deleted)
+        self.assertEqual(LienReseauSocial.objects.filter(profil=self.user.profil).count(), 1)
+        self.assertEqual(counts, SoftDeleteService.soft_delete(queryset))
+
+        restore_counts = SoftDeleteService.restore(User.all_objects.filter(id=self.user.id), dry_run=True)
+        self.assertTrue(User.all_objects.get(id=self.user.id).deleted)
+        self.assertEqual(restore_counts, SoftDeleteService.restore(User.all_objects.filter(id=self.user.id)))
@@ -9,6 +9,8 @@ import logging
 from core.api.auth import auth_router
 from core.api.users import users_router
 from organizations.api.views import organizations_router
+from feeds.api.views import feeds_router
+from chat.api.views import chat_router
 from core.api.exceptions import BaseAPIException
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,8 @@ api_v1 = NinjaAPI(
 api_v1.add_router("/auth/", auth_router)
 api_v1.add_router("/users/", users_router)
 api_v1.add_router("/organizations/", organizations_router)
+api_v1.add_router("/feeds/", feeds_router)
+api_v1.add_router("/chat/", chat_router)
 
 # Gestionnaires d'exceptions globaux
 @api_v1.exception_handler(ValidationError)
@@ -2,6 +2,8 @@
 ASGI config for enspm_hub project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections (group chat) go to
+chat.realtime.websocket.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'enspm_hub.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Importé après get_asgi_application() : les modèles doivent être chargés
+from chat.realtime.websocket import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await websocket_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -139,6 +139,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.PublicCacheCsrfMiddleware',
     "inertia.middleware.InertiaMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
@@ -178,6 +179,55 @@ else:
         }
     }
 
+# Fonctions PostgreSQL (recherche trigramme de l'annuaire) : nécessite psycopg, donc seulement sous PostgreSQL
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+
+# Cache
+# locmemcache:// par défaut ; en production multi-workers, utiliser un cache partagé
+# (ex: CACHE_URL=rediscache://127.0.0.1:6379/1 ou dbcache://enspm_hub_cache)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Durée de vie des réponses publiques mises en cache (annuaire, détail organisation)
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300) # type: ignore
+
+# Fil d'actualité : au-delà de ce nombre d'abonnés, les posts d'une organisation ne sont plus
+# distribués dans chaque fil (push) mais fusionnés à la lecture (pull)
+FEED_CELEBRITY_THRESHOLD = env.int('FEED_CELEBRITY_THRESHOLD', default=2000) # type: ignore
+
+# Classement du fil par pertinence : poids de chaque signal (voir feeds/services/ranking_service.py)
+FEED_RANKING_WEIGHTS = {
+    'recence': 1.0,
+    'affinite': 0.6,
+    'engagement': 0.4,
+    'domaine': 0.3,
+    'deja_vu': -1.0,
+}
+# Demi-vie de la fraîcheur d'un post, en heures
+FEED_RANKING_HALF_LIFE_HOURS = env.float('FEED_RANKING_HALF_LIFE_HOURS', default=24.0) # type: ignore
+# Fil public (visiteurs anonymes) : durée de vie de l'instantané et du cache HTTP, en secondes
+PUBLIC_FEED_REFRESH = env.int('PUBLIC_FEED_REFRESH', default=60) # type: ignore
+
+# Messagerie temps réel (WebSocket, ASGI) : backend de diffusion entre connexions.
+# InMemoryPubSub pour un seul worker ; SqlitePubSub (fichier partagé) pour plusieurs workers sur une machine.
+CHAT_PUBSUB = {
+    'BACKEND': env.str('CHAT_PUBSUB_BACKEND', default='chat.realtime.pubsub.InMemoryPubSub'), # type: ignore
+    'OPTIONS': {},  # SqlitePubSub : path (BASE_DIR/chat_pubsub.db par défaut), poll_interval, retention
+}
+# Messages en attente d'envoi par connexion : au-delà, le client trop lent est déconnecté
+CHAT_WS_QUEUE_SIZE = env.int('CHAT_WS_QUEUE_SIZE', default=100) # type: ignore
+# Revérification de l'adhésion des connexions ouvertes, en secondes (retraits faits sans signal)
+CHAT_WS_RECHECK_INTERVAL = env.int('CHAT_WS_RECHECK_INTERVAL', default=60) # type: ignore
+# Pièces jointes du chat, téléversées par morceaux (voir chat/services/televersement_service.py)
+CHAT_UPLOAD_DIR = env.str('CHAT_UPLOAD_DIR', default=os.path.join(BASE_DIR, 'televersements')) # type: ignore
+CHAT_UPLOAD_CHUNK_SIZE = env.int('CHAT_UPLOAD_CHUNK_SIZE', default=4 * 1024 * 1024) # type: ignore
+CHAT_UPLOAD_MAX_SIZE = env.int('CHAT_UPLOAD_MAX_SIZE', default=200 * 1024 * 1024) # type: ignore
+# Durée de vie d'un téléversement sans nouveau morceau, en heures, avant nettoyage
+CHAT_UPLOAD_EXPIRY_HOURS = env.int('CHAT_UPLOAD_EXPIRY_HOURS', default=24) # type: ignore
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,78 @@
+# feeds/api/schemas.py
+from typing import List, Optional
+from ninja import ModelSchema, Field
+from ninja.schema import Schema
+from uuid import UUID
+from pydantic import UUID4
+from feeds.models import Post, Commentaire, Evenement, InscriptionEvenement
+
+
+class PostOutSchema(ModelSchema):
+    """Schéma de sortie d'un Post (inclut l'URL de l'image)"""
+    image: Optional[str] = None
+
+    class Meta:
+        model = Post
+        fields = [
+            'id', 'contenu', 'image', 'auteur_profil', 'auteur_organisation',
+            'nombre_likes', 'nombre_commentaires', 'created_at'
+        ]
+
+    @staticmethod
+    def resolve_image(obj):
+        return obj.image.url if obj.image else None
+
+
+class PostCreateSchema(Schema):
+    """Publication d'un post ; `organisation_id` pour publier au nom d'une organisation administrée"""
+    contenu: str = Field(..., min_length=1)
+    organisation_id: Optional[UUID4] = None
+
+
+class TimelinePageSchema(Schema):
+    """Page du fil d'actualité (pagination par curseur)"""
+    items: List[PostOutSchema]
+    next_cursor: Optional[str] = None
+
+
+class LikeCountSchema(Schema):
+    """Nombre de likes ; `exact` indique un comptage direct plutôt que le compteur différé"""
+    nombre_likes: int
+    exact: bool
+
+
+class CommentaireOutSchema(ModelSchema):
+    class Meta:
+        model = Commentaire
+        fields = ['id', 'post', 'contenu', 'auteur_profil', 'auteur_organisation', 'created_at']
+
+
+class CommentaireCreateSchema(Schema):
+    """Commentaire d'un post ; `organisation_id` pour commenter au nom d'une organisation administrée"""
+    contenu: str = Field(..., min_length=1)
+    organisation_id: Optional[UUID4] = None
+
+
+class PostsVusSchema(Schema):
+    """Lot de posts affichés à l'écran, envoyé périodiquement par le client"""
+    post_ids: List[UUID]
+
+
+class EvenementOutSchema(ModelSchema):
+    class Meta:
+        model = Evenement
+        fields = [
+            'id', 'titre', 'description', 'lieu', 'date_debut', 'date_fin',
+            'lien_inscription', 'capacite', 'places_reservees', 'organisateur_profil', 'organisateur_organisation'
+        ]
+
+
+class InscriptionOutSchema(ModelSchema):
+    class Meta:
+        model = InscriptionEvenement
+        fields = ['id', 'evenement', 'statut', 'created_at']
+
+
+class CalendrierLienSchema(Schema):
+    """Adresse du flux iCalendar personnel, à ajouter dans une application de calendrier"""
+    url: str
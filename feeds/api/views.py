@@ -0,0 +1,331 @@
+# feeds/api/views.py
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from ninja import Router, Query
+from ninja.pagination import paginate
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.urls import reverse
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from core.services.auth_service import jwt_auth
+from core.api.schemas import MessageSchema, ValidationErrorSchema
+from core.api.pagination import KeysetPagination
+from core.api.streaming import streaming_response
+from feeds.services.post_service import post_service
+from feeds.services.timeline_service import timeline_service
+from feeds.services.ranking_service import ranking_service
+from feeds.services.vus_service import posts_vus_service
+from feeds.services.like_service import like_service
+from feeds.services.commentaire_service import commentaire_service
+from feeds.services.evenement_service import evenement_service
+from feeds.services.inscription_service import inscription_service
+from feeds.services.public_feed_service import public_feed_service
+from .schemas import (
+    PostOutSchema,
+    PostCreateSchema,
+    TimelinePageSchema,
+    LikeCountSchema,
+    PostsVusSchema,
+    CommentaireOutSchema,
+    CommentaireCreateSchema,
+    EvenementOutSchema,
+    CalendrierLienSchema,
+    InscriptionOutSchema,
+)
+
+feeds_router = Router(tags=["Fil d'actualité"])
+
+
+@feeds_router.post(
+    "/posts",
+    response={201: PostOutSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Publier un post"
+)
+def create_post_endpoint(request: HttpRequest, payload: PostCreateSchema):
+    """
+    Publie un post au nom du profil connecté, ou d'une organisation dont il administre la page.
+    Le post est ensuite distribué en tâche de fond dans les fils des abonnés.
+    """
+    post = post_service.create_post(acting_user=request.auth, data=payload.dict())  # type: ignore
+    return 201, post
+
+
+@feeds_router.get(
+    "/timeline",
+    response={200: TimelinePageSchema, 400: MessageSchema, 401: MessageSchema},
+    auth=jwt_auth,
+    summary="Fil d'actualité de l'utilisateur connecté"
+)
+def timeline_endpoint(
+    request: HttpRequest,
+    cursor: Optional[str] = Query(None, description="Curseur opaque retourné par la page précédente"),
+    page_size: int = Query(20, ge=1, le=100),
+    masquer_vus: bool = Query(False, description="Exclure les posts déjà vus")
+):
+    """
+    Fusionne les posts distribués dans le fil (push) et ceux des organisations très suivies,
+    lus à la demande (pull). Pagination par curseur, comme les autres listes chronologiques.
+    """
+    return timeline_service.get_timeline_page(
+        acting_user=request.auth, cursor=cursor, page_size=page_size, masquer_vus=masquer_vus  # type: ignore
+    )
+
+
+@feeds_router.get(
+    "/public",
+    response={200: None, 304: None},
+    summary="Fil public (visiteurs anonymes)"
+)
+def public_feed_endpoint(request: HttpRequest):
+    """
+    Derniers posts des organisations et prochains événements, servis depuis un instantané.
+    La réponse ne dépend pas de l'utilisateur : un proxy inverse peut la mettre en cache.
+    """
+    snapshot = public_feed_service.get_snapshot()
+    response = get_conditional_response(request, etag=snapshot['etag'])
+    if response is None:
+        response = HttpResponse(snapshot['body'], content_type="application/json")
+    response['ETag'] = snapshot['etag']
+    patch_cache_control(
+        response, public=True, max_age=settings.PUBLIC_FEED_REFRESH, stale_while_revalidate=settings.PUBLIC_FEED_REFRESH
+    )
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+@feeds_router.get(
+    "/timeline/pertinence",
+    response={200: List[PostOutSchema], 401: MessageSchema},
+    auth=jwt_auth,
+    summary="Fil d'actualité classé par pertinence"
+)
+def ranked_timeline_endpoint(request: HttpRequest, limit: int = Query(20, ge=1, le=50)):
+    """
+    Classe les posts les plus récents du fil selon la fraîcheur, l'affinité avec l'auteur
+    (organisation ou groupe en commun), l'engagement et le domaine du lecteur.
+    Les posts déjà vus sont relégués plus bas.
+    """
+    candidates = timeline_service.get_timeline_page(
+        acting_user=request.auth, cursor=None, page_size=ranking_service.CANDIDATES  # type: ignore
+    )['items']
+    return ranking_service.rank(acting_user=request.auth, posts=candidates)[:limit]  # type: ignore
+
+
+@feeds_router.post(
+    "/vus",
+    response={204: None, 400: MessageSchema, 401: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Signaler des posts vus"
+)
+def mark_seen_endpoint(request: HttpRequest, payload: PostsVusSchema):
+    """
+    Balise de lecture : le client envoie par lots (100 max) les posts affichés à l'écran.
+    """
+    posts_vus_service.mark_seen(request.auth.profil.id, payload.post_ids)  # type: ignore
+    return 204, None
+
+# ==========================================
+# Likes
+# ==========================================
+
+@feeds_router.post(
+    "/posts/{post_id}/like",
+    response={201: MessageSchema, 400: MessageSchema, 401: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Aimer un post"
+)
+def like_post_endpoint(request: HttpRequest, post_id: UUID):
+    like_service.like_post(acting_user=request.auth, post_id=post_id)  # type: ignore
+    return 201, {"detail": "Post aimé."}
+
+
+@feeds_router.delete(
+    "/posts/{post_id}/like",
+    response={204: None, 401: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Retirer son like d'un post"
+)
+def unlike_post_endpoint(request: HttpRequest, post_id: UUID):
+    like_service.unlike_post(acting_user=request.auth, post_id=post_id)  # type: ignore
+    return 204, None
+
+
+@feeds_router.get(
+    "/posts/{post_id}/likes",
+    response={200: LikeCountSchema, 404: MessageSchema},
+    summary="Nombre de likes d'un post"
+)
+def like_count_endpoint(request: HttpRequest, post_id: UUID, exact: bool = False):
+    """
+    Par défaut, renvoie le compteur du post, mis à jour en différé (à la minute près).
+    Avec `exact=true`, compte directement les likes.
+    """
+    return like_service.get_like_count(post_id=post_id, exact=exact)
+
+
+# ==========================================
+# Commentaires
+# ==========================================
+
+@feeds_router.get(
+    "/commentaires/recents",
+    response={200: Dict[str, List[CommentaireOutSchema]], 400: MessageSchema, 422: ValidationErrorSchema},
+    summary="Derniers commentaires de plusieurs posts"
+)
+def latest_commentaires_endpoint(request: HttpRequest, post_ids: List[UUID] = Query(...)):
+    """
+    Renvoie les deux commentaires les plus récents de chaque post demandé (cartes du fil),
+    en une seule requête.
+    """
+    return commentaire_service.latest_commentaires(post_ids)
+
+
+@feeds_router.get(
+    "/posts/{post_id}/commentaires",
+    response=List[CommentaireOutSchema],
+    summary="Lister les commentaires d'un post"
+)
+@paginate(KeysetPagination)
+def list_commentaires_endpoint(request: HttpRequest, post_id: UUID):
+    return commentaire_service.list_commentaires(post_id)
+
+
+@feeds_router.post(
+    "/posts/{post_id}/commentaires",
+    response={201: CommentaireOutSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Commenter un post"
+)
+def create_commentaire_endpoint(request: HttpRequest, post_id: UUID, payload: CommentaireCreateSchema):
+    commentaire = commentaire_service.add_commentaire(
+        acting_user=request.auth,  # type: ignore
+        post_id=post_id,
+        data=payload.dict()
+    )
+    return 201, commentaire
+
+
+@feeds_router.delete(
+    "/commentaires/{commentaire_id}",
+    response={204: None, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Supprimer un commentaire"
+)
+def delete_commentaire_endpoint(request: HttpRequest, commentaire_id: UUID):
+    commentaire_service.delete_commentaire(acting_user=request.auth, commentaire_id=commentaire_id)  # type: ignore
+    return 204, None
+
+# ==========================================
+# Événements et calendriers
+# ==========================================
+
+@feeds_router.get(
+    "/evenements",
+    response={200: List[EvenementOutSchema], 400: MessageSchema, 422: ValidationErrorSchema},
+    summary="Événements d'une période (calendrier)"
+)
+def list_evenements_endpoint(
+    request: HttpRequest,
+    debut: datetime = Query(..., description="Début de la période affichée"),
+    fin: datetime = Query(..., description="Fin de la période affichée (366 jours max)"),
+    organisation_id: Optional[UUID] = None
+):
+    """
+    Retourne les événements qui chevauchent la période [debut, fin], par date de début.
+    """
+    return evenement_service.list_in_range(debut, fin, organisation_id)
+
+
+@feeds_router.post(
+    "/evenements/{evenement_id}/inscription",
+    response={201: InscriptionOutSchema, 400: MessageSchema, 401: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="S'inscrire à un événement"
+)
+def register_endpoint(request: HttpRequest, evenement_id: UUID):
+    """
+    Réserve une place si l'événement n'est pas complet ; sinon, inscrit en liste d'attente.
+    """
+    return 201, inscription_service.register(acting_user=request.auth, evenement_id=evenement_id)  # type: ignore
+
+
+@feeds_router.delete(
+    "/evenements/{evenement_id}/inscription",
+    response={204: None, 401: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Annuler son inscription à un événement"
+)
+def cancel_registration_endpoint(request: HttpRequest, evenement_id: UUID):
+    """
+    La place libérée revient à la première personne de la liste d'attente.
+    """
+    inscription_service.cancel(acting_user=request.auth, evenement_id=evenement_id)  # type: ignore
+    return 204, None
+
+
+@feeds_router.get(
+    "/evenements/{evenement_id}/inscriptions.csv",
+    response={200: None, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    auth=jwt_auth,
+    summary="Exporter la liste des inscrits (CSV)"
+)
+def export_registrations_endpoint(request: HttpRequest, evenement_id: UUID):
+    """
+    Export en flux, réservé à l'organisateur : les inscrits confirmés puis la liste d'attente.
+    """
+    rows = inscription_service.export_rows(acting_user=request.auth, evenement_id=evenement_id)  # type: ignore
+    response = streaming_response(request, rows, content_type="text/csv; charset=utf-8")
+    response['Content-Disposition'] = f'attachment; filename="inscriptions-{evenement_id}.csv"'
+    return response
+
+
+def _ical_response(request: HttpRequest, calendar: QuerySet, nom: str) -> HttpResponse:
+    """Réponse .ics en flux, ou 304 si le client possède déjà cette version (If-None-Match)."""
+    etag = f'"{evenement_service.calendar_etag(calendar)}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = streaming_response(request, evenement_service.ical_stream(calendar, nom), content_type="text/calendar; charset=utf-8")
+    response['ETag'] = etag
+    return response
+
+
+@feeds_router.get(
+    "/organisations/{org_id}/calendrier.ics",
+    response={200: None, 304: None, 404: MessageSchema},
+    summary="Flux iCalendar des événements d'une organisation"
+)
+def organisation_calendar_endpoint(request: HttpRequest, org_id: UUID):
+    calendar = evenement_service.organisation_calendar(org_id)
+    return _ical_response(request, calendar, "Événements de l'organisation")
+
+
+@feeds_router.get(
+    "/calendrier/lien",
+    response={200: CalendrierLienSchema, 401: MessageSchema},
+    auth=jwt_auth,
+    summary="Lien du flux iCalendar personnel"
+)
+def calendar_link_endpoint(request: HttpRequest):
+    """
+    Le lien contient un jeton signé : il identifie le profil sans JWT et ne doit pas être partagé.
+    """
+    token = evenement_service.calendar_token(request.auth)  # type: ignore
+    return {'url': request.build_absolute_uri(reverse('api-1.0.0:profil_calendar', kwargs={'token': token}))}
+
+
+@feeds_router.get(
+    "/calendrier/{token}.ics",
+    response={200: None, 304: None, 404: MessageSchema},
+    url_name="profil_calendar",
+    summary="Flux iCalendar personnel"
+)
+def profil_calendar_endpoint(request: HttpRequest, token: str):
+    """
+    Événements organisés par le profil et par les organisations dont il est membre ou qu'il suit.
+    """
+    calendar = evenement_service.profil_calendar(token)
+    return _ical_response(request, calendar, "Mes événements ENSPM Hub")
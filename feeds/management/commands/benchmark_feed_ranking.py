@@ -0,0 +1,83 @@
+# feeds/management/commands/benchmark_feed_ranking.py
+import random
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.models import Profil, User
+from feeds.models import Post
+from feeds.services.ranking_service import RankingService
+from organizations.models import AbonnementOrganisation, MembreOrganisation, Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le classement complet du fil (RankingService.rank : requêtes d'affinité, posts vus, "
+        "signaux et score) pour un lot de candidats. Les données de test sont créées dans une "
+        "transaction annulée à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=RankingService.CANDIDATES)
+        parser.add_argument('--authors', type=int, default=50, help="Profils auteurs des candidats")
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            viewer, posts = self.create_data(options)
+            self.run(viewer, posts, options)
+            transaction.set_rollback(True)
+
+    def create_data(self, options):
+        tag = uuid.uuid4().hex[:8]
+        rng = random.Random(0)
+        users = User.objects.bulk_create([
+            User(email=f'bench-{tag}-{index}@example.invalid', est_actif=True) for index in range(options['authors'] + 1)
+        ])
+        domaines = ['Informatique', 'Génie civil', 'Chimie', None]
+        profils = Profil.objects.bulk_create([
+            Profil(user=user, nom_complet=f'Auteur {index}', domaine=domaines[index % len(domaines)])
+            for index, user in enumerate(users)
+        ])
+        viewer, auteurs = profils[0], profils[1:]
+        organisations = [
+            Organisation.objects.create(nom_organisation=f'Bench {tag} {index}', type_organisation='entreprise', statut='active')
+            for index in range(4)
+        ]
+        MembreOrganisation.objects.bulk_create(
+            [MembreOrganisation(profil=viewer, organisation=organisations[0])]
+            + [MembreOrganisation(profil=profil, organisation=organisations[0]) for profil in auteurs[::3]]
+        )
+        AbonnementOrganisation.objects.create(profil=viewer, organisation=organisations[1])
+
+        created = Post.objects.bulk_create([
+            Post(
+                contenu=f'Post {index}',
+                auteur_organisation=organisations[index % len(organisations)] if index % 2 else None,
+                auteur_profil=None if index % 2 else auteurs[index % len(auteurs)],
+                nombre_likes=rng.randint(0, 200),
+                nombre_commentaires=rng.randint(0, 40),
+            )
+            for index in range(options['candidates'])
+        ])
+        posts = list(Post.objects.filter(id__in=[post.id for post in created]).select_related('auteur_profil'))
+        return viewer.user, posts
+
+    def run(self, viewer, posts, options):
+        iterations = options['iterations']
+        # rank mesure le chemin complet de la requête ; build_features isole la construction des signaux
+        timings = {'rank': 0.0, 'build_features': 0.0}
+        for _ in range(iterations):
+            start = time.perf_counter()
+            RankingService.rank(viewer, posts)
+            timings['rank'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            RankingService.build_features(viewer, posts)
+            timings['build_features'] += time.perf_counter() - start
+
+        for label, elapsed in timings.items():
+            self.stdout.write(
+                f"{label:>14} : {elapsed / iterations * 1000:.3f} ms par requête, "
+                f"{len(posts) * iterations / elapsed:,.0f} candidats/s"
+            )
@@ -0,0 +1,90 @@
+# feeds/management/commands/benchmark_timeline.py
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from core.models import Profil, User
+from core.services.cache_service import cache_service
+from feeds.models import Post, TimelineEntry
+from feeds.services.timeline_service import TimelineService
+from organizations.models import AbonnementOrganisation, Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le fil en push pur et en push/pull hybride : écritures de fan-out et temps de lecture "
+        "d'une page. Les données de test sont créées dans une transaction annulée à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--followers', type=int, default=300, help="Abonnés de l'organisation très suivie")
+        parser.add_argument('--small-followers', type=int, default=10, help="Abonnés de la petite organisation (qui suivent aussi la grande)")
+        parser.add_argument('--posts', type=int, default=40, help="Posts publiés par chaque organisation")
+        parser.add_argument('--page-size', type=int, default=15)
+        parser.add_argument('--reads', type=int, default=50, help="Pages lues par mode")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            grande, petite, posts, lecteurs = self.create_data(options)
+            results = {}
+            for label, threshold in (('push pur', options['followers'] + 1), ('hybride', options['followers'])):
+                with override_settings(FEED_CELEBRITY_THRESHOLD=threshold):
+                    results[label] = self.run(grande, petite, posts, lecteurs, options)
+            transaction.set_rollback(True)
+
+        for label, (writes, per_page, post_ids) in results.items():
+            self.stdout.write(
+                f"{label:>9} : {writes:,} entrées de fil écrites, {per_page * 1000:.2f} ms par page de {options['page_size']}, "
+                f"{len(post_ids)} posts parcourus"
+            )
+        identical = len({tuple(post_ids) for _writes, _per_page, post_ids in results.values()}) == 1
+        self.stdout.write(f"Même fil dans les deux modes : {'oui' if identical else 'NON'}")
+
+    def create_data(self, options):
+        tag = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create([
+            User(email=f'bench-{tag}-{index}@example.invalid', est_actif=True) for index in range(options['followers'])
+        ])
+        profils = Profil.objects.bulk_create([
+            Profil(user=user, nom_complet=f'Lecteur {index}', statut_global='etudiant') for index, user in enumerate(users)
+        ])
+        grande = Organisation.objects.create(nom_organisation=f'Bench grande {tag}', type_organisation='entreprise', statut='active')
+        petite = Organisation.objects.create(nom_organisation=f'Bench petite {tag}', type_organisation='entreprise', statut='active')
+        AbonnementOrganisation.objects.bulk_create(
+            [AbonnementOrganisation(profil=profil, organisation=grande) for profil in profils]
+            + [AbonnementOrganisation(profil=profil, organisation=petite) for profil in profils[:options['small_followers']]]
+        )
+        posts = []
+        for index in range(options['posts']):
+            for organisation in (grande, petite):
+                posts.append(Post.objects.create(contenu=f'Post {index}', auteur_organisation=organisation))
+        return grande, petite, posts, [profil.user for profil in profils[:options['small_followers']]]
+
+    def run(self, grande, petite, posts, lecteurs, options):
+        # Point de départ commun : fils vides, organisations en push, caches de lecture invalidés
+        TimelineEntry.all_objects.filter(post__in=posts).delete()
+        Organisation.all_objects.filter(id__in=[grande.id, petite.id]).update(diffusion_fil='push')
+        cache_service.invalidate_tags([TimelineService.DIFFUSION_TAG, TimelineService.posts_tag(grande.id), TimelineService.posts_tag(petite.id)])
+        TimelineService.update_diffusion_modes()
+
+        before = TimelineEntry.all_objects.count()
+        for post in posts:
+            after_profil_id = TimelineService.fan_out_batch(post.id)
+            while after_profil_id is not None:
+                after_profil_id = TimelineService.fan_out_batch(post.id, after_profil_id)
+        writes = TimelineEntry.all_objects.count() - before
+
+        start = time.perf_counter()
+        for index in range(options['reads']):
+            TimelineService.get_timeline_page(lecteurs[index % len(lecteurs)], None, options['page_size'])
+        per_page = (time.perf_counter() - start) / options['reads']
+
+        post_ids, cursor = [], None
+        while True:
+            page = TimelineService.get_timeline_page(lecteurs[0], cursor, options['page_size'])
+            post_ids.extend(post.id for post in page['items'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        return writes, per_page, post_ids
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:12
+
+import core.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0002_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('id', models.UUIDField(default=core.models.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('date_post', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='feeds.post')),
+                ('profil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='core.profil')),
+            ],
+            options={
+                'verbose_name': "Entrée du fil d'actualité",
+                'db_table': 'timeline_entry',
+                'indexes': [models.Index(fields=['profil', '-date_post', '-id'], name='timeline_profil_date_idx')],
+                'unique_together': {('profil', 'post')},
+            },
+        ),
+    ]
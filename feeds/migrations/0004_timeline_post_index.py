@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0003_timeline_entry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timelineentry',
+            name='timeline_profil_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['profil', '-date_post', '-post'], name='timeline_profil_post_idx'),
+        ),
+    ]
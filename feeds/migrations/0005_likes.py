@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0004_timeline_post_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompteurLikes',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('delta', models.IntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compteurs_likes', to='feeds.post')),
+            ],
+            options={
+                'verbose_name': 'Compteur de likes',
+                'db_table': 'post_like_compteur',
+                'unique_together': {('post', 'shard')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Like',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='feeds.post')),
+                ('profil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='core.profil')),
+            ],
+            options={
+                'verbose_name': 'Like',
+                'db_table': 'post_like',
+                'unique_together': {('post', 'profil')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_nombre_commentaires(apps, schema_editor):
+    Post = apps.get_model('feeds', 'Post')
+    Commentaire = apps.get_model('feeds', 'Commentaire')
+    totals = Commentaire.objects.filter(post=OuterRef('pk'), deleted=False).order_by().values('post').annotate(
+        total=Count('id')
+    ).values('total')
+    Post.objects.update(nombre_commentaires=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0005_likes'),
+        ('organizations', '0004_soft_delete_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='nombre_commentaires',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_nombre_commentaires, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='commentaire',
+            index=models.Index(fields=['post', '-created_at', '-id'], name='commentaire_post_date_idx'),
+        ),
+    ]
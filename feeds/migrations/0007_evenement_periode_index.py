@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0006_nombre_commentaires'),
+        ('organizations', '0004_soft_delete_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evenement',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['date_debut', 'date_fin'], name='evenement_periode_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:21
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0007_evenement_periode_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evenement',
+            name='capacite',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='evenement',
+            name='places_reservees',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='InscriptionEvenement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('statut', models.CharField(choices=[('confirmee', 'Confirmée'), ('liste_attente', "Liste d'attente")], max_length=20)),
+                ('evenement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscriptions', to='feeds.evenement')),
+                ('profil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscriptions_evenements', to='core.profil')),
+            ],
+            options={
+                'verbose_name': 'Inscription à un événement',
+                'db_table': 'inscription_evenement',
+                'indexes': [models.Index(fields=['evenement', 'statut', 'created_at'], name='inscription_evt_statut_idx')],
+                'unique_together': {('evenement', 'profil')},
+            },
+        ),
+    ]
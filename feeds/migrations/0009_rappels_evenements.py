@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:22
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_time_ordered_ids'),
+        ('feeds', '0008_inscriptions_evenements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evenement',
+            name='dernier_rappel',
+            field=models.CharField(blank=True, max_length=5, null=True),
+        ),
+        migrations.CreateModel(
+            name='RappelEvenement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('echeance', models.CharField(max_length=5)),
+                ('evenement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rappels', to='feeds.evenement')),
+                ('profil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rappels_evenements', to='core.profil')),
+            ],
+            options={
+                'verbose_name': "Rappel d'événement",
+                'db_table': 'rappel_evenement',
+                'unique_together': {('evenement', 'echeance', 'profil')},
+            },
+        ),
+    ]
@@ -1,7 +1,7 @@
 # feeds/models.py
 
 from django.db import models
-from core.models import ENSPMHubBaseModel
+from core.models import ENSPMHubBaseModel, uuid7
 from django.utils.translation import gettext_lazy as _
 
 
@@ -9,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 # 6. FLUX D'ACTUALITÉ
 # ==========================================
 class Post(ENSPMHubBaseModel):
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)  # Table à forte croissance : UUID ordonné
     contenu = models.TextField()
     image = models.ImageField(upload_to='posts_images/', null=True, blank=True)
     auteur_profil = models.ForeignKey('core.Profil', null=True, blank=True, on_delete=models.SET_NULL,
@@ -16,6 +17,12 @@ class Post(ENSPMHubBaseModel):
     auteur_organisation = models.ForeignKey('organizations.Organisation', null=True, blank=True, on_delete=models.SET_NULL,
                                             related_name='posts')
     nombre_likes = models.PositiveIntegerField(default=0)
+    nombre_commentaires = models.PositiveIntegerField(default=0)  # Tenu à jour par CommentaireService
+
+    SOFT_DELETE_CASCADE = (
+        ('feeds.Commentaire', 'post'),
+        ('feeds.TimelineEntry', 'post'),
+    )
 
     class Meta:
         verbose_name = _("Post")
@@ -34,6 +41,61 @@ class Commentaire(ENSPMHubBaseModel):
     class Meta:
         verbose_name = _("Commentaire")
         db_table = 'commentaire'
+        indexes = [
+            # Pagination par curseur des commentaires d'un post, du plus récent au plus ancien
+            models.Index(fields=['post', '-created_at', '-id'], name='commentaire_post_date_idx'),
+        ]
+
+
+class Like(ENSPMHubBaseModel):
+    """Mention « J'aime » d'un profil sur un post (une seule par couple post/profil)."""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
+    profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE, related_name='likes')
+
+    class Meta:
+        verbose_name = _("Like")
+        db_table = 'post_like'
+        unique_together = ('post', 'profil')
+
+    def __str__(self):
+        return f"{self.profil} aime {self.post_id}"
+
+
+class CompteurLikes(ENSPMHubBaseModel):
+    """
+    Compteur de likes réparti en plusieurs lignes (shards) par post.
+    Les likes incrémentent un shard tiré au hasard plutôt que la ligne du post ;
+    les deltas sont reportés périodiquement dans Post.nombre_likes (voir feeds.tasks).
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='compteurs_likes')
+    shard = models.PositiveSmallIntegerField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Compteur de likes")
+        db_table = 'post_like_compteur'
+        unique_together = ('post', 'shard')
+
+
+class TimelineEntry(ENSPMHubBaseModel):
+    """
+    Fil d'actualité matérialisé : une ligne par (profil, post) à afficher.
+    Alimenté à la publication par feeds.tasks.fan_out_post_task et borné en longueur
+    (voir feeds.services.timeline_service).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)  # Table à forte croissance : UUID ordonné
+    profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE, related_name='timeline')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    date_post = models.DateTimeField()  # Copie de post.created_at : clé de tri du fil
+
+    class Meta:
+        verbose_name = _("Entrée du fil d'actualité")
+        db_table = 'timeline_entry'
+        unique_together = ('profil', 'post')
+        indexes = [
+            # Lecture du fil : un parcours d'index par profil, du plus récent au plus ancien
+            models.Index(fields=['profil', '-date_post', '-post'], name='timeline_profil_post_idx'),
+        ]
 
 
 class Evenement(ENSPMHubBaseModel):
@@ -43,6 +105,9 @@ class Evenement(ENSPMHubBaseModel):
     date_debut = models.DateTimeField()
     date_fin = models.DateTimeField(null=True, blank=True)
     lien_inscription = models.URLField(null=True, blank=True)
+    capacite = models.PositiveIntegerField(null=True, blank=True)  # Nombre de places ; vide = illimité
+    places_reservees = models.PositiveIntegerField(default=0)  # Tenu à jour par InscriptionService
+    dernier_rappel = models.CharField(max_length=5, null=True, blank=True)  # Dernière échéance de rappel planifiée (RappelService)
     organisateur_profil = models.ForeignKey('core.Profil', null=True, blank=True, on_delete=models.SET_NULL,
                                             related_name='evenements_organises')
     organisateur_organisation = models.ForeignKey('organizations.Organisation', null=True, blank=True, on_delete=models.SET_NULL,
@@ -50,4 +115,53 @@ class Evenement(ENSPMHubBaseModel):
 
     class Meta:
         verbose_name = _("Événement")
-        db_table = 'evenement'
\ No newline at end of file
+        db_table = 'evenement'
+        indexes = [
+            # Requêtes de chevauchement du calendrier : date_debut <= fin AND date_fin >= début (index partiel)
+            models.Index(
+                fields=['date_debut', 'date_fin'], name='evenement_periode_idx',
+                condition=models.Q(deleted=False)
+            ),
+        ]
+
+
+class InscriptionEvenement(ENSPMHubBaseModel):
+    """Inscription d'un profil à un événement : place confirmée ou en liste d'attente."""
+    STATUT_CHOICES = [
+        ('confirmee', _('Confirmée')),
+        ('liste_attente', _("Liste d'attente")),
+    ]
+
+    evenement = models.ForeignKey(Evenement, on_delete=models.CASCADE, related_name='inscriptions')
+    profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE, related_name='inscriptions_evenements')
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES)
+
+    class Meta:
+        verbose_name = _("Inscription à un événement")
+        db_table = 'inscription_evenement'
+        unique_together = ('evenement', 'profil')
+        indexes = [
+            # Liste des inscrits et file d'attente d'un événement, par ordre d'arrivée
+            models.Index(fields=['evenement', 'statut', 'created_at'], name='inscription_evt_statut_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profil} - {self.evenement} ({self.statut})"
+
+
+class RappelEvenement(ENSPMHubBaseModel):
+    """
+    Marqueur d'envoi d'un rappel d'événement à un profil, pour une échéance donnée.
+    Posé avant l'envoi : une reprise après redémarrage n'envoie jamais deux fois le même rappel.
+    """
+    evenement = models.ForeignKey(Evenement, on_delete=models.CASCADE, related_name='rappels')
+    profil = models.ForeignKey('core.Profil', on_delete=models.CASCADE, related_name='rappels_evenements')
+    echeance = models.CharField(max_length=5)
+
+    class Meta:
+        verbose_name = _("Rappel d'événement")
+        db_table = 'rappel_evenement'
+        unique_together = ('evenement', 'echeance', 'profil')
+
+    def __str__(self):
+        return f"Rappel {self.echeance} de {self.evenement_id} à {self.profil_id}"
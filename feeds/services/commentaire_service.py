@@ -0,0 +1,98 @@
+# feeds/services/commentaire_service.py
+import logging
+from typing import Dict, List
+from uuid import UUID
+from django.db import transaction
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import RowNumber
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from core.models import User
+from core.api.exceptions import BadRequestAPIException, PermissionDeniedAPIException
+from feeds.models import Post, Commentaire
+from organizations.models import Organisation
+from organizations.services.organisation_service import OrganisationService
+
+logger = logging.getLogger('app')
+
+
+class CommentaireService:
+    """
+    Service containing the business logic for post comments.
+    Post.nombre_commentaires is updated in the same transaction as each comment write,
+    so feed cards read the count from the post row instead of counting.
+    """
+    LATEST_PER_POST = 2
+    MAX_BATCH_POSTS = 50
+
+    @staticmethod
+    def list_commentaires(post_id: UUID) -> QuerySet:
+        """
+        Returns the comments of a post. Ordering is left to the keyset paginator.
+        """
+        post = get_object_or_404(Post, id=post_id)
+        return Commentaire.objects.filter(post=post)
+
+    @staticmethod
+    @transaction.atomic
+    def add_commentaire(acting_user: User, post_id: UUID, data: Dict) -> Commentaire:
+        """
+        Comments a post as the user's profile, or as an organisation the user administers.
+        """
+        post = get_object_or_404(Post, id=post_id)
+        org_id = data.pop('organisation_id', None)
+        if org_id is None:
+            commentaire = Commentaire.objects.create(post=post, auteur_profil=acting_user.profil, **data)
+        else:
+            organisation = get_object_or_404(Organisation, id=org_id, statut='active', deleted=False)
+            if not OrganisationService._is_organisation_admin(acting_user, organisation):
+                raise PermissionDeniedAPIException("Seuls les administrateurs de la page peuvent commenter au nom de l'organisation.")
+            commentaire = Commentaire.objects.create(post=post, auteur_organisation=organisation, **data)
+
+        Post.objects.filter(id=post.id).update(nombre_commentaires=F('nombre_commentaires') + 1)
+        return commentaire
+
+    @staticmethod
+    @transaction.atomic
+    def delete_commentaire(acting_user: User, commentaire_id: UUID):
+        """
+        Soft deletes a comment. Allowed for its author, the post's author and site admins.
+        """
+        commentaire = get_object_or_404(Commentaire.objects.select_related('post'), id=commentaire_id)
+        profil_id = acting_user.profil.id
+        allowed = (
+            OrganisationService._is_site_admin(acting_user)
+            or commentaire.auteur_profil_id == profil_id
+            or commentaire.post.auteur_profil_id == profil_id
+            or (commentaire.auteur_organisation and OrganisationService._is_organisation_admin(acting_user, commentaire.auteur_organisation))
+        )
+        if not allowed:
+            raise PermissionDeniedAPIException("Vous ne pouvez pas supprimer ce commentaire.")
+
+        # Suppression conditionnelle : deux requêtes concurrentes ne décrémentent le compteur qu'une fois
+        deleted = Commentaire.objects.filter(id=commentaire.id, deleted=False).update(deleted=True, deleted_at=timezone.now())
+        if deleted:
+            Post.objects.filter(id=commentaire.post_id).update(nombre_commentaires=F('nombre_commentaires') - 1)
+
+    @staticmethod
+    def latest_commentaires(post_ids: List[UUID]) -> Dict[str, List[Commentaire]]:
+        """
+        Returns the LATEST_PER_POST most recent comments of each post, in a single window-function query.
+        """
+        if len(post_ids) > CommentaireService.MAX_BATCH_POSTS:
+            raise BadRequestAPIException(f"Vous ne pouvez demander que {CommentaireService.MAX_BATCH_POSTS} posts à la fois.")
+
+        latest = {str(post_id): [] for post_id in post_ids}
+        rows = Commentaire.objects.filter(post_id__in=post_ids).annotate(
+            rang=Window(
+                RowNumber(),
+                partition_by=[F('post_id')],
+                order_by=[F('created_at').desc(), F('id').desc()]
+            )
+        ).filter(rang__lte=CommentaireService.LATEST_PER_POST).order_by('post_id', 'rang')
+        for commentaire in rows:
+            latest[str(commentaire.post_id)].append(commentaire)
+        return latest
+
+# Instantiate the service
+commentaire_service = CommentaireService()
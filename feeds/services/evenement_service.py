@@ -0,0 +1,147 @@
+# feeds/services/evenement_service.py
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterator, Optional
+from uuid import UUID
+from django.core import signing
+from django.db.models import Count, Max, Q, QuerySet
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from core.models import User, Profil
+from core.api.exceptions import BadRequestAPIException, NotFoundAPIException
+from feeds.models import Evenement
+from organizations.models import Organisation, MembreOrganisation, AbonnementOrganisation
+
+
+class EvenementService:
+    """
+    Service for the event calendar and its iCalendar feeds.
+    Overlap queries use the partial index on (date_debut, date_fin); the .ics feeds are
+    streamed row by row and carry an ETag so polling clients mostly get 304 responses.
+    """
+    MAX_RANGE = timedelta(days=366)
+    ICAL_PAST = timedelta(days=180)  # Les flux .ics ne remontent pas plus loin
+    ICAL_CHUNK_SIZE = 500
+    ICAL_TOKEN_SALT = 'feeds.calendrier'
+
+    @staticmethod
+    def list_in_range(debut: datetime, fin: datetime, organisation_id: Optional[UUID] = None) -> QuerySet:
+        """
+        Returns the events overlapping [debut, fin], by start date.
+        An event without date_fin is treated as instantaneous.
+        """
+        if fin <= debut:
+            raise BadRequestAPIException("La date de fin doit être postérieure à la date de début.")
+        if fin - debut > EvenementService.MAX_RANGE:
+            raise BadRequestAPIException(f"La période demandée ne peut dépasser {EvenementService.MAX_RANGE.days} jours.")
+
+        queryset = Evenement.objects.filter(
+            Q(date_fin__gte=debut) | Q(date_fin__isnull=True, date_debut__gte=debut),
+            date_debut__lte=fin
+        )
+        if organisation_id:
+            queryset = queryset.filter(organisateur_organisation_id=organisation_id)
+        return queryset.order_by('date_debut', 'id')
+
+    @staticmethod
+    def organisation_calendar(org_id: UUID) -> QuerySet:
+        """Returns the events of an active organisation, as published in its .ics feed."""
+        organisation = get_object_or_404(Organisation, id=org_id, statut='active', deleted=False)
+        return Evenement.all_objects.filter(organisateur_organisation=organisation)
+
+    @staticmethod
+    def calendar_token(acting_user: User) -> str:
+        """Returns the signed token identifying the user's personal .ics feed."""
+        return signing.dumps(str(acting_user.profil.id), salt=EvenementService.ICAL_TOKEN_SALT)  # type: ignore
+
+    @staticmethod
+    def profil_calendar(token: str) -> QuerySet:
+        """
+        Returns the events of a profile's personal feed: the ones it organises, and the ones of
+        organisations it belongs to or follows. The profile is identified by its signed token,
+        since calendar clients cannot send the JWT.
+        """
+        try:
+            profil_id = signing.loads(token, salt=EvenementService.ICAL_TOKEN_SALT)
+        except signing.BadSignature:
+            raise NotFoundAPIException("Calendrier introuvable.")
+        profil = get_object_or_404(Profil, id=profil_id, deleted=False)
+        return Evenement.all_objects.filter(
+            Q(organisateur_profil=profil)
+            | Q(organisateur_organisation_id__in=MembreOrganisation.objects.filter(
+                profil=profil, est_actif=True).values('organisation_id'))
+            | Q(organisateur_organisation_id__in=AbonnementOrganisation.objects.filter(
+                profil=profil).values('organisation_id'))
+        )
+
+    @staticmethod
+    def calendar_etag(calendar: QuerySet) -> str:
+        """
+        Returns the ETag of a calendar feed, from one aggregate over its rows.
+        Deleted rows are kept in `calendar` so that a deletion also changes the tag.
+        """
+        state = calendar.filter(date_debut__gte=timezone.now() - EvenementService.ICAL_PAST).aggregate(
+            total=Count('id', filter=Q(deleted=False)), modifie=Max('updated_at'), supprime=Max('deleted_at')
+        )
+        return hashlib.md5(repr(sorted(state.items())).encode()).hexdigest()
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        """Escapes a TEXT value (RFC 5545, 3.3.11)."""
+        return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+    @staticmethod
+    def _line(name: str, value: str) -> str:
+        """Returns a content line, folded at 75 octets (RFC 5545, 3.1)."""
+        line = f"{name}:{value}".encode()
+        chunks = []
+        while len(line) > 75:
+            cut = 75 if not chunks else 74
+            # Ne pas couper au milieu d'un caractère UTF-8
+            while cut and (line[cut] & 0xC0) == 0x80:
+                cut -= 1
+            chunks.append(line[:cut])
+            line = line[cut:]
+        chunks.append(line)
+        return '\r\n '.join(chunk.decode() for chunk in chunks) + '\r\n'
+
+    @staticmethod
+    def _timestamp(value: datetime) -> str:
+        return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    @staticmethod
+    def ical_stream(calendar: QuerySet, nom: str) -> Iterator[str]:
+        """
+        Yields the .ics document of a calendar feed, one event at a time.
+        Rows are read with a server-side iterator, so memory does not grow with the feed.
+        """
+        line = EvenementService._line
+        stamp = EvenementService._timestamp
+        yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//ENSPM Hub//Calendrier//FR\r\nCALSCALE:GREGORIAN\r\n'
+        yield line('X-WR-CALNAME', EvenementService._escape(nom))
+
+        events = calendar.filter(
+            deleted=False, date_debut__gte=timezone.now() - EvenementService.ICAL_PAST
+        ).order_by('date_debut', 'id')
+        for evenement in events.iterator(chunk_size=EvenementService.ICAL_CHUNK_SIZE):
+            parts = [
+                'BEGIN:VEVENT\r\n',
+                line('UID', f"{evenement.id}@enspm-hub"),
+                line('DTSTAMP', stamp(evenement.updated_at)),
+                line('DTSTART', stamp(evenement.date_debut)),
+            ]
+            if evenement.date_fin:
+                parts.append(line('DTEND', stamp(evenement.date_fin)))
+            parts.append(line('SUMMARY', EvenementService._escape(evenement.titre)))
+            parts.append(line('DESCRIPTION', EvenementService._escape(evenement.description)))
+            if evenement.lieu:
+                parts.append(line('LOCATION', EvenementService._escape(evenement.lieu)))
+            if evenement.lien_inscription:
+                parts.append(line('URL', evenement.lien_inscription))
+            parts.append('END:VEVENT\r\n')
+            yield ''.join(parts)
+        yield 'END:VCALENDAR\r\n'
+
+# Instantiate the service
+evenement_service = EvenementService()
@@ -0,0 +1,106 @@
+# feeds/services/inscription_service.py
+import csv
+import logging
+from typing import Iterator
+from uuid import UUID
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.shortcuts import get_object_or_404
+from core.models import User
+from core.api.exceptions import BadRequestAPIException, PermissionDeniedAPIException
+from feeds.models import Evenement, InscriptionEvenement
+from organizations.services.organisation_service import OrganisationService
+
+logger = logging.getLogger('app')
+
+
+class _Echo:
+    """Pseudo-fichier pour csv.writer : renvoie la ligne au lieu de l'écrire."""
+    def write(self, value):
+        return value
+
+
+class InscriptionService:
+    """
+    Service managing event registrations with a capacity limit.
+
+    Evenement.places_reservees counts the confirmed seats. A seat is taken with one
+    conditional UPDATE (places_reservees < capacite), so concurrent registrations can never
+    overbook: the database serialises the updates on the event row and each one re-checks
+    the condition. A registration that does not get a seat joins the waitlist; when a
+    confirmed registrant cancels, the seat goes to the oldest waitlisted registration.
+    """
+    EXPORT_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def _take_seat(evenement_id: UUID) -> bool:
+        return bool(Evenement.objects.filter(
+            Q(capacite__isnull=True) | Q(places_reservees__lt=F('capacite')), id=evenement_id
+        ).update(places_reservees=F('places_reservees') + 1))
+
+    @staticmethod
+    def register(acting_user: User, evenement_id: UUID) -> InscriptionEvenement:
+        """
+        Registers the user to an event: a confirmed seat if one is left, the waitlist otherwise.
+        """
+        evenement = get_object_or_404(Evenement, id=evenement_id)
+        try:
+            with transaction.atomic():
+                statut = 'confirmee' if InscriptionService._take_seat(evenement.id) else 'liste_attente'
+                inscription = InscriptionEvenement.objects.create(
+                    evenement=evenement, profil=acting_user.profil, statut=statut  # type: ignore
+                )
+        except IntegrityError:
+            raise BadRequestAPIException("Vous êtes déjà inscrit à cet événement.")
+
+        logger.info(f"Inscription de {acting_user.email} à l'événement {evenement.id} : {statut}.")
+        return inscription
+
+    @staticmethod
+    @transaction.atomic
+    def cancel(acting_user: User, evenement_id: UUID):
+        """
+        Cancels the user's registration. A freed seat is handed to the oldest waitlisted
+        registration, or given back to the counter if nobody is waiting.
+        """
+        inscription = get_object_or_404(InscriptionEvenement, evenement_id=evenement_id, profil=acting_user.profil)
+        # Suppression conditionnelle : deux annulations simultanées ne libèrent qu'une place
+        if not InscriptionEvenement.objects.filter(id=inscription.id).delete()[0] or inscription.statut != 'confirmee':
+            return
+
+        waitlist = InscriptionEvenement.objects.filter(evenement_id=evenement_id, statut='liste_attente').order_by('created_at', 'id')
+        for candidate_id in waitlist.values_list('id', flat=True)[:10]:
+            # Promotion conditionnelle : une autre annulation a pu promouvoir ce candidat entre-temps
+            if InscriptionEvenement.objects.filter(id=candidate_id, statut='liste_attente').update(statut='confirmee'):
+                logger.info(f"Inscription {candidate_id} promue depuis la liste d'attente.")
+                return
+        Evenement.all_objects.filter(id=evenement_id, places_reservees__gt=0).update(places_reservees=F('places_reservees') - 1)
+
+    @staticmethod
+    def export_rows(acting_user: User, evenement_id: UUID) -> Iterator[str]:
+        """
+        Yields the event's registrations as CSV lines, confirmed first then the waitlist, by arrival.
+        Reserved to the organiser: its profile, or an administrator of its organisation.
+        """
+        evenement = get_object_or_404(Evenement.objects.select_related('organisateur_organisation'), id=evenement_id)
+        is_organiser = evenement.organisateur_profil_id == acting_user.profil.id or (  # type: ignore
+            evenement.organisateur_organisation is not None
+            and OrganisationService._is_organisation_admin(acting_user, evenement.organisateur_organisation)
+        )
+        if not (is_organiser or OrganisationService._is_site_admin(acting_user)):
+            raise PermissionDeniedAPIException("Seul l'organisateur peut exporter la liste des inscrits.")
+
+        rows = InscriptionEvenement.objects.filter(evenement=evenement).order_by('statut', 'created_at', 'id').values_list(
+            'profil__nom_complet', 'profil__user__email', 'statut', 'created_at'
+        )
+        return InscriptionService._stream_csv(rows)
+
+    @staticmethod
+    def _stream_csv(rows) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(['nom_complet', 'email', 'statut', 'date_inscription'])
+        for nom_complet, email, statut, created_at in rows.iterator(chunk_size=InscriptionService.EXPORT_CHUNK_SIZE):
+            yield writer.writerow([nom_complet, email, statut, created_at.isoformat()])
+
+# Instantiate the service
+inscription_service = InscriptionService()
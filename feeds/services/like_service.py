@@ -0,0 +1,108 @@
+# feeds/services/like_service.py
+import logging
+import random
+from typing import Dict
+from uuid import UUID
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.shortcuts import get_object_or_404
+from core.models import User
+from core.api.exceptions import BadRequestAPIException
+from feeds.models import Post, Like, CompteurLikes
+
+logger = logging.getLogger('app')
+
+
+class LikeService:
+    """
+    Service managing post likes with a write-behind counter.
+    A like writes its (post, profil) row and increments one of COUNTER_SHARDS counter rows;
+    Post.nombre_likes is only updated when the shards are folded, so concurrent likes on
+    the same post never wait on the post row.
+    """
+    COUNTER_SHARDS = 16
+    FOLD_BATCH_SIZE = 500
+
+    @staticmethod
+    def _add_to_counter(post_id: UUID, delta: int):
+        """Adds `delta` to a random shard of the post's counter, creating the shard on first use."""
+        shard = random.randrange(LikeService.COUNTER_SHARDS)
+        shard_rows = CompteurLikes.objects.filter(post_id=post_id, shard=shard)
+        if not shard_rows.update(delta=F('delta') + delta):
+            CompteurLikes.objects.get_or_create(post_id=post_id, shard=shard)
+            shard_rows.update(delta=F('delta') + delta)
+
+    @staticmethod
+    @transaction.atomic
+    def like_post(acting_user: User, post_id: UUID) -> Like:
+        """
+        Adds the user's like to a post.
+        """
+        post = get_object_or_404(Post, id=post_id)
+        like, created = Like.objects.get_or_create(post=post, profil=acting_user.profil)
+        if not created:
+            raise BadRequestAPIException("Vous aimez déjà ce post.")
+        LikeService._add_to_counter(post.id, 1)
+        return like
+
+    @staticmethod
+    @transaction.atomic
+    def unlike_post(acting_user: User, post_id: UUID):
+        """
+        Removes the user's like from a post.
+        """
+        like = get_object_or_404(Like, post_id=post_id, profil=acting_user.profil)
+        # Suppression conditionnelle : deux retraits concurrents ne décrémentent le compteur qu'une fois
+        deleted, _ = Like.objects.filter(id=like.id).delete()
+        if deleted:
+            LikeService._add_to_counter(post_id, -1)
+
+    @staticmethod
+    def get_like_count(post_id: UUID, exact: bool = False) -> Dict:
+        """
+        Returns the post's like count. By default this is the stored, eventually consistent
+        Post.nombre_likes; with `exact`, the likes are counted from the like relation.
+        """
+        post = get_object_or_404(Post, id=post_id)
+        if exact:
+            return {'nombre_likes': Like.objects.filter(post=post).count(), 'exact': True}
+        return {'nombre_likes': post.nombre_likes, 'exact': False}
+
+    @staticmethod
+    @transaction.atomic
+    def fold_counters() -> int:
+        """
+        Folds the pending shard deltas of up to FOLD_BATCH_SIZE posts into Post.nombre_likes.
+        All the shards of a post are folded together, in one UPDATE for the posts and one for the shards.
+        Returns the number of posts updated.
+        """
+        post_ids = list(
+            CompteurLikes.objects.exclude(delta=0).order_by('post_id')
+            .values_list('post_id', flat=True).distinct()[:LikeService.FOLD_BATCH_SIZE]
+        )
+        if not post_ids:
+            return 0
+
+        shards = list(
+            CompteurLikes.objects.select_for_update().filter(post_id__in=post_ids).exclude(delta=0)
+            .values('id', 'post_id', 'delta')
+        )
+        totals: Dict[UUID, int] = {}
+        for shard in shards:
+            totals[shard['post_id']] = totals.get(shard['post_id'], 0) + shard['delta']
+
+        # Borné à 0 : un compteur négatif violerait la contrainte et annulerait tout le lot
+        Post.all_objects.filter(id__in=totals).update(nombre_likes=Greatest(F('nombre_likes') + Case(
+            *[When(id=post_id, then=Value(total)) for post_id, total in totals.items()],
+            default=Value(0), output_field=IntegerField()
+        ), Value(0)))
+        # On retranche ce qui a été reporté plutôt que de remettre à zéro : un like arrivé entre-temps est conservé
+        CompteurLikes.objects.filter(id__in=[shard['id'] for shard in shards]).update(delta=F('delta') - Case(
+            *[When(id=shard['id'], then=Value(shard['delta'])) for shard in shards],
+            default=Value(0), output_field=IntegerField()
+        ))
+        return len(totals)
+
+# Instantiate the service
+like_service = LikeService()
@@ -0,0 +1,40 @@
+# feeds/services/post_service.py
+import logging
+from typing import Dict
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from core.models import User
+from core.api.exceptions import PermissionDeniedAPIException
+from feeds.models import Post
+from organizations.models import Organisation
+from organizations.services.organisation_service import OrganisationService
+
+logger = logging.getLogger('app')
+
+
+class PostService:
+    """
+    Service containing the business logic for publishing posts.
+    """
+
+    @staticmethod
+    @transaction.atomic
+    def create_post(acting_user: User, data: Dict) -> Post:
+        """
+        Publishes a post as the user's profile, or as an organisation the user administers.
+        Distribution to the timelines is done by the post_save signal (see feeds/signals.py).
+        """
+        org_id = data.pop('organisation_id', None)
+        if org_id is None:
+            post = Post.objects.create(auteur_profil=acting_user.profil, **data)
+        else:
+            organisation = get_object_or_404(Organisation, id=org_id, statut='active', deleted=False)
+            if not OrganisationService._is_organisation_admin(acting_user, organisation):
+                raise PermissionDeniedAPIException("Seuls les administrateurs de la page peuvent publier au nom de l'organisation.")
+            post = Post.objects.create(auteur_organisation=organisation, **data)
+
+        logger.info(f"Post {post.id} publié par {acting_user.email}.")
+        return post
+
+# Instantiate the service
+post_service = PostService()
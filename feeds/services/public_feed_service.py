@@ -0,0 +1,62 @@
+# feeds/services/public_feed_service.py
+import hashlib
+import json
+import logging
+from typing import Dict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from ninja.responses import NinjaJSONEncoder
+from core.services.cache_service import cache_service
+from feeds.models import Post, Evenement
+from feeds.api.schemas import PostOutSchema, EvenementOutSchema
+
+logger = logging.getLogger('app')
+
+
+class PublicFeedService:
+    """
+    Service maintaining the public feed shown to anonymous visitors.
+
+    The feed is a snapshot (props, serialised JSON body and its ETag) kept in the cache.
+    It is rebuilt when an organisation publishes or deletes a post, when an event changes,
+    and at the latest every PUBLIC_FEED_REFRESH seconds; readers never query the posts
+    themselves. Only posts of active organisations are public.
+    """
+    CACHE_KEY = 'feed:public:snapshot'
+    POSTS = 20
+    EVENEMENTS = 10
+
+    @staticmethod
+    def build() -> Dict:
+        """Builds the snapshot: two queries, whatever the traffic."""
+        posts = Post.objects.filter(
+            auteur_organisation__statut='active', auteur_organisation__deleted=False
+        ).order_by('-created_at', '-id')[:PublicFeedService.POSTS]
+        evenements = Evenement.objects.filter(date_debut__gte=timezone.now()).order_by('date_debut', 'id')[:PublicFeedService.EVENEMENTS]
+        props = {
+            'posts': [PostOutSchema.from_orm(post).model_dump(mode='json', by_alias=True) for post in posts],
+            'evenements': [EvenementOutSchema.from_orm(evenement).model_dump(mode='json', by_alias=True) for evenement in evenements],
+        }
+        body = json.dumps(props, cls=NinjaJSONEncoder).encode()
+        return {'props': props, 'body': body, 'etag': f'"{hashlib.md5(body).hexdigest()}"'}
+
+    @staticmethod
+    def refresh() -> Dict:
+        """Rebuilds the snapshot and replaces the cached one."""
+        snapshot = PublicFeedService.build()
+        cache.set(PublicFeedService.CACHE_KEY, snapshot, settings.PUBLIC_FEED_REFRESH)
+        return snapshot
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drops the cached snapshot so the next reader rebuilds it, even if no worker shares this cache."""
+        cache.delete(PublicFeedService.CACHE_KEY)
+
+    @staticmethod
+    def get_snapshot() -> Dict:
+        """Returns the current snapshot; once expired, a single reader rebuilds it."""
+        return cache_service.get_or_set(PublicFeedService.CACHE_KEY, PublicFeedService.build, settings.PUBLIC_FEED_REFRESH)
+
+# Instantiate the service
+public_feed_service = PublicFeedService()
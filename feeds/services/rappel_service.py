@@ -0,0 +1,124 @@
+# feeds/services/rappel_service.py
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db.models import Exists, OuterRef, Q
+from django.utils import formats, timezone
+from django.utils.html import escape
+from core.models import Profil
+from core.services.email_service import EmailService
+from feeds.models import Evenement, InscriptionEvenement, RappelEvenement
+from organizations.models import AbonnementOrganisation
+
+logger = logging.getLogger('app')
+
+
+class RappelService:
+    """
+    Service sending event reminders in batches.
+
+    A periodic scan picks the events entering a reminder window (ECHEANCES) through the
+    date_debut index and claims them with a conditional UPDATE on Evenement.dernier_rappel,
+    so each (event, deadline) is scheduled once. Recipients are then processed BATCH_SIZE at
+    a time, in profil id order: each batch first records a RappelEvenement marker per
+    recipient, then sends the emails over a single SMTP connection. A batch interrupted by a
+    restart is never sent twice, since recipients with a marker are skipped.
+    """
+    # Échéances, de la plus lointaine à la plus proche
+    ECHEANCES = (('24h', timedelta(hours=24)), ('1h', timedelta(hours=1)))
+    BATCH_SIZE = 200
+
+    @staticmethod
+    def claim_due_events(now: Optional[datetime] = None) -> List[Tuple[UUID, str]]:
+        """
+        Returns the (event id, deadline) pairs to process, each claimed exactly once.
+        An event already inside a closer window only gets the closer reminder.
+        """
+        now = now or timezone.now()
+        claimed = []
+        for index, (echeance, delai) in enumerate(RappelService.ECHEANCES):
+            plus_proche = RappelService.ECHEANCES[index + 1][1] if index + 1 < len(RappelService.ECHEANCES) else timedelta(0)
+            deja_planifiees = [code for code, _delai in RappelService.ECHEANCES[index:]]
+            due = Evenement.objects.filter(
+                date_debut__gt=now + plus_proche, date_debut__lte=now + delai
+            ).exclude(dernier_rappel__in=deja_planifiees).values_list('id', 'dernier_rappel')
+            for evenement_id, dernier_rappel in due:
+                # Réservation conditionnelle : deux planificateurs concurrents ne prennent pas le même événement
+                if Evenement.objects.filter(id=evenement_id, dernier_rappel=dernier_rappel).update(dernier_rappel=echeance):
+                    claimed.append((evenement_id, echeance))
+        return claimed
+
+    @staticmethod
+    def reset(evenement_id: UUID) -> None:
+        """
+        Re-arms the reminders of an event whose start date moved: the reminders already
+        scheduled or sent announced the old date, so every deadline becomes due again.
+        """
+        Evenement.all_objects.filter(id=evenement_id).update(dernier_rappel=None)
+        # Suppression réelle : les marqueurs sont uniques par (événement, échéance, profil)
+        RappelEvenement.all_objects.filter(evenement_id=evenement_id).delete()
+
+    @staticmethod
+    def _recipients(evenement: Evenement):
+        """Registered profiles (confirmed seat) and followers of the organising organisation."""
+        condition = Q(id__in=InscriptionEvenement.objects.filter(
+            evenement=evenement, statut='confirmee'
+        ).values('profil_id'))
+        if evenement.organisateur_organisation_id:
+            condition |= Q(id__in=AbonnementOrganisation.objects.filter(
+                organisation_id=evenement.organisateur_organisation_id
+            ).values('profil_id'))
+        return Profil.objects.filter(condition, user__deleted=False, user__est_actif=True)
+
+    @staticmethod
+    def send_batch(evenement_id: UUID, echeance: str, after_profil_id: Optional[UUID] = None) -> Optional[UUID]:
+        """
+        Sends the reminder to the next batch of recipients who have not received it yet.
+        Returns the last profil id of the batch, or None once every recipient has been handled.
+        """
+        evenement = Evenement.objects.filter(id=evenement_id).first()
+        if evenement is None or evenement.date_debut <= timezone.now():
+            return None
+
+        already_sent = RappelEvenement.objects.filter(profil=OuterRef('pk'), evenement=evenement, echeance=echeance)
+        recipients = RappelService._recipients(evenement).filter(~Exists(already_sent)).order_by('id')
+        if after_profil_id is not None:
+            recipients = recipients.filter(id__gt=after_profil_id)
+        batch = list(recipients.values_list('id', 'nom_complet', 'user__email')[:RappelService.BATCH_SIZE])
+        if not batch:
+            return None
+
+        # Marqueurs d'abord : en cas d'arrêt pendant l'envoi, le rappel n'est pas renvoyé
+        RappelEvenement.objects.bulk_create(
+            [RappelEvenement(evenement=evenement, profil_id=profil_id, echeance=echeance) for profil_id, _nom, _email in batch],
+            ignore_conflicts=True
+        )
+        debut = formats.date_format(timezone.localtime(evenement.date_debut), 'DATETIME_FORMAT')
+        # Le gabarit affiche le message tel quel (|safe) : les champs saisis sont échappés ici
+        message = f"L'événement « {escape(evenement.titre)} » commence le {debut}" + (
+            f" ({escape(evenement.lieu)})." if evenement.lieu else "."
+        )
+        sent = 0
+        with get_connection() as connection:
+            for _profil_id, nom_complet, email in batch:
+                sent += EmailService.send_email_sync(
+                    subject=f"Rappel : {evenement.titre}",
+                    to_emails=[email],
+                    template_name='emails/notification.html',
+                    context={
+                        'user_name': nom_complet,
+                        'notification_title': f"Rappel : {evenement.titre}",
+                        'notification_message': message,
+                        'action_url': f"{settings.SITE_URL}/evenements/{evenement.id}",
+                        'action_text': "Voir l'événement",
+                    },
+                    connection=connection
+                )
+        logger.info(f"Rappel {echeance} de l'événement {evenement.id} : {sent}/{len(batch)} email(s) envoyé(s).")
+        return batch[-1][0] if len(batch) == RappelService.BATCH_SIZE else None
+
+# Instantiate the service
+rappel_service = RappelService()
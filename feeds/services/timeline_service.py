@@ -0,0 +1,245 @@
+# feeds/services/timeline_service.py
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from django.conf import settings
+from django.db.models import Count, Q
+from core.models import User
+from core.api.exceptions import BadRequestAPIException
+from core.services.cache_service import cache_service
+from feeds.models import Post, TimelineEntry
+from feeds.services.vus_service import PostsVusService
+from organizations.models import AbonnementOrganisation, Organisation
+
+logger = logging.getLogger('app')
+
+
+class TimelineService:
+    """
+    Service maintaining the home timelines with a hybrid push/pull strategy.
+
+    Posts from organisations below FEED_CELEBRITY_THRESHOLD followers are pushed into the
+    timeline of each follower (fan-out on write). Posts from organisations above it are
+    not copied: they are pulled at read time from a per-organisation cache of recent posts
+    and merged with the pushed entries, in (date, post id) order.
+
+    The mode is stored on Organisation.diffusion_fil and updated by a periodic task. An
+    organisation dropping below the threshold goes through 'transition': its new posts are
+    pushed again while its recent posts are back-filled into its followers' timelines, and
+    reads keep pulling it until the back-fill is done, so no post disappears on the way.
+    """
+    FANOUT_BATCH_SIZE = 1000
+    BACKFILL_BATCH_SIZE = 20  # abonnés par lot, chacun reçoit jusqu'à MAX_LENGTH posts
+    MAX_LENGTH = 500
+    CELEBRITY_REFRESH = 600  # secondes
+    DIFFUSION_TAG = 'feed:diffusion'
+
+    @staticmethod
+    def posts_tag(org_id) -> str:
+        """Tag des posts récents d'une organisation (cache de lecture du mode pull)."""
+        return f"posts:organisation:{org_id}"
+
+    @staticmethod
+    def pulled_organisation_ids() -> Set[UUID]:
+        """
+        Returns the organisations merged at read time: celebrities ('pull') and former ones still
+        being back-filled ('transition'). Cached CELEBRITY_REFRESH seconds and invalidated when a
+        mode changes; pulling a post that was also pushed is harmless, reads deduplicate them.
+        """
+        key = cache_service.build_key('feed', ['diffusion_pull'], [TimelineService.DIFFUSION_TAG])
+        org_ids = cache_service.get_or_set(
+            key,
+            lambda: [str(org_id) for org_id in Organisation.all_objects.exclude(diffusion_fil='push').values_list('id', flat=True)],
+            TimelineService.CELEBRITY_REFRESH
+        )
+        return {UUID(org_id) for org_id in org_ids}
+
+    @staticmethod
+    def update_diffusion_modes() -> List[UUID]:
+        """
+        Moves organisations crossing FEED_CELEBRITY_THRESHOLD between push and pull, from one
+        grouped count. Organisations dropping below it go to 'transition'; their ids are
+        returned so their followers' timelines get back-filled.
+        """
+        celebrites = list(
+            AbonnementOrganisation.objects.filter(profil__deleted=False).values('organisation_id')
+            .annotate(total=Count('id')).filter(total__gte=settings.FEED_CELEBRITY_THRESHOLD)
+            .values_list('organisation_id', flat=True)
+        )
+        entering = Organisation.all_objects.filter(id__in=celebrites).exclude(diffusion_fil='pull').update(diffusion_fil='pull')
+        leaving = list(
+            Organisation.all_objects.filter(diffusion_fil='pull').exclude(id__in=celebrites).values_list('id', flat=True)
+        )
+        Organisation.all_objects.filter(id__in=leaving, diffusion_fil='pull').update(diffusion_fil='transition')
+        if entering or leaving:
+            cache_service.invalidate_tags([TimelineService.DIFFUSION_TAG])
+            logger.info(f"Diffusion du fil : {entering} organisation(s) en pull, {len(leaving)} en rattrapage.")
+        return leaving
+
+    @staticmethod
+    def backfill_batch(org_id: UUID, after_profil_id: Optional[UUID] = None) -> Optional[UUID]:
+        """
+        Copies the organisation's MAX_LENGTH most recent posts into the next batch of follower
+        timelines (entries already there are kept). Once every follower is done, the
+        organisation goes back to plain push. Returns the last profil id of the batch, or None.
+        """
+        if not Organisation.all_objects.filter(id=org_id, diffusion_fil='transition').exists():
+            return None  # Redevenue très suivie entre-temps : ses posts sont de nouveau lus en pull
+
+        followers = AbonnementOrganisation.objects.filter(
+            organisation_id=org_id, profil__deleted=False
+        ).order_by('profil_id').values_list('profil_id', flat=True)
+        if after_profil_id is not None:
+            followers = followers.filter(profil_id__gt=after_profil_id)
+        batch = list(followers[:TimelineService.BACKFILL_BATCH_SIZE])
+        posts = list(
+            Post.objects.filter(auteur_organisation_id=org_id).order_by('-created_at', '-id')
+            .values_list('id', 'created_at')[:TimelineService.MAX_LENGTH]
+        )
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(profil_id=profil_id, post_id=post_id, date_post=created_at)
+                for profil_id in batch for post_id, created_at in posts
+            ],
+            batch_size=TimelineService.FANOUT_BATCH_SIZE, ignore_conflicts=True
+        )
+        if len(batch) == TimelineService.BACKFILL_BATCH_SIZE:
+            return batch[-1]
+
+        if Organisation.all_objects.filter(id=org_id, diffusion_fil='transition').update(diffusion_fil='push'):
+            cache_service.invalidate_tags([TimelineService.DIFFUSION_TAG])
+        return None
+
+    @staticmethod
+    def recent_posts(org_id: UUID) -> List[Tuple[str, str]]:
+        """Returns the (created_at, id) of the organisation's MAX_LENGTH most recent posts, newest first."""
+        key = cache_service.build_key('feed', ['posts_recents', org_id], [TimelineService.posts_tag(org_id)])
+        return cache_service.get_or_set(
+            key,
+            lambda: [
+                (post['created_at'].isoformat(), str(post['id']))
+                for post in Post.objects.filter(auteur_organisation_id=org_id)
+                .order_by('-created_at', '-id').values('created_at', 'id')[:TimelineService.MAX_LENGTH]
+            ]
+        )
+
+    @staticmethod
+    def fan_out_batch(post_id: UUID, after_profil_id: Optional[UUID] = None) -> Optional[UUID]:
+        """
+        Adds the post to the next batch of follower timelines, in profil id order.
+        The first batch also includes the author's own timeline; followers of a celebrity
+        organisation are skipped, they pull its posts at read time. The mode is read from the
+        database, not the cache, so a post is never skipped after its organisation left 'pull'.
+        Returns the last profil id of the batch, or None once every follower has been reached.
+        """
+        post = Post.objects.filter(id=post_id).first()
+        if post is None:
+            return None
+
+        profil_ids = []
+        if after_profil_id is None and post.auteur_profil_id:
+            profil_ids.append(post.auteur_profil_id)
+
+        last_profil_id = None
+        org_id = post.auteur_organisation_id
+        if org_id and not Organisation.all_objects.filter(id=org_id, diffusion_fil='pull').exists():
+            followers = AbonnementOrganisation.objects.filter(
+                organisation_id=org_id, profil__deleted=False
+            ).order_by('profil_id').values_list('profil_id', flat=True)
+            if after_profil_id is not None:
+                followers = followers.filter(profil_id__gt=after_profil_id)
+            batch = list(followers[:TimelineService.FANOUT_BATCH_SIZE])
+            profil_ids.extend(batch)
+            if len(batch) == TimelineService.FANOUT_BATCH_SIZE:
+                last_profil_id = batch[-1]
+
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(profil_id=profil_id, post_id=post.id, date_post=post.created_at) for profil_id in profil_ids],
+            ignore_conflicts=True
+        )
+        return last_profil_id
+
+    @staticmethod
+    def _encode_cursor(position: Tuple[datetime, UUID]) -> str:
+        raw = json.dumps([position[0].isoformat(), str(position[1])])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        try:
+            value, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(value), UUID(post_id)
+        except Exception:
+            raise BadRequestAPIException("Curseur de pagination invalide.")
+
+    @staticmethod
+    def get_timeline_page(acting_user: User, cursor: Optional[str], page_size: int, masquer_vus: bool = False) -> Dict:
+        """
+        Returns one page of the user's timeline, newest first, with the cursor of the next page.
+        Pushed entries are one index range scan; pulled posts come from the cache of each
+        followed celebrity organisation. Both are cut at the cursor, merged and deduplicated.
+        With `masquer_vus`, posts the user has already seen are left out of the page.
+        """
+        after = TimelineService._decode_cursor(cursor) if cursor else None
+        profil = acting_user.profil  # type: ignore
+
+        pushed = TimelineEntry.objects.filter(profil=profil).order_by('-date_post', '-post_id')
+        if after:
+            pushed = pushed.filter(Q(date_post__lt=after[0]) | Q(date_post=after[0], post_id__lt=after[1]))
+        positions = {(entry['date_post'], entry['post_id']) for entry in pushed.values('date_post', 'post_id')[:page_size + 1]}
+
+        celebrites = TimelineService.pulled_organisation_ids()
+        if celebrites:
+            followed = AbonnementOrganisation.objects.filter(
+                profil=profil, organisation_id__in=celebrites
+            ).values_list('organisation_id', flat=True)
+            for org_id in followed:
+                taken = 0
+                for created_at, post_id in TimelineService.recent_posts(org_id):
+                    position = (datetime.fromisoformat(created_at), UUID(post_id))
+                    if after and position >= after:
+                        continue
+                    positions.add(position)
+                    taken += 1
+                    if taken > page_size:
+                        break
+
+        page = sorted(positions, reverse=True)[:page_size + 1]
+        has_next = len(page) > page_size
+        page = page[:page_size]
+
+        post_ids = [post_id for _date, post_id in page]
+        if masquer_vus:
+            vus = PostsVusService.seen(profil.id, post_ids)
+            post_ids = [post_id for post_id in post_ids if post_id not in vus]
+
+        posts = Post.objects.select_related('auteur_profil').in_bulk(post_ids)
+        return {
+            'items': [posts[post_id] for post_id in post_ids if post_id in posts],
+            'next_cursor': TimelineService._encode_cursor(page[-1]) if has_next else None,
+        }
+
+    @staticmethod
+    def trim() -> int:
+        """
+        Deletes the entries beyond the MAX_LENGTH most recent ones of each timeline.
+        Only timelines over the limit are touched. Returns the number of deleted entries.
+        """
+        limit = TimelineService.MAX_LENGTH
+        oversized = TimelineEntry.all_objects.values('profil_id').annotate(total=Count('id')).filter(total__gt=limit)
+        deleted = 0
+        for row in oversized:
+            entries = TimelineEntry.all_objects.filter(profil_id=row['profil_id'])
+            cutoff = entries.order_by('-date_post', '-post_id')[limit]
+            deleted += entries.filter(
+                Q(date_post__lt=cutoff.date_post) | Q(date_post=cutoff.date_post, post_id__lte=cutoff.post_id)
+            ).delete()[0]
+        if deleted:
+            logger.info(f"Fils d'actualité tronqués : {deleted} entrée(s) supprimée(s).")
+        return deleted
+
+# Instantiate the service
+timeline_service = TimelineService()
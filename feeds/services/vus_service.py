@@ -0,0 +1,93 @@
+# feeds/services/vus_service.py
+import hashlib
+import logging
+import time
+import uuid
+from typing import Iterable, List, Set
+from uuid import UUID
+from django.core.cache import cache
+from core.api.exceptions import BadRequestAPIException
+
+logger = logging.getLogger('app')
+
+
+class PostsVusService:
+    """
+    Service remembering which posts a profile has already seen, without a per-view table.
+
+    Each profile has a Bloom filter of BITS bits per time window (WINDOW seconds), stored
+    in the cache. Marking writes the current window's filter; membership is checked
+    against the current and previous windows, fetched together in a single cache lookup.
+    Older windows simply expire: a post seen more than one or two windows ago is forgotten.
+    False positives (a post wrongly reported as seen) stay below ~1% up to about 3000
+    posts per window; there are no false negatives.
+    """
+    BITS = 32768  # 4 Ko par profil et par fenêtre
+    HASHES = 6
+    WINDOW = 7 * 24 * 3600  # une fenêtre par semaine
+    MAX_BEACON = 100
+    LOCK_TIMEOUT = 5  # secondes
+    LOCK_POLL_INTERVAL = 0.02  # secondes
+
+    @staticmethod
+    def _positions(post_id: UUID) -> List[int]:
+        """Bit positions of a post (double hashing on a single blake2b digest)."""
+        digest = hashlib.blake2b(post_id.bytes, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        step = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + index * step) % PostsVusService.BITS for index in range(PostsVusService.HASHES)]
+
+    @staticmethod
+    def _keys(profil_id) -> List[str]:
+        """Cache keys of the current and previous windows."""
+        window = int(time.time() // PostsVusService.WINDOW)
+        return [f"feed:vus:{profil_id}:{window}", f"feed:vus:{profil_id}:{window - 1}"]
+
+    @staticmethod
+    def mark_seen(profil_id, post_ids: Iterable[UUID]):
+        """
+        Adds a batch of viewed posts to the profile's current filter.
+        The read-modify-write is serialised per profile by a short cache lock.
+        """
+        post_ids = list(post_ids)
+        if len(post_ids) > PostsVusService.MAX_BEACON:
+            raise BadRequestAPIException(f"Vous ne pouvez signaler que {PostsVusService.MAX_BEACON} posts à la fois.")
+
+        key = PostsVusService._keys(profil_id)[0]
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex  # Identifie ce détenteur : on ne libère jamais le verrou d'un autre
+        deadline = time.monotonic() + PostsVusService.LOCK_TIMEOUT
+        while not cache.add(lock_key, token, PostsVusService.LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                # Écrire sans le verrou écraserait le filtre d'un autre écrivain : ces vues sont perdues
+                logger.warning(f"Verrou du filtre des posts vus de {profil_id} non obtenu, {len(post_ids)} vue(s) ignorée(s).")
+                return
+            time.sleep(PostsVusService.LOCK_POLL_INTERVAL)
+        try:
+            bits = bytearray(cache.get(key) or bytes(PostsVusService.BITS // 8))
+            for post_id in post_ids:
+                for position in PostsVusService._positions(post_id):
+                    bits[position >> 3] |= 1 << (position & 7)
+            # Deux fenêtres : la génération courante doit survivre jusqu'à la fin de la suivante
+            cache.set(key, bytes(bits), 2 * PostsVusService.WINDOW)
+        finally:
+            # Si l'écriture a dépassé LOCK_TIMEOUT, le verrou a expiré et peut appartenir à un autre
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    @staticmethod
+    def seen(profil_id, post_ids: Iterable[UUID]) -> Set[UUID]:
+        """Returns the posts of `post_ids` the profile has (probably) already seen."""
+        filters = list(cache.get_many(PostsVusService._keys(profil_id)).values())
+        if not filters:
+            return set()
+        return {
+            post_id for post_id in post_ids
+            if any(
+                all(bits[position >> 3] >> (position & 7) & 1 for position in PostsVusService._positions(post_id))
+                for bits in filters
+            )
+        }
+
+# Instantiate the service
+posts_vus_service = PostsVusService()
@@ -0,0 +1,61 @@
+# feeds/signals.py
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from core.services.cache_service import cache_service
+from feeds.models import Post, Evenement
+from feeds.services.public_feed_service import PublicFeedService
+from feeds.services.rappel_service import RappelService
+from feeds.services.timeline_service import TimelineService
+from feeds.tasks import fan_out_post_task, refresh_public_feed_task
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    """Distribue un nouveau post dans les fils d'actualité, une fois la transaction validée."""
+    if created:
+        transaction.on_commit(lambda: fan_out_post_task(instance.id))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_recent_posts_cache(sender, instance, **kwargs):
+    """Les posts récents d'une organisation sont lus depuis le cache par les fils en mode pull."""
+    if instance.auteur_organisation_id:
+        cache_service.invalidate_tags_on_commit([TimelineService.posts_tag(instance.auteur_organisation_id)])
+
+
+@receiver(pre_save, sender=Evenement)
+def track_date_debut(sender, instance, update_fields=None, **kwargs):
+    """Note si la date de début change, pour réarmer les rappels après l'enregistrement."""
+    instance._date_debut_modifiee = False
+    if instance._state.adding or (update_fields is not None and 'date_debut' not in update_fields):
+        return
+    ancienne = Evenement.all_objects.filter(id=instance.id).values_list('date_debut', flat=True).first()
+    instance._date_debut_modifiee = ancienne is not None and ancienne != instance.date_debut
+
+
+@receiver(post_save, sender=Evenement)
+def reset_rappels(sender, instance, created, **kwargs):
+    """Les rappels déjà planifiés annonçaient l'ancienne date : toutes les échéances redeviennent dues."""
+    if getattr(instance, '_date_debut_modifiee', False):
+        RappelService.reset(instance.id)
+        instance.dernier_rappel = None
+        instance._date_debut_modifiee = False
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Evenement)
+@receiver(post_delete, sender=Evenement)
+def refresh_public_feed(sender, instance, **kwargs):
+    """Le fil public ne montre que les posts des organisations : les autres ne le modifient pas."""
+    if sender is Post and not instance.auteur_organisation_id:
+        return
+
+    def refresh():
+        # Suppression dans ce processus : avec un cache local (locmem), la reconstruction faite
+        # par le worker Huey ne serait pas visible ici ; le prochain lecteur reconstruit l'instantané
+        PublicFeedService.invalidate()
+        refresh_public_feed_task()
+    transaction.on_commit(refresh)
@@ -0,0 +1,81 @@
+# feeds/tasks.py
+import logging
+from typing import Optional
+from uuid import UUID
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, db_task
+from feeds.services.timeline_service import TimelineService
+from feeds.services.like_service import LikeService
+from feeds.services.rappel_service import RappelService
+from feeds.services.public_feed_service import PublicFeedService
+
+logger = logging.getLogger('app')
+
+
+@db_task()
+def fan_out_post_task(post_id: UUID, after_profil_id: Optional[UUID] = None):
+    """
+    Distribue un post dans les fils d'actualité, un lot d'abonnés par exécution.
+    Tant qu'il reste des abonnés, la tâche se ré-enfile pour le lot suivant :
+    une organisation très suivie n'occupe jamais un worker pour toute la distribution.
+    """
+    last_profil_id = TimelineService.fan_out_batch(post_id, after_profil_id)
+    if last_profil_id is not None:
+        fan_out_post_task(post_id, last_profil_id)
+
+
+@db_periodic_task(crontab(minute='*/10'))
+def update_feed_diffusion_task():
+    """
+    Bascule toutes les 10 minutes les organisations qui franchissent FEED_CELEBRITY_THRESHOLD
+    et rattrape les fils des abonnés de celles qui repassent en push.
+    """
+    for org_id in TimelineService.update_diffusion_modes():
+        backfill_timelines_task(org_id)
+
+
+@db_task()
+def backfill_timelines_task(org_id: UUID, after_profil_id: Optional[UUID] = None):
+    """Copie les posts récents d'une ancienne organisation très suivie dans les fils, un lot d'abonnés par exécution."""
+    last_profil_id = TimelineService.backfill_batch(org_id, after_profil_id)
+    if last_profil_id is not None:
+        backfill_timelines_task(org_id, last_profil_id)
+
+
+@db_periodic_task(crontab(minute='30'))
+def trim_timelines_task():
+    """Borne chaque fil d'actualité à ses TimelineService.MAX_LENGTH entrées les plus récentes."""
+    TimelineService.trim()
+
+
+@db_periodic_task(crontab(minute='*'))
+def fold_like_counters_task():
+    """Reporte chaque minute les compteurs de likes répartis dans Post.nombre_likes."""
+    while LikeService.fold_counters() == LikeService.FOLD_BATCH_SIZE:
+        pass
+
+
+@db_task()
+def send_event_reminders_task(evenement_id: UUID, echeance: str, after_profil_id: Optional[UUID] = None):
+    """
+    Envoie un rappel d'événement, un lot de destinataires par exécution (même principe que fan_out_post_task).
+    """
+    last_profil_id = RappelService.send_batch(evenement_id, echeance, after_profil_id)
+    if last_profil_id is not None:
+        send_event_reminders_task(evenement_id, echeance, last_profil_id)
+
+
+@db_periodic_task(crontab(minute='*/5'))
+def schedule_event_reminders_task():
+    """
+    Repère toutes les 5 minutes les événements qui entrent dans une fenêtre de rappel (24h, 1h)
+    et enfile une seule tâche par événement, quel que soit le nombre de destinataires.
+    """
+    for evenement_id, echeance in RappelService.claim_due_events():
+        send_event_reminders_task(evenement_id, echeance)
+
+
+@db_task()
+def refresh_public_feed_task():
+    """Régénère l'instantané du fil public (publication ou suppression d'un post, modification d'un événement)."""
+    PublicFeedService.refresh()
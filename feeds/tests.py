@@ -1,3 +1,330 @@
-from django.test import TestCase
+import threading
+import uuid
+from unittest import mock
+from django.core import mail
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from core.models import Profil, User
+from core.testing import create_user
+from feeds.models import Commentaire, Evenement, Like, InscriptionEvenement, Post, RappelEvenement, TimelineEntry
+from feeds.services.commentaire_service import CommentaireService
+from feeds.services.inscription_service import InscriptionService
+from feeds.services.like_service import LikeService
+from feeds.services.public_feed_service import PublicFeedService
+from feeds.services.ranking_service import RankingService
+from feeds.services.rappel_service import RappelService
+from feeds.services.timeline_service import TimelineService
+from feeds.services.vus_service import PostsVusService
+from organizations.models import AbonnementOrganisation, MembreOrganisation, Organisation
 
-# Create your tests here.
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    CAPACITE = 5
+    INSCRITS = 15
+
+    def test_parallel_registrations_never_overbook(self):
+        organisateur = create_user('organisateur@example.com')
+        evenement = Evenement.objects.create(
+            titre='Forum des métiers', description='Test', date_debut=timezone.now(),
+            capacite=self.CAPACITE, organisateur_profil=organisateur.profil  # type: ignore
+        )
+        users = [create_user(f'etudiant{i}@example.com') for i in range(self.INSCRITS)]
+        barrier = threading.Barrier(self.INSCRITS)
+        errors = []
+
+        def register(user):
+            try:
+                barrier.wait()
+                for _attempt in range(100):
+                    try:
+                        InscriptionService.register(user, evenement.id)
+                        return
+                    except OperationalError:
+                        # SQLite (base de test partagée en mémoire) refuse les écritures concurrentes au lieu
+                        # de les mettre en attente ; la transaction est annulée en entier, on la rejoue
+                        continue
+                errors.append(user.email)
+            except Exception as e:
+                errors.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=register, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        evenement.refresh_from_db()
+        inscriptions = InscriptionEvenement.objects.filter(evenement=evenement)
+        self.assertEqual(inscriptions.filter(statut='confirmee').count(), self.CAPACITE)
+        self.assertEqual(evenement.places_reservees, self.CAPACITE)
+        self.assertEqual(inscriptions.filter(statut='liste_attente').count(), self.INSCRITS - self.CAPACITE)
+
+
+@override_settings(FEED_CELEBRITY_THRESHOLD=3)
+class CelebrityTransitionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organisation = Organisation.objects.create(nom_organisation='Grande école', type_organisation='universite', statut='active')
+        self.lecteurs = [create_user(f'lecteur{i}@example.com') for i in range(3)]
+        self.abonnements = [
+            AbonnementOrganisation.objects.create(profil=user.profil, organisation=self.organisation)  # type: ignore
+            for user in self.lecteurs
+        ]
+
+    def publish(self, contenu: str) -> Post:
+        post = Post.objects.create(contenu=contenu, auteur_organisation=self.organisation)
+        TimelineService.fan_out_batch(post.id)
+        return post
+
+    def timeline(self, user: User):
+        return [post.id for post in TimelineService.get_timeline_page(user, None, 20)['items']]
+
+    def test_posts_survive_leaving_the_celebrity_set(self):
+        self.assertEqual(TimelineService.update_diffusion_modes(), [])
+        self.organisation.refresh_from_db()
+        self.assertEqual(self.organisation.diffusion_fil, 'pull')
+        post = self.publish("publié en pull")
+        self.assertFalse(TimelineEntry.objects.filter(post=post).exists())
+
+        self.abonnements[0].delete()
+        self.assertEqual(TimelineService.update_diffusion_modes(), [self.organisation.id])
+        # Rattrapage pas encore fait : le post reste lu en pull
+        self.assertIn(post.id, self.timeline(self.lecteurs[1]))
+
+        self.assertIsNone(TimelineService.backfill_batch(self.organisation.id))
+        self.organisation.refresh_from_db()
+        self.assertEqual(self.organisation.diffusion_fil, 'push')
+        self.assertEqual(TimelineEntry.objects.filter(post=post).count(), 2)
+        self.assertIn(post.id, self.timeline(self.lecteurs[1]))
+
+        suivant = self.publish("publié en push")
+        self.assertEqual(TimelineEntry.objects.filter(post=suivant).count(), 2)
+
+
+class PublicFeedInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organisation = Organisation.objects.create(nom_organisation='Grande école', type_organisation='universite', statut='active')
+
+    def test_snapshot_dropped_in_process_on_commit(self):
+        """Sans worker partageant le cache, le lecteur suivant voit quand même le nouveau post."""
+        self.assertEqual(PublicFeedService.get_snapshot()['props']['posts'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(contenu="nouveau", auteur_organisation=self.organisation)
+        posts = PublicFeedService.get_snapshot()['props']['posts']
+        self.assertEqual([item['id'] for item in posts], [str(post.id)])
+
+
+class CalendarStreamTests(TestCase):
+    def setUp(self):
+        self.organisation = Organisation.objects.create(nom_organisation='Grande école', type_organisation='universite', statut='active')
+        for i in range(3):
+            Evenement.objects.create(
+                titre=f'Conférence {i}', description='Test', date_debut=timezone.now() + timezone.timedelta(days=i + 1),
+                organisateur_organisation=self.organisation
+            )
+        self.url = f'/api/v1/feeds/organisations/{self.organisation.id}/calendrier.ics'
+
+    def test_wsgi_streams_sync_iterator(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.is_async)
+        self.assertEqual(b''.join(response.streaming_content).count(b'BEGIN:VEVENT'), 3)
+
+    async def test_asgi_streams_async_iterator(self):
+        """Sous ASGI, un itérateur synchrone serait lu en entier avant l'envoi du premier octet."""
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(body.count(b'BEGIN:VEVENT'), 3)
+        self.assertTrue(body.endswith(b'END:VCALENDAR\r\n'))
+
+
+class RappelTests(TestCase):
+    def setUp(self):
+        self.organisation = Organisation.objects.create(nom_organisation='Grande école', type_organisation='universite', statut='active')
+        self.abonnes = [create_user(f'abonne{i}@example.com') for i in range(3)]
+        for user in self.abonnes:
+            AbonnementOrganisation.objects.create(profil=user.profil, organisation=self.organisation)
+        self.evenement = self.create_evenement(timezone.timedelta(hours=12))
+
+    def create_evenement(self, dans) -> Evenement:
+        return Evenement.objects.create(
+            titre='Conférence', description='Test', date_debut=timezone.now() + dans,
+            organisateur_organisation=self.organisation
+        )
+
+    def test_second_scan_claims_nothing(self):
+        self.assertEqual(RappelService.claim_due_events(), [(self.evenement.id, '24h')])
+        self.assertEqual(RappelService.claim_due_events(), [])
+
+    def test_event_inside_closer_window_only_gets_closer_reminder(self):
+        proche = self.create_evenement(timezone.timedelta(minutes=30))
+        claimed = RappelService.claim_due_events()
+        self.assertIn((proche.id, '1h'), claimed)
+        self.assertNotIn((proche.id, '24h'), claimed)
+        # L'échéance de 24 h, plus lointaine, n'est pas rattrapée au passage suivant
+        self.assertEqual(RappelService.claim_due_events(), [])
+
+    def test_send_batch_skips_profiles_already_reminded(self):
+        RappelEvenement.objects.create(evenement=self.evenement, profil=self.abonnes[0].profil, echeance='24h')
+        self.assertIsNone(RappelService.send_batch(self.evenement.id, '24h'))
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['abonne1@example.com', 'abonne2@example.com'])
+        # Une reprise du même lot n'envoie plus rien
+        RappelService.send_batch(self.evenement.id, '24h')
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_moving_the_start_date_rearms_reminders(self):
+        RappelService.claim_due_events()
+        RappelService.send_batch(self.evenement.id, '24h')
+        self.evenement.refresh_from_db()
+        self.evenement.date_debut += timezone.timedelta(hours=6)
+        self.evenement.save()
+        self.evenement.refresh_from_db()
+        self.assertIsNone(self.evenement.dernier_rappel)
+        self.assertFalse(RappelEvenement.all_objects.filter(evenement=self.evenement).exists())
+        self.assertEqual(RappelService.claim_due_events(), [(self.evenement.id, '24h')])
+
+    def test_other_changes_keep_reminders(self):
+        RappelService.claim_due_events()
+        RappelService.send_batch(self.evenement.id, '24h')
+        self.evenement.refresh_from_db()
+        self.evenement.lieu = 'Amphi A'
+        self.evenement.save()
+        self.evenement.refresh_from_db()
+        self.assertEqual(self.evenement.dernier_rappel, '24h')
+        self.assertEqual(RappelEvenement.objects.filter(evenement=self.evenement).count(), 3)
+
+
+class CommentaireCounterTests(TestCase):
+    def test_concurrent_delete_decrements_once(self):
+        """Deux suppressions qui ont chargé le commentaire avant l'une l'autre ne décrémentent qu'une fois."""
+        auteur = create_user('auteur@example.com')
+        post = Post.objects.create(contenu="post", auteur_profil=auteur.profil)  # type: ignore
+        commentaire = CommentaireService.add_commentaire(auteur, post.id, {'contenu': "premier"})
+        CommentaireService.add_commentaire(auteur, post.id, {'contenu': "second"})
+
+        stale = Commentaire.objects.select_related('post').get(id=commentaire.id)
+        CommentaireService.delete_commentaire(auteur, commentaire.id)
+        with mock.patch('feeds.services.commentaire_service.get_object_or_404', return_value=stale):
+            CommentaireService.delete_commentaire(auteur, commentaire.id)
+
+        post.refresh_from_db()
+        self.assertEqual(post.nombre_commentaires, 1)
+
+
+class LikeCounterTests(TestCase):
+    def setUp(self):
+        self.auteur = create_user('auteur@example.com')
+        self.post = Post.objects.create(contenu="post", auteur_profil=self.auteur.profil)  # type: ignore
+
+    def test_concurrent_unlike_decrements_once(self):
+        """Deux retraits qui ont chargé le like avant l'un l'autre ne décrémentent qu'une fois."""
+        lecteur = create_user('lecteur@example.com')
+        LikeService.like_post(lecteur, self.post.id)
+        LikeService.fold_counters()
+
+        stale = Like.objects.get(post=self.post, profil=lecteur.profil)  # type: ignore
+        LikeService.unlike_post(lecteur, self.post.id)
+        with mock.patch('feeds.services.like_service.get_object_or_404', return_value=stale):
+            LikeService.unlike_post(lecteur, self.post.id)
+
+        self.assertEqual(LikeService.fold_counters(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.nombre_likes, 0)
+
+    def test_fold_never_goes_below_zero(self):
+        """Un delta négatif incohérent ne fait pas échouer le report du lot entier."""
+        autre = Post.objects.create(contenu="autre", auteur_profil=self.auteur.profil)  # type: ignore
+        LikeService._add_to_counter(self.post.id, -1)
+        LikeService.like_post(create_user('lecteur@example.com'), autre.id)
+
+        self.assertEqual(LikeService.fold_counters(), 2)
+        self.post.refresh_from_db()
+        autre.refresh_from_db()
+        self.assertEqual((self.post.nombre_likes, autre.nombre_likes), (0, 1))
+
+    def test_like_and_unlike_fold_to_the_exact_count(self):
+        lecteurs = [create_user(f'lecteur{i}@example.com') for i in range(3)]
+        for lecteur in lecteurs:
+            LikeService.like_post(lecteur, self.post.id)
+        LikeService.unlike_post(lecteurs[0], self.post.id)
+        LikeService.fold_counters()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.nombre_likes, 2)
+        self.assertEqual(LikeService.get_like_count(self.post.id, exact=True)['nombre_likes'], 2)
+
+
+class RankingTests(TestCase):
+    # Fraîcheur neutralisée : les posts d'un test ont tous quasiment le même âge
+    WEIGHTS = {'recence': 0.0, 'domaine': 0.2}
+
+    def setUp(self):
+        cache.clear()
+        self.viewer = create_user('lecteur@example.com')
+        Profil.objects.filter(user=self.viewer).update(domaine='Informatique')
+        self.viewer.profil.refresh_from_db()
+        self.mon_ecole, self.suivie, self.autre = [
+            Organisation.objects.create(nom_organisation=nom, type_organisation='universite', statut='active')
+            for nom in ('Mon école', 'Suivie', 'Autre')
+        ]
+        MembreOrganisation.objects.create(profil=self.viewer.profil, organisation=self.mon_ecole)
+        AbonnementOrganisation.objects.create(profil=self.viewer.profil, organisation=self.suivie)
+        self.collegue = create_user('collegue@example.com').profil  # type: ignore
+        MembreOrganisation.objects.create(profil=self.collegue, organisation=self.mon_ecole)
+        self.inconnu = create_user('inconnu@example.com').profil  # type: ignore
+        Profil.objects.filter(id__in=[self.collegue.id, self.inconnu.id]).update(domaine=' informatique ')
+
+    def posts(self, *auteurs):
+        created = [
+            Post.objects.create(contenu=f'Post {index}', **{'auteur_profil' if isinstance(auteur, Profil) else 'auteur_organisation': auteur})
+            for index, auteur in enumerate(auteurs)
+        ]
+        return list(Post.objects.filter(id__in=[post.id for post in created]).select_related('auteur_profil').order_by('created_at'))
+
+    def test_rank_orders_by_weighted_signals(self):
+        posts = self.posts(self.autre, self.inconnu, self.suivie, self.mon_ecole, self.collegue, self.mon_ecole)
+        autre, inconnu, suivie, ecole, collegue, ecole_vu = posts
+        PostsVusService.mark_seen(self.viewer.profil.id, [ecole_vu.id])
+
+        features = RankingService.build_features(self.viewer, posts)
+        affinite, domaine, deja_vu = (RankingService.FEATURES.index(name) for name in ('affinite', 'domaine', 'deja_vu'))
+        self.assertEqual(features[:, affinite].tolist(), [0.0, 0.0, 0.5, 1.0, 1.0, 1.0])
+        self.assertEqual(features[:, domaine].tolist(), [0.0, 1.0, 0.0, 0.0, 1.0, 0.0])
+        self.assertEqual(features[:, deja_vu].tolist(), [0.0, 0.0, 0.0, 0.0, 0.0, 1.0])
+
+        # collègue (0.6 + 0.2), école (0.6), suivie (0.3), même domaine (0.2), autre (0), école déjà vue (0.6 - 1)
+        self.assertEqual(
+            RankingService.rank(self.viewer, posts, self.WEIGHTS), [collegue, ecole, suivie, inconnu, autre, ecole_vu]
+        )
+
+    def test_viewer_without_domaine_gets_no_domaine_signal(self):
+        Profil.objects.filter(user=self.viewer).update(domaine=None)
+        self.viewer.profil.refresh_from_db()
+        features = RankingService.build_features(self.viewer, self.posts(self.inconnu, self.collegue))
+        self.assertEqual(features[:, RankingService.FEATURES.index('domaine')].tolist(), [0.0, 0.0])
+
+
+class PostsVusLockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.profil_id = uuid.uuid4()
+        self.post_id = uuid.uuid4()
+        self.lock_key = f"{PostsVusService._keys(self.profil_id)[0]}:lock"
+
+    def test_lock_timeout_skips_the_write(self):
+        cache.set(self.lock_key, 'autre-ecrivain', 60)
+        with mock.patch.object(PostsVusService, 'LOCK_TIMEOUT', 0.05):
+            PostsVusService.mark_seen(self.profil_id, [self.post_id])
+        self.assertEqual(PostsVusService.seen(self.profil_id, [self.post_id]), set())
+        # Le verrou de l'autre écrivain n'est pas libéré à sa place
+        self.assertEqual(cache.get(self.lock_key), 'autre-ecrivain')
+
+    def test_mark_seen_releases_its_own_lock(self):
+        PostsVusService.mark_seen(self.profil_id, [self.post_id])
+        self.assertEqual(PostsVusService.seen(self.profil_id, [self.post_id]), {self.post_id})
+        self.assertIsNone(cache.get(self.lock_key))
@@ -1,9 +1,11 @@
 from inertia import render as render_inertia
 from django.shortcuts import render
+from feeds.services.public_feed_service import public_feed_service
 
 
 def home(request):
-    return render_inertia(request, "Home")
+    # Posts et événements publics lus depuis l'instantané du fil public, sans requête directe
+    return render_inertia(request, "Home", props=public_feed_service.get_snapshot()['props'])
 
 def index(request):
     return render(
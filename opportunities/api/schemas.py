@@ -0,0 +1,21 @@
+# opportunities/api/schemas.py
+from ninja import ModelSchema
+from opportunities.models import Stage, Emploi
+
+
+class StageOutSchema(ModelSchema):
+    class Meta:
+        model = Stage
+        fields = [
+            'id', 'titre', 'lieu', 'nom_structure', 'type_stage', 'organisation',
+            'lien_candidature', 'date_debut', 'date_fin', 'statut', 'created_at'
+        ]
+
+
+class EmploiOutSchema(ModelSchema):
+    class Meta:
+        model = Emploi
+        fields = [
+            'id', 'titre', 'lieu', 'nom_structure', 'type_emploi', 'organisation',
+            'lien_candidature', 'date_publication', 'date_expiration', 'statut', 'created_at'
+        ]
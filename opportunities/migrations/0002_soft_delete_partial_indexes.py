@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opportunities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emploi',
+            index=models.Index(condition=models.Q(('deleted', False), ('statut', 'active')), fields=['organisation', '-date_publication'], name='emploi_active_org_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stage',
+            index=models.Index(condition=models.Q(('deleted', False), ('statut', 'active')), fields=['organisation', '-created_at'], name='stage_active_org_date_idx'),
+        ),
+    ]
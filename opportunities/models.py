@@ -38,6 +38,13 @@ class Stage(ENSPMHubBaseModel):
 
     class Meta:
         db_table = 'stage'
+        indexes = [
+            # Offres actives d'une organisation, des plus récentes aux plus anciennes (index partiel)
+            models.Index(
+                fields=['organisation', '-created_at'], name='stage_active_org_date_idx',
+                condition=models.Q(statut='active', deleted=False)
+            ),
+        ]
 
 
 class Emploi(ENSPMHubBaseModel):
@@ -69,6 +76,13 @@ class Emploi(ENSPMHubBaseModel):
 
     class Meta:
         db_table = 'emploi'
+        indexes = [
+            # Offres actives d'une organisation, des plus récentes aux plus anciennes (index partiel)
+            models.Index(
+                fields=['organisation', '-date_publication'], name='emploi_active_org_date_idx',
+                condition=models.Q(statut='active', deleted=False)
+            ),
+        ]
 
 
 class Formation(ENSPMHubBaseModel):
@@ -4,6 +4,10 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.utils.safestring import mark_safe
 from organizations.models import Organisation, MembreOrganisation, AbonnementOrganisation
+from organizations.services.facette_service import facette_service
+from organizations.services.cache_tags import organisation_cache_tags, membres_tag, abonnes_tag
+from core.services.cache_service import cache_service
+from core.services.soft_delete_service import soft_delete_service
 
 # ==========================================
 # 1. INLINE POUR MEMBRE ORGANISATION DANS ORGANISATION ADMIN
@@ -85,29 +89,43 @@ class OrganisationAdmin(admin.ModelAdmin):
     # ======================================
     @admin.action(description='Activer les organisations sélectionnées')
     def activate_organisations(self, request, queryset):
+        org_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(statut='active')
+        # queryset.update ne déclenche pas les signaux
+        facette_service.rebuild()
+        cache_service.invalidate_tags_on_commit(tag for org_id in org_ids for tag in organisation_cache_tags(org_id))
         self.message_user(request, f'{updated} organisation(s) activée(s).')
 
     @admin.action(description='Désactiver les organisations sélectionnées')
     def deactivate_organisations(self, request, queryset):
+        org_ids = list(queryset.values_list('id', flat=True))
         updated = queryset.update(statut='inactive')
+        # queryset.update ne déclenche pas les signaux
+        facette_service.rebuild()
+        cache_service.invalidate_tags_on_commit(tag for org_id in org_ids for tag in organisation_cache_tags(org_id))
         self.message_user(request, f'{updated} organisation(s) désactivée(s).')
 
     @admin.action(description='Supprimer logiquement les organisations')
     def soft_delete_organisations(self, request, queryset):
-        count = 0
-        for org in queryset.filter(deleted=False):
-            org.soft_delete()
-            count += 1
-        self.message_user(request, f'{count} organisation(s) supprimée(s) logiquement.')
+        org_ids = list(queryset.filter(deleted=False).values_list('id', flat=True))
+        counts = soft_delete_service.soft_delete(Organisation.all_objects.filter(id__in=org_ids))
+        self._refresh_after_cascade(org_ids)
+        self.message_user(request, f"{counts['organizations.Organisation']} organisation(s) supprimée(s) logiquement.")
 
     @admin.action(description='Restaurer les organisations supprimées')
     def restore_organisations(self, request, queryset):
-        count = 0
-        for org in queryset.filter(deleted=True):
-            org.restore()
-            count += 1
-        self.message_user(request, f'{count} organisation(s) restaurée(s).')
+        org_ids = list(queryset.filter(deleted=True).values_list('id', flat=True))
+        counts = soft_delete_service.restore(Organisation.all_objects.filter(id__in=org_ids))
+        self._refresh_after_cascade(org_ids)
+        self.message_user(request, f"{counts['organizations.Organisation']} organisation(s) restaurée(s).")
+
+    def _refresh_after_cascade(self, org_ids):
+        # La cascade ne déclenche pas les signaux
+        facette_service.rebuild()
+        cache_service.invalidate_tags_on_commit(
+            tag for org_id in org_ids
+            for tag in organisation_cache_tags(org_id) + [membres_tag(org_id), abonnes_tag(org_id)]
+        )
 
     # ======================================
     # Optimisations
@@ -2,10 +2,13 @@
 from ninja.schema import Schema
 from ninja import ModelSchema
 from ninja.orm import create_schema
-from typing import Optional
+from typing import Optional, List, Dict
+from ninja import Field
 from datetime import date
 from pydantic import UUID4
 from core.api.schemas import ProfilOutSchema
+from feeds.api.schemas import PostOutSchema, EvenementOutSchema
+from opportunities.api.schemas import StageOutSchema, EmploiOutSchema
 from organizations.models import Organisation, MembreOrganisation, AbonnementOrganisation
 
 class OrganisationOutSchema(ModelSchema):
@@ -13,12 +16,16 @@ class OrganisationOutSchema(ModelSchema):
 
     class Meta:
         model = Organisation
-        fields = "__all__"
+        exclude = list(Organisation.CHAMPS_NORMALISES.values())
 
     @staticmethod
     def resolve_logo(obj):
         return obj.logo.url if obj.logo else None
 
+class OrganisationSuivieOutSchema(OrganisationOutSchema):
+    """Organisation suivie (liste paginée par curseur, nom de schéma distinct pour l'OpenAPI)"""
+    pass
+
 class OrganisationCreateSchema(Schema):
     nom_organisation: str
     type_organisation: str
@@ -46,6 +53,41 @@ class OrganisationUpdateSchema(Schema):
 class OrganisationStatusUpdateSchema(Schema):
     statut: str
 
+class OrganisationBulkDecisionSchema(Schema):
+    """Décision groupée sur des organisations en attente : 'approuver' ou 'rejeter'"""
+    org_ids: List[UUID4]
+    decision: str
+
+class OrganisationBulkDecisionResultSchema(Schema):
+    traitees: List[UUID4]
+    ignorees: List[UUID4]
+
+class OrganisationAncienneteSchema(Schema):
+    """Organisations en attente par ancienneté de la demande"""
+    moins_24h: int
+    de_1_a_7_jours: int
+    de_7_a_30_jours: int
+    plus_30_jours: int
+
+class OrganisationFilterSchema(Schema):
+    """Filtres de l'annuaire des organisations"""
+    search: Optional[str] = Field(None, description="Recherche dans le nom et la description")
+    type_organisation: Optional[str] = Field(None, description="Filtrer par type d'organisation")
+    pays: Optional[str] = Field(None, description="Filtrer par pays")
+    ville: Optional[str] = Field(None, description="Filtrer par ville")
+    secteur_activite: Optional[str] = Field(None, description="Filtrer par secteur d'activité")
+
+class FacetteOutSchema(Schema):
+    """Nombre d'organisations actives pour une valeur de filtre"""
+    valeur: str
+    total: int
+
+class OrganisationAnnuaireOutSchema(Schema):
+    """Page de l'annuaire telle que mise en cache (voir AnnuairePagination)"""
+    items: List[OrganisationOutSchema]
+    count: int
+    facettes: Dict[str, List[FacetteOutSchema]]
+
 MembreOrganisationOutSchema = create_schema(
     model = MembreOrganisation,
     name = "MembreOrganisationOutSchema",
@@ -59,6 +101,24 @@ class MembreOrganisationCreateSchema(Schema):
     role_organisation: str
     poste: Optional[str] = None
 
+class MembreOrganisationImportSchema(Schema):
+    """Ligne d'import : le profil est désigné par son identifiant ou par l'email de son compte"""
+    profil_id: Optional[UUID4] = None
+    email: Optional[str] = None
+    role_organisation: str = 'employe'
+    poste: Optional[str] = None
+
+class MembreOrganisationBulkCreateSchema(Schema):
+    membres: List[MembreOrganisationImportSchema]
+
+class MembreOrganisationImportResultSchema(Schema):
+    """Résultat d'une ligne d'import : 'cree', 'remplace' ou 'erreur'"""
+    ligne: int
+    profil_id: Optional[UUID4] = None
+    email: Optional[str] = None
+    statut: str
+    detail: Optional[str] = None
+
 class MembreOrganisationUpdateSchema(Schema):
     role_organisation: Optional[str] = None
     poste: Optional[str] = None
@@ -70,6 +130,20 @@ AbonnementOrganisationOutSchema = create_schema(
     fields = ['profil', 'date_abonnement'],
 )
 
+class OrganisationCompteursSchema(Schema):
+    membres: int
+    abonnes: int
+
+class OrganisationPageOutSchema(Schema):
+    """Page complète d'une organisation, en une seule réponse"""
+    organisation: OrganisationOutSchema
+    compteurs: OrganisationCompteursSchema
+    membres: List[MembreOrganisationOutSchema]
+    posts: List[PostOutSchema]
+    stages: List[StageOutSchema]
+    emplois: List[EmploiOutSchema]
+    evenements: List[EvenementOutSchema]
+
 class LogoUploadResponseSchema(Schema):
     """Réponse après upload réussi de logo"""
     message: str = "Logo de l'organisation mis à jour avec succès"
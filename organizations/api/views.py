@@ -1,22 +1,37 @@
 # organizations/api/views.py
-from typing import List
-from ninja import Router, File, UploadedFile
-from ninja.pagination import paginate
+from typing import Any, List, Dict
+from ninja import Router, File, UploadedFile, Query
+from ninja.pagination import paginate, PageNumberPagination
+from ninja.schema import Schema
 from django.http import HttpRequest
 from pydantic import UUID4
 from core.services.auth_service import jwt_auth
 from core.api.schemas import MessageSchema, ValidationErrorSchema
+from core.api.pagination import KeysetPagination
+from core.api.cache import cached_response
+from core.api.prefetch import prefetch_for_schema
 from organizations.services.organisation_service import organisation_service
 from organizations.services.membre_service import membre_service
 from organizations.services.abonnement_service import abonnement_service
+from organizations.services.page_service import organisation_page_service
 from core.api.schemas import ProfilOutSchema
 from .schemas import (
     OrganisationOutSchema,
+    OrganisationSuivieOutSchema,
     OrganisationCreateSchema,
     OrganisationUpdateSchema,
     OrganisationStatusUpdateSchema,
+    OrganisationFilterSchema,
+    FacetteOutSchema,
+    OrganisationAnnuaireOutSchema,
+    OrganisationPageOutSchema,
+    OrganisationBulkDecisionSchema,
+    OrganisationBulkDecisionResultSchema,
+    OrganisationAncienneteSchema,
     MembreOrganisationOutSchema,
     MembreOrganisationCreateSchema,
+    MembreOrganisationBulkCreateSchema,
+    MembreOrganisationImportResultSchema,
     MembreOrganisationUpdateSchema,
     AbonnementOrganisationOutSchema,
     LogoUploadResponseSchema,
@@ -24,6 +39,33 @@ from .schemas import (
 
 organizations_router = Router(tags=["Organisations"])
 
+# ==========================================
+# Configuration de la pagination
+# ==========================================
+class AnnuairePagination(PageNumberPagination):
+    """Pagination de l'annuaire : ajoute les facettes, calculées pour les filtres de la requête, à chaque page."""
+    class Output(Schema):
+        items: List[Any]
+        count: int
+        facettes: Dict[str, List[FacetteOutSchema]]
+
+    def paginate_queryset(self, queryset, pagination, request, **params):
+        result = super().paginate_queryset(queryset, pagination, request, **params)
+        result['facettes'] = organisation_service.list_facettes(params['filters'].dict(exclude_none=True))
+        return result
+
+class ModerationPagination(PageNumberPagination):
+    """Pagination de la file de modération : ajoute le nombre de demandes par ancienneté."""
+    class Output(Schema):
+        items: List[Any]
+        count: int
+        anciennete: OrganisationAncienneteSchema
+
+    def paginate_queryset(self, queryset, pagination, request, **params):
+        result = super().paginate_queryset(queryset, pagination, request, **params)
+        result['anciennete'] = organisation_service.count_pending_by_age()
+        return result
+
 @organizations_router.post(
     "/",
     response={201: OrganisationOutSchema, 400: MessageSchema, 401: MessageSchema, 422: ValidationErrorSchema},
@@ -44,12 +86,12 @@ def create_organisation_endpoint(request: HttpRequest, payload: OrganisationCrea
 @organizations_router.get(
     "/",
     response={200: List[OrganisationOutSchema], 422: ValidationErrorSchema},
-    summary="Lister les organisations actives"
+    summary="Rechercher dans l'annuaire des organisations actives"
 )
-@paginate
-def list_organisations_endpoint(request: HttpRequest):
-    # Filters can be added here, e.g. filters: Query[OrganisationFilterSchema]
-    organisations = organisation_service.list_organisations(filters={})
+@cached_response("organisations", OrganisationAnnuaireOutSchema, tags=lambda **kwargs: ["organisations"])
+@paginate(AnnuairePagination)
+def list_organisations_endpoint(request: HttpRequest, filters: Query[OrganisationFilterSchema]):
+    organisations = organisation_service.list_organisations(filters=filters.dict(exclude_none=True))
     return organisations
 
 @organizations_router.get(
@@ -58,19 +100,51 @@ def list_organisations_endpoint(request: HttpRequest):
     auth=jwt_auth,
     summary="Lister les organisations en attente d'approbation (admin uniquement)"
 )
+@paginate(ModerationPagination)
 def list_pending_organisations_endpoint(request: HttpRequest):
     organisations = organisation_service.list_pending_organisations(acting_user=request.auth) # type: ignore
     return organisations
 
+@organizations_router.post(
+    "/pending/decisions",
+    response={200: OrganisationBulkDecisionResultSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Approuver ou rejeter plusieurs organisations en attente (admin uniquement)"
+)
+def bulk_decide_pending_organisations_endpoint(request: HttpRequest, payload: OrganisationBulkDecisionSchema):
+    """
+    Applique la même décision à un lot d'organisations en attente.
+    Les organisations déjà traitées ou introuvables sont renvoyées dans `ignorees`.
+    """
+    return organisation_service.bulk_decide_pending_organisations(
+        acting_user=request.auth,  # type: ignore
+        org_ids=payload.org_ids,
+        decision=payload.decision,
+        request=request
+    )
+
 @organizations_router.get(
     "/{org_id}",
     response={200: OrganisationOutSchema, 404: MessageSchema},
     summary="Obtenir les détails d'une organisation"
 )
+@cached_response("organisation", OrganisationOutSchema, tags=lambda org_id, **kwargs: [f"organisation:{org_id}"])
 def get_organisation_endpoint(request: HttpRequest, org_id: UUID4):
     organisation = organisation_service.get_organisation_by_id(org_id)
     return organisation
 
+@organizations_router.get(
+    "/{org_id}/page",
+    response={200: OrganisationPageOutSchema, 404: MessageSchema},
+    summary="Obtenir la page complète d'une organisation (détails, compteurs, membres, posts, offres, événements)"
+)
+async def get_organisation_page_endpoint(request: HttpRequest, org_id: UUID4):
+    """
+    Regroupe en une seule réponse les données de la page d'une organisation.
+    Les sections sont mises en cache séparément et calculées en parallèle.
+    """
+    return await organisation_page_service.get_page(org_id)
+
 @organizations_router.put(
     "/{org_id}",
     response={200: OrganisationOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema, 422: ValidationErrorSchema},
@@ -121,15 +195,22 @@ def upload_logo_endpoint(request: HttpRequest, org_id: UUID4, file: File[Uploade
 
 @organizations_router.delete(
     "/{org_id}",
-    response={204: None, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
+    response={200: Dict[str, int], 204: None, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema},
     auth=jwt_auth,
     summary="Supprimer une organisation (admin uniquement)"
 )
-def delete_organisation_endpoint(request: HttpRequest, org_id: UUID4):
-    organisation_service.soft_delete_organisation(
+def delete_organisation_endpoint(request: HttpRequest, org_id: UUID4, dry_run: bool = False):
+    """
+    Supprime l'organisation ainsi que ses membres, abonnés, posts et offres.
+    Avec `dry_run=true`, rien n'est supprimé : renvoie le nombre de lignes concernées par modèle.
+    """
+    counts = organisation_service.soft_delete_organisation(
         acting_user=request.auth,  # type: ignore
-        org_id=org_id
+        org_id=org_id,
+        dry_run=dry_run
     )
+    if dry_run:
+        return 200, counts
     return 204, None
 
 # ==========================================
@@ -144,8 +225,7 @@ def delete_organisation_endpoint(request: HttpRequest, org_id: UUID4):
 )
 @paginate
 def list_members_endpoint(request: HttpRequest, org_id: UUID4):
-    print(membre_service.list_membres(org_id))
-    return membre_service.list_membres(org_id)
+    return prefetch_for_schema(membre_service.list_membres(org_id), MembreOrganisationOutSchema)
 
 @organizations_router.post(
     "/{org_id}/members",
@@ -161,6 +241,23 @@ def add_member_endpoint(request: HttpRequest, org_id: UUID4, payload: MembreOrga
     )
     return 201, new_member
 
+@organizations_router.post(
+    "/{org_id}/members/bulk",
+    response={200: List[MembreOrganisationImportResultSchema], 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Importer une liste de membres dans une organisation"
+)
+def bulk_add_members_endpoint(request: HttpRequest, org_id: UUID4, payload: MembreOrganisationBulkCreateSchema):
+    """
+    Ajoute ou remplace plusieurs membres en une seule requête (liste du personnel d'un partenaire).
+    Chaque ligne désigne un profil par `profil_id` ou `email` ; le résultat est donné ligne par ligne.
+    """
+    return membre_service.bulk_add_membres(
+        acting_user=request.auth,  # type: ignore
+        org_id=org_id,
+        rows=[row.dict() for row in payload.membres]
+    )
+
 @organizations_router.put(
     "/{org_id}/members/{profil_id}",
     response={200: MembreOrganisationOutSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema, 422: ValidationErrorSchema},
@@ -225,14 +322,29 @@ def unfollow_organisation_endpoint(request: HttpRequest, org_id: UUID4):
     response=List[ProfilOutSchema],
     summary="Lister les abonnés d'une organisation"
 )
+@paginate(KeysetPagination, ordering_field='date_abonnement', item_attribute='profil')
 def list_followers_endpoint(request: HttpRequest, org_id: UUID4):
-    return abonnement_service.list_followers(org_id)
+    return prefetch_for_schema(abonnement_service.list_followers(org_id), ProfilOutSchema, through='profil')
 
 @organizations_router.get(
     "/following/me",
-    response=List[OrganisationOutSchema],
+    response=List[OrganisationSuivieOutSchema],
     auth=jwt_auth,
     summary="Lister les organisations suivies par l'utilisateur connecté"
 )
+@paginate(KeysetPagination, ordering_field='date_abonnement', item_attribute='organisation')
 def list_following_endpoint(request: HttpRequest):
-    return abonnement_service.list_following(acting_user=request.auth) # type: ignore
+    subscriptions = abonnement_service.list_following(acting_user=request.auth) # type: ignore
+    return prefetch_for_schema(subscriptions, OrganisationSuivieOutSchema, through='organisation')
+
+@organizations_router.get(
+    "/following/check",
+    response={200: Dict[str, bool], 400: MessageSchema, 401: MessageSchema, 422: ValidationErrorSchema},
+    auth=jwt_auth,
+    summary="Indiquer, pour une liste d'organisations, celles suivies par l'utilisateur connecté"
+)
+def check_following_endpoint(request: HttpRequest, org_ids: List[UUID4] = Query(...)):
+    return abonnement_service.get_following_status(
+        acting_user=request.auth,  # type: ignore
+        org_ids=org_ids
+    )
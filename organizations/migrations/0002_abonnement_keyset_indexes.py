@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='abonnementorganisation',
+            index=models.Index(fields=['organisation', 'date_abonnement'], name='abonnement_org_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abonnementorganisation',
+            index=models.Index(fields=['profil', 'date_abonnement'], name='abonnement_profil_date_idx'),
+        ),
+    ]
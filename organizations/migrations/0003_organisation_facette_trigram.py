@@ -0,0 +1,74 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:00
+
+import uuid
+from django.db import migrations, models
+
+
+TRIGRAM_INDEXES = [
+    ('organisation_nom_trgm_idx', 'nom_organisation'),
+    ('organisation_desc_trgm_idx', 'description'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Index GIN trigramme pour la recherche de l'annuaire : PostgreSQL uniquement
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON organisation USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def populate_facettes(apps, schema_editor):
+    Organisation = apps.get_model('organizations', 'Organisation')
+    OrganisationFacette = apps.get_model('organizations', 'OrganisationFacette')
+    totals = {}
+    visible = Organisation.objects.filter(statut='active', deleted=False)
+    for values in visible.values('type_organisation', 'pays', 'ville', 'secteur_activite').iterator():
+        for dimension, valeur in values.items():
+            valeur = (valeur or '').strip()
+            if valeur:
+                totals[(dimension, valeur)] = totals.get((dimension, valeur), 0) + 1
+    OrganisationFacette.objects.bulk_create(
+        OrganisationFacette(dimension=dimension, valeur=valeur, total=total)
+        for (dimension, valeur), total in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_abonnement_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganisationFacette',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Date de modification')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Supprimé')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Date de suppression')),
+                ('dimension', models.CharField(choices=[('type_organisation', "Type d'organisation"), ('pays', 'Pays'), ('ville', 'Ville'), ('secteur_activite', "Secteur d'activité")], max_length=30)),
+                ('valeur', models.CharField(max_length=255)),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Facette organisation',
+                'db_table': 'organisation_facette',
+                'unique_together': {('dimension', 'valeur')},
+            },
+        ),
+        migrations.RunPython(populate_facettes, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
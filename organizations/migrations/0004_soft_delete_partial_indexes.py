@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('organizations', '0003_organisation_facette_trigram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membreorganisation',
+            index=models.Index(condition=models.Q(('deleted', False), ('est_actif', True)), fields=['organisation', 'date_joindre'], name='membre_org_actif_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membreorganisation',
+            index=models.Index(condition=models.Q(('deleted', False), ('est_actif', True)), fields=['profil'], name='membre_profil_actif_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organisation',
+            index=models.Index(condition=models.Q(('deleted', False), ('statut', 'active')), fields=['nom_organisation'], name='organisation_active_nom_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organisation',
+            index=models.Index(condition=models.Q(('deleted', False), ('statut', 'en_attente')), fields=['created_at'], name='organisation_attente_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0004_soft_delete_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisation',
+            name='diffusion_fil',
+            field=models.CharField(choices=[('push', 'Distribuée à la publication'), ('pull', 'Fusionnée à la lecture'), ('transition', 'Rattrapage en cours')], default='push', max_length=20),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-19 08:05
+
+from django.db import migrations
+
+
+def normalise_facettes(apps, schema_editor):
+    # Les valeurs de facette sont désormais en minuscules : on recalcule l'agrégat
+    Organisation = apps.get_model('organizations', 'Organisation')
+    OrganisationFacette = apps.get_model('organizations', 'OrganisationFacette')
+    totals = {}
+    visible = Organisation.objects.filter(statut='active', deleted=False)
+    for values in visible.values('type_organisation', 'pays', 'ville', 'secteur_activite').iterator():
+        for dimension, valeur in values.items():
+            valeur = (valeur or '').strip().lower()
+            if valeur:
+                totals[(dimension, valeur)] = totals.get((dimension, valeur), 0) + 1
+    OrganisationFacette.objects.all().delete()
+    OrganisationFacette.objects.bulk_create(
+        OrganisationFacette(dimension=dimension, valeur=valeur, total=total)
+        for (dimension, valeur), total in totals.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_organisation_diffusion_fil'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_facettes, migrations.RunPython.noop),
+    ]
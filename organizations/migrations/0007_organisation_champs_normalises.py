@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-19 08:02
+
+from django.db import migrations, models
+
+
+CHAMPS = ('secteur_activite', 'ville', 'pays')
+
+
+def populate_champs_normalises(apps, schema_editor):
+    # Même normalisation que organizations.models.normalise_facette, faite en Python (LOWER() SQLite = ASCII seul)
+    Organisation = apps.get_model('organizations', 'Organisation')
+    organisations = list(Organisation.objects.only('id', *CHAMPS))
+    for organisation in organisations:
+        for champ in CHAMPS:
+            setattr(organisation, f'{champ}_normalise', (getattr(organisation, champ) or '').strip().lower())
+    Organisation.objects.bulk_update(organisations, [f'{champ}_normalise' for champ in CHAMPS], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0006_normalise_facettes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisation',
+            name='pays_normalise',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='organisation',
+            name='secteur_activite_normalise',
+            field=models.CharField(blank=True, default='', editable=False, max_length=150),
+        ),
+        migrations.AddField(
+            model_name='organisation',
+            name='ville_normalise',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(populate_champs_normalises, migrations.RunPython.noop),
+    ]
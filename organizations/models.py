@@ -4,6 +4,14 @@ from core.models import ENSPMHubBaseModel
 from django.utils.translation import gettext_lazy as _
 
 
+def normalise_facette(valeur):
+    """
+    Forme normalisée d'une valeur de filtre de l'annuaire : 'Douala', 'douala ' et 'DOUALA' sont la même facette.
+    Faite en Python (et stockée) plutôt qu'en SQL : LOWER() de SQLite ne traite que l'ASCII.
+    """
+    return (valeur or '').strip().lower()
+
+
 # ==========================================
 # 5. ORGANISATIONS
 # ==========================================
@@ -23,6 +31,11 @@ class Organisation(ENSPMHubBaseModel):
         ('inactive', 'Inactive'),
         ('en_attente', 'En attente'),
     ]
+    DIFFUSION_FIL_CHOICES = [
+        ('push', 'Distribuée à la publication'),
+        ('pull', 'Fusionnée à la lecture'),
+        ('transition', 'Rattrapage en cours'),
+    ]
 
     nom_organisation = models.CharField(max_length=255)
     type_organisation = models.CharField(max_length=30, choices=TYPE_ORGANISATION_CHOICES)
@@ -36,13 +49,56 @@ class Organisation(ENSPMHubBaseModel):
     description = models.TextField(null=True, blank=True)
     date_creation = models.DateField(null=True, blank=True)
     statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_attente')
+    # Distribution des posts dans les fils d'actualité (feeds.services.timeline_service) :
+    # 'transition' = ancienne organisation très suivie, dont les fils sont en cours de rattrapage
+    diffusion_fil = models.CharField(max_length=20, choices=DIFFUSION_FIL_CHOICES, default='push')
+    # Copies normalisées (normalise_facette) des champs filtrables de l'annuaire, tenues à jour par save()
+    secteur_activite_normalise = models.CharField(max_length=150, blank=True, default='', editable=False)
+    ville_normalise = models.CharField(max_length=100, blank=True, default='', editable=False)
+    pays_normalise = models.CharField(max_length=100, blank=True, default='', editable=False)
+
+    # Champ filtrable -> sa copie normalisée
+    CHAMPS_NORMALISES = {
+        'secteur_activite': 'secteur_activite_normalise',
+        'ville': 'ville_normalise',
+        'pays': 'pays_normalise',
+    }
+
+    SOFT_DELETE_CASCADE = (
+        ('organizations.MembreOrganisation', 'organisation'),
+        ('organizations.AbonnementOrganisation', 'organisation'),
+        ('feeds.Post', 'auteur_organisation'),
+        ('opportunities.Stage', 'organisation'),
+        ('opportunities.Emploi', 'organisation'),
+    )
 
     class Meta:
         verbose_name = _("Organisation")
         db_table = 'organisation'
+        indexes = [
+            # Index partiels : seules les lignes lues par l'annuaire et la file de modération y figurent
+            models.Index(
+                fields=['nom_organisation'], name='organisation_active_nom_idx',
+                condition=models.Q(statut='active', deleted=False)
+            ),
+            models.Index(
+                fields=['created_at'], name='organisation_attente_idx',
+                condition=models.Q(statut='en_attente', deleted=False)
+            ),
+        ]
 
     def __str__(self):
         return self.nom_organisation
+
+    def save(self, *args, **kwargs):
+        for field, normalised in self.CHAMPS_NORMALISES.items():
+            setattr(self, normalised, normalise_facette(getattr(self, field)))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                normalised for field, normalised in self.CHAMPS_NORMALISES.items() if field in update_fields
+            }
+        super().save(*args, **kwargs)
     
     
     
@@ -63,6 +119,17 @@ class MembreOrganisation(ENSPMHubBaseModel):
         verbose_name = _("Membre organisation")
         db_table = 'membre_organisation'
         unique_together = ('profil', 'organisation', 'est_actif')  # Un profil ne peut être membre actif qu'une fois
+        indexes = [
+            # Adhésions actives par organisation (liste des membres) et par profil (index partiels)
+            models.Index(
+                fields=['organisation', 'date_joindre'], name='membre_org_actif_idx',
+                condition=models.Q(est_actif=True, deleted=False)
+            ),
+            models.Index(
+                fields=['profil'], name='membre_profil_actif_idx',
+                condition=models.Q(est_actif=True, deleted=False)
+            ),
+        ]
 
     def __str__(self):
         return f"{self.profil} - {self.organisation}"
@@ -77,6 +144,37 @@ class AbonnementOrganisation(ENSPMHubBaseModel):
         verbose_name = _("Abonnement organisation")
         db_table = 'abonnement_organisation'
         unique_together = ('profil', 'organisation')
+        indexes = [
+            # Pagination keyset des abonnés d'une organisation / des suivis d'un profil
+            models.Index(fields=['organisation', 'date_abonnement'], name='abonnement_org_date_idx'),
+            models.Index(fields=['profil', 'date_abonnement'], name='abonnement_profil_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profil} suit {self.organisation}"
+
+
+class OrganisationFacette(ENSPMHubBaseModel):
+    """
+    Agrégat des organisations actives par valeur de filtre de l'annuaire.
+    Maintenu incrémentalement à chaque enregistrement d'organisation (voir organizations/signals.py)
+    et reconstruit périodiquement pour rattraper les mises à jour en masse.
+    """
+    DIMENSION_CHOICES = [
+        ('type_organisation', 'Type d\'organisation'),
+        ('pays', 'Pays'),
+        ('ville', 'Ville'),
+        ('secteur_activite', 'Secteur d\'activité'),
+    ]
+
+    dimension = models.CharField(max_length=30, choices=DIMENSION_CHOICES)
+    valeur = models.CharField(max_length=255)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Facette organisation")
+        db_table = 'organisation_facette'
+        unique_together = ('dimension', 'valeur')
 
     def __str__(self):
-        return f"{self.profil} suit {self.organisation}"
\ No newline at end of file
+        return f"{self.dimension}={self.valeur} ({self.total})"
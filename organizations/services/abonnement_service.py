@@ -1,7 +1,8 @@
 # organizations/services/abonnement_service.py
-from typing import List
+from typing import List, Dict
 from uuid import UUID
 from django.db import transaction
+from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
 from core.models import User, Profil
 from organizations.models import Organisation, AbonnementOrganisation
@@ -11,6 +12,7 @@ class AbonnementService:
     """
     Service containing the business logic for managing organisation subscriptions (follows).
     """
+    MAX_FOLLOWING_CHECK = 100
 
     @staticmethod
     @transaction.atomic
@@ -47,19 +49,46 @@ class AbonnementService:
         subscription.delete()
 
     @staticmethod
-    def list_followers(org_id: UUID) -> List[Profil]:
+    def list_followers(org_id: UUID) -> QuerySet[AbonnementOrganisation]:
         """
-        Lists all users (profiles) following an organisation.
+        Lists the subscriptions of an organisation, with their follower profile.
+        Returned as a queryset so the caller can paginate it on (date_abonnement, id).
         """
         organisation = get_object_or_404(Organisation, id=org_id, statut='active', deleted=False)
-        return [sub.profil for sub in organisation.abonnés.all().select_related('profil')]
+        return AbonnementOrganisation.objects.filter(
+            organisation=organisation,
+            profil__deleted=False
+        ).select_related('profil')
 
     @staticmethod
-    def list_following(acting_user: User) -> List[Organisation]:
+    def list_following(acting_user: User) -> QuerySet[AbonnementOrganisation]:
         """
-        Lists all organisations a user is following.
+        Lists the subscriptions of a user, with the followed organisation.
+        Returned as a queryset so the caller can paginate it on (date_abonnement, id).
         """
-        return [sub.organisation for sub in acting_user.profil.abonnements.all().select_related('organisation')]
+        return AbonnementOrganisation.objects.filter(
+            profil=acting_user.profil,
+            organisation__statut='active',
+            organisation__deleted=False
+        ).select_related('organisation')
+
+    @staticmethod
+    def get_following_status(acting_user: User, org_ids: List[UUID]) -> Dict[str, bool]:
+        """
+        Tells, in a single query, which of the given organisations the user is following.
+        """
+        if len(org_ids) > AbonnementService.MAX_FOLLOWING_CHECK:
+            raise BadRequestAPIException(
+                f"Vous ne pouvez vérifier que {AbonnementService.MAX_FOLLOWING_CHECK} organisations à la fois."
+            )
+
+        followed = set(
+            AbonnementOrganisation.objects.filter(
+                profil=acting_user.profil,
+                organisation_id__in=org_ids
+            ).values_list('organisation_id', flat=True)
+        )
+        return {str(org_id): org_id in followed for org_id in org_ids}
 
 # Instantiate the service
 abonnement_service = AbonnementService()
@@ -0,0 +1,19 @@
+# organizations/services/cache_tags.py
+# Tags d'invalidation des réponses mises en cache qui dépendent d'une organisation (voir CacheService)
+
+
+def organisation_tag(org_id) -> str:
+    return f"organisation:{org_id}"
+
+
+def membres_tag(org_id) -> str:
+    return f"organisation:{org_id}:membres"
+
+
+def abonnes_tag(org_id) -> str:
+    return f"organisation:{org_id}:abonnes"
+
+
+def organisation_cache_tags(org_id) -> list:
+    """Tags à invalider quand l'organisation elle-même change (détail et annuaire)."""
+    return [organisation_tag(org_id), "organisations"]
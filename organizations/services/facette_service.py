@@ -0,0 +1,144 @@
+# organizations/services/facette_service.py
+import logging
+from typing import List, Dict, Optional, Tuple
+from django.db import transaction
+from django.db.models import F, Count, QuerySet
+from organizations.models import Organisation, OrganisationFacette, normalise_facette
+
+logger = logging.getLogger('app')
+
+
+class FacetteService:
+    """
+    Service maintaining the directory facet counts (organisations per filter value).
+    Counts only cover organisations visible in the directory (active and not deleted).
+    Values are normalised (see `normalise`) since the directory filters ignore case.
+    """
+    DIMENSIONS = [choice[0] for choice in OrganisationFacette.DIMENSION_CHOICES]
+    # Colonne normalisée et recherche utilisées par le filtre de l'annuaire pour chaque dimension
+    # (type_organisation est un choix, déjà normalisé)
+    LOOKUPS = {
+        'type_organisation': ('type_organisation', 'exact'),
+        'pays': (Organisation.CHAMPS_NORMALISES['pays'], 'exact'),
+        'ville': (Organisation.CHAMPS_NORMALISES['ville'], 'exact'),
+        'secteur_activite': (Organisation.CHAMPS_NORMALISES['secteur_activite'], 'contains'),
+    }
+
+    @staticmethod
+    def normalise(valeur: Optional[str]) -> str:
+        """Facet value of a field (see organizations.models.normalise_facette)."""
+        return normalise_facette(valeur)
+
+    @staticmethod
+    def filter_queryset(queryset: QuerySet, filters: Dict, skip: Optional[str] = None) -> QuerySet:
+        """
+        Applies the directory filters of every dimension but `skip`, on the normalised columns:
+        a facet value selects exactly the organisations it counts.
+        """
+        for dimension, (column, lookup) in FacetteService.LOOKUPS.items():
+            if dimension != skip and filters.get(dimension):
+                queryset = queryset.filter(**{f'{column}__{lookup}': FacetteService.normalise(filters[dimension])})
+        return queryset
+
+    @staticmethod
+    def _count(queryset: QuerySet, dimension: str) -> Dict[str, int]:
+        """Counts the organisations of `queryset` per normalised value of `dimension`."""
+        column = FacetteService.LOOKUPS[dimension][0]
+        rows = queryset.exclude(**{column: ''}).order_by().values(column).annotate(total=Count('id'))
+        return {row[column]: row['total'] for row in rows}
+
+    @staticmethod
+    def _contributions(organisation: Organisation) -> List[Tuple[str, str]]:
+        """Returns the (dimension, valeur) pairs an organisation counts towards."""
+        if organisation.statut != 'active' or organisation.deleted:
+            return []
+        contributions = []
+        for dimension in FacetteService.DIMENSIONS:
+            valeur = FacetteService.normalise(getattr(organisation, dimension))
+            if valeur:
+                contributions.append((dimension, valeur))
+        return contributions
+
+    @staticmethod
+    def snapshot(organisation: Organisation) -> List[Tuple[str, str]]:
+        """Returns the current contributions of an organisation as stored in the database."""
+        try:
+            stored = Organisation.all_objects.get(pk=organisation.pk)
+        except Organisation.DoesNotExist:
+            return []
+        return FacetteService._contributions(stored)
+
+    @staticmethod
+    @transaction.atomic
+    def apply_change(old: List[Tuple[str, str]], new: List[Tuple[str, str]]):
+        """
+        Moves an organisation's contributions from `old` to `new`,
+        touching only the facet rows that actually changed.
+        """
+        deltas = {key: -1 for key in set(old) - set(new)}
+        deltas.update({key: 1 for key in set(new) - set(old)})
+        FacetteService.apply_deltas(deltas)
+
+    @staticmethod
+    @transaction.atomic
+    def apply_deltas(deltas: Dict[Tuple[str, str], int]):
+        """
+        Adds `delta` to the count of each (dimension, valeur), with one UPDATE per facet row.
+        Lets bulk status changes adjust the facets without a full rebuild.
+        """
+        for (dimension, valeur), delta in deltas.items():
+            if delta == 0:
+                continue
+            if delta > 0:
+                OrganisationFacette.objects.get_or_create(dimension=dimension, valeur=valeur)
+            OrganisationFacette.objects.filter(dimension=dimension, valeur=valeur).update(total=F('total') + delta)
+
+    @staticmethod
+    def get_facettes() -> Dict[str, List[Dict]]:
+        """
+        Returns all facet counts, grouped by dimension and sorted by decreasing count, in one query.
+        """
+        facettes = {dimension: [] for dimension in FacetteService.DIMENSIONS}
+        rows = OrganisationFacette.objects.filter(total__gt=0).order_by('dimension', '-total', 'valeur')
+        for facette in rows.values('dimension', 'valeur', 'total'):
+            facettes[facette['dimension']].append({'valeur': facette['valeur'], 'total': facette['total']})
+        return facettes
+
+    @staticmethod
+    def get_filtered_facettes(queryset: QuerySet, filters: Dict) -> Dict[str, List[Dict]]:
+        """
+        Returns the facet counts of a filtered directory, one grouped query per dimension.
+        Each dimension is counted with every filter but its own, so its other values stay
+        selectable with their actual count. Without filters, reads the maintained aggregate.
+        """
+        if not any(filters.get(dimension) for dimension in FacetteService.DIMENSIONS) and not filters.get('search'):
+            return FacetteService.get_facettes()
+        facettes = {}
+        for dimension in FacetteService.DIMENSIONS:
+            totals = FacetteService._count(FacetteService.filter_queryset(queryset, filters, skip=dimension), dimension)
+            facettes[dimension] = [
+                {'valeur': valeur, 'total': total}
+                for valeur, total in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+            ]
+        return facettes
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild():
+        """
+        Recomputes every facet count from the organisation table.
+        Used to reconcile counts after bulk updates that bypass model signals.
+        """
+        visible = Organisation.objects.filter(statut='active', deleted=False)
+        facettes = [
+            OrganisationFacette(dimension=dimension, valeur=valeur, total=total)
+            for dimension in FacetteService.DIMENSIONS
+            for valeur, total in FacetteService._count(visible, dimension).items()
+        ]
+
+        OrganisationFacette.all_objects.all().delete()
+        OrganisationFacette.objects.bulk_create(facettes)
+        logger.info(f"Facettes de l'annuaire reconstruites ({len(facettes)} valeurs).")
+
+# Instantiate the service
+facette_service = FacetteService()
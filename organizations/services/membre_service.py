@@ -1,17 +1,25 @@
 # organizations/services/membre_service.py
-from typing import List, Dict, Optional
+import logging
+from typing import List, Dict, Optional, Set
 from uuid import UUID
 from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.shortcuts import get_object_or_404
 from core.models import User, Profil
 from organizations.models import Organisation, MembreOrganisation
 from core.api.exceptions import PermissionDeniedAPIException, NotFoundAPIException, BadRequestAPIException
 from organizations.services.organisation_service import OrganisationService
+from organizations.services.cache_tags import membres_tag
+from core.services.cache_service import cache_service
+
+logger = logging.getLogger('app')
 
 class MembreService:
     """
     Service containing the business logic for managing organisation members.
     """
+    MAX_BULK_ROWS = 1000
 
     @staticmethod
     def list_membres(org_id: UUID) -> List[MembreOrganisation]:
@@ -36,7 +44,7 @@ class MembreService:
         profil = get_object_or_404(Profil, id=profil_id)
 
         # Deactivate any existing membership for this profile
-        MembreOrganisation.objects.filter(profil=profil, organisation=organisation).update(est_actif=False)
+        MembreService._deactivate_memberships(organisation, [profil.id])
 
         # Create the new active membership
         new_membre = MembreOrganisation.objects.create(
@@ -47,6 +55,111 @@ class MembreService:
         )
         return new_membre
 
+    @staticmethod
+    def _deactivate_memberships(organisation: Organisation, profil_ids: List[UUID]) -> Set[UUID]:
+        """
+        Deactivates the active memberships of the given profiles in two set-based statements.
+        unique_together (profil, organisation, est_actif) allows a single inactive row per profile,
+        so the previous inactive row is dropped for the profiles whose active row is being archived.
+        Returns the ids of the profiles that had an active membership.
+        """
+        active_profil_ids = set(
+            MembreOrganisation.all_objects.filter(
+                organisation=organisation, profil_id__in=profil_ids, est_actif=True
+            ).values_list('profil_id', flat=True)
+        )
+        if active_profil_ids:
+            MembreOrganisation.all_objects.filter(
+                organisation=organisation, profil_id__in=active_profil_ids, est_actif=False
+            ).delete()
+            MembreOrganisation.all_objects.filter(
+                organisation=organisation, profil_id__in=active_profil_ids, est_actif=True
+            ).update(est_actif=False)
+        return active_profil_ids
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_add_membres(acting_user: User, org_id: UUID, rows: List[Dict]) -> List[Dict]:
+        """
+        Adds (or replaces) many members at once, e.g. from a partner's staff list.
+        Profiles are resolved by id or email in one query, then previous memberships are
+        deactivated and the new ones inserted in set-based statements.
+        Returns one result per input row, in input order.
+        """
+        organisation = get_object_or_404(Organisation, id=org_id, deleted=False)
+        if not OrganisationService._is_organisation_admin(acting_user, organisation):
+            raise PermissionDeniedAPIException("Vous n'avez pas la permission d'ajouter des membres à cette organisation.")
+        if len(rows) > MembreService.MAX_BULK_ROWS:
+            raise BadRequestAPIException(f"Un import est limité à {MembreService.MAX_BULK_ROWS} lignes.")
+
+        # 1. Résolution des profils (id ou email) en une seule requête
+        ids = {row['profil_id'] for row in rows if row.get('profil_id')}
+        emails = {row['email'].strip().lower() for row in rows if row.get('email') and not row.get('profil_id')}
+        profils = Profil.objects.annotate(email_lower=Lower('user__email')).filter(
+            Q(id__in=ids) | Q(email_lower__in=emails)
+        ).values_list('id', 'email_lower')
+        known_ids = set()
+        by_email = {}
+        for profil_id, email in profils:
+            known_ids.add(profil_id)
+            by_email[email] = profil_id
+
+        # 2. Validation ligne par ligne
+        valid_roles = [choice[0] for choice in MembreOrganisation.ROLE_CHOICES]
+        results = []
+        to_create = {}
+        for index, row in enumerate(rows):
+            result = {
+                'ligne': index + 1,
+                'profil_id': row.get('profil_id'),
+                'email': row.get('email'),
+                'statut': 'erreur',
+                'detail': None,
+            }
+            results.append(result)
+
+            if row.get('profil_id'):
+                profil_id = row['profil_id'] if row['profil_id'] in known_ids else None
+            elif row.get('email'):
+                profil_id = by_email.get(row['email'].strip().lower())
+            else:
+                result['detail'] = "Un identifiant de profil ou un email est requis."
+                continue
+
+            if profil_id is None:
+                result['detail'] = "Profil introuvable."
+            elif row['role_organisation'] not in valid_roles:
+                result['detail'] = f"Rôle invalide. Les rôles valides sont : {', '.join(valid_roles)}"
+            elif profil_id in to_create:
+                result['detail'] = f"Profil déjà présent à la ligne {to_create[profil_id][0]['ligne']}."
+            else:
+                result['profil_id'] = profil_id
+                to_create[profil_id] = (result, row)
+
+        # 3. Désactivation puis insertion ensemblistes
+        replaced = MembreService._deactivate_memberships(organisation, list(to_create))
+        MembreOrganisation.objects.bulk_create([
+            MembreOrganisation(
+                profil_id=profil_id,
+                organisation=organisation,
+                role_organisation=row['role_organisation'],
+                poste=row.get('poste'),
+                est_actif=True,
+            )
+            for profil_id, (_, row) in to_create.items()
+        ])
+        for profil_id, (result, _) in to_create.items():
+            result['statut'] = 'remplace' if profil_id in replaced else 'cree'
+
+        # bulk_create et update ne déclenchent pas les signaux d'invalidation du cache
+        cache_service.invalidate_tags_on_commit([membres_tag(organisation.id)])
+
+        logger.info(
+            f"Import de membres dans {organisation.id} par {acting_user.email} : "
+            f"{len(to_create)} ligne(s) importée(s) sur {len(rows)}."
+        )
+        return results
+
     @staticmethod
     @transaction.atomic
     def update_membre(acting_user: User, org_id: UUID, profil_id: UUID, data: Dict) -> MembreOrganisation:
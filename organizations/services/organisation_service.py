@@ -1,8 +1,13 @@
 # organizations/services/organisation_service.py
 import os
+import logging
+from datetime import timedelta
 from typing import List, Dict, Optional
 from uuid import UUID
-from django.db import transaction
+from django.db import transaction, connection
+from django.db.models import Q, Count
+from django.utils import timezone
+from django.contrib.postgres.search import TrigramSimilarity
 from django.shortcuts import get_object_or_404
 from django.core.files.uploadedfile import UploadedFile
 from django.core.files.storage import default_storage
@@ -11,11 +16,21 @@ from io import BytesIO
 from core.models import User
 from organizations.models import Organisation, MembreOrganisation
 from core.api.exceptions import PermissionDeniedAPIException, NotFoundAPIException, BadRequestAPIException
+from core.services.audit_service import audit_log_service, AuditLog
+from core.services.cache_service import cache_service
+from core.services.soft_delete_service import soft_delete_service
+from organizations.services.facette_service import FacetteService
+from organizations.services.cache_tags import organisation_tag, organisation_cache_tags, membres_tag, abonnes_tag
+from organizations.tasks import notify_organisation_decisions_task
+
+logger = logging.getLogger('app')
 
 class OrganisationService:
     """
     Service containing the business logic for managing organisations.
     """
+    DECISION_STATUSES = {'approuver': 'active', 'rejeter': 'inactive'}
+    MAX_BULK_DECISIONS = 500
     ALLOWED_LOGO_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp']
     MAX_LOGO_SIZE = 2 * 1024 * 1024  # 2MB
     LOGO_MAX_DIMENSIONS = (400, 400)
@@ -62,23 +77,51 @@ class OrganisationService:
         
         return new_organisation
 
+    @staticmethod
+    def _search_filter(search: str) -> Q:
+        """
+        Matches `search` against the name and the description.
+        On PostgreSQL, also matches by pg_trgm similarity (typo-tolerant, served by the GIN trigram indexes).
+        """
+        match = Q(nom_organisation__icontains=search) | Q(description__icontains=search)
+        if connection.vendor == 'postgresql':
+            return Q(nom_organisation__trigram_similar=search) | match
+        return match
+
+    @staticmethod
+    def _search_organisations(queryset, search: str):
+        """
+        Filters on `search`; on PostgreSQL, ranks by name similarity,
+        elsewhere falls back to the name order.
+        """
+        queryset = queryset.filter(OrganisationService._search_filter(search))
+        if connection.vendor == 'postgresql':
+            return queryset.annotate(
+                similarity=TrigramSimilarity('nom_organisation', search)
+            ).order_by('-similarity', 'nom_organisation')
+        return queryset.order_by('nom_organisation')
+
     @staticmethod
     def list_organisations(filters: Dict) -> List[Organisation]:
         """
         Lists all active organisations with optional filters.
         """
-        queryset = Organisation.objects.filter(statut='active', deleted=False)
-
-        # Add filtering logic here based on 'filters' dict
-        if 'search' in filters:
-            queryset = queryset.filter(nom_organisation__icontains=filters['search'])
-        if 'pays' in filters:
-            queryset = queryset.filter(pays__iexact=filters['pays'])
-        if 'secteur_activite' in filters:
-            queryset = queryset.filter(secteur_activite__icontains=filters['secteur_activite'])
+        queryset = FacetteService.filter_queryset(Organisation.objects.filter(statut='active', deleted=False), filters)
 
+        if filters.get('search'):
+            return OrganisationService._search_organisations(queryset, filters['search'])
         return queryset.order_by('nom_organisation')
 
+    @staticmethod
+    def list_facettes(filters: Dict) -> Dict[str, List[Dict]]:
+        """
+        Returns the directory facets for the given filters (see FacetteService.get_filtered_facettes).
+        """
+        queryset = Organisation.objects.filter(statut='active', deleted=False)
+        if filters.get('search'):
+            queryset = queryset.filter(OrganisationService._search_filter(filters['search']))
+        return FacetteService.get_filtered_facettes(queryset, filters)
+
     @staticmethod
     def list_pending_organisations(acting_user: User) -> List[Organisation]:
         """
@@ -88,6 +131,97 @@ class OrganisationService:
             raise PermissionDeniedAPIException("Vous n'avez pas la permission de voir les organisations en attente.")
         return Organisation.objects.filter(statut='en_attente', deleted=False).order_by('created_at')
 
+    @staticmethod
+    def count_pending_by_age() -> Dict[str, int]:
+        """
+        Counts pending organisations by waiting time, in a single aggregate query.
+        """
+        now = timezone.now()
+        day_ago = now - timedelta(days=1)
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        return Organisation.objects.filter(statut='en_attente', deleted=False).aggregate(
+            moins_24h=Count('id', filter=Q(created_at__gte=day_ago)),
+            de_1_a_7_jours=Count('id', filter=Q(created_at__lt=day_ago, created_at__gte=week_ago)),
+            de_7_a_30_jours=Count('id', filter=Q(created_at__lt=week_ago, created_at__gte=month_ago)),
+            plus_30_jours=Count('id', filter=Q(created_at__lt=month_ago)),
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_decide_pending_organisations(acting_user: User, org_ids: List[UUID], decision: str, request=None) -> Dict[str, List[UUID]]:
+        """
+        Approves or rejects many pending organisations at once. Restricted to site admins.
+        The status change is a single UPDATE; audit entries are written in one insert and
+        the notification emails are queued as one grouped job once the transaction commits.
+        """
+        if not OrganisationService._is_site_admin(acting_user):
+            raise PermissionDeniedAPIException("Seuls les administrateurs du site peuvent approuver ou rejeter des organisations.")
+        if decision not in OrganisationService.DECISION_STATUSES:
+            raise BadRequestAPIException(f"Décision invalide. Les décisions valides sont : {', '.join(OrganisationService.DECISION_STATUSES)}")
+        if len(org_ids) > OrganisationService.MAX_BULK_DECISIONS:
+            raise BadRequestAPIException(f"Vous ne pouvez traiter que {OrganisationService.MAX_BULK_DECISIONS} organisations à la fois.")
+
+        new_status = OrganisationService.DECISION_STATUSES[decision]
+        pending = list(
+            Organisation.objects.select_for_update().filter(
+                id__in=org_ids, statut='en_attente', deleted=False
+            ).only('id', 'nom_organisation', 'statut', 'deleted', *FacetteService.DIMENSIONS)
+        )
+        processed_ids = [organisation.id for organisation in pending]
+        if not processed_ids:
+            return {'traitees': [], 'ignorees': list(org_ids)}
+
+        Organisation.objects.filter(id__in=processed_ids).update(statut=new_status, updated_at=timezone.now())
+
+        # queryset.update ne déclenche pas les signaux : facettes et cache sont mis à jour ici
+        if new_status == 'active':
+            deltas = {}
+            for organisation in pending:
+                organisation.statut = new_status
+                for key in FacetteService._contributions(organisation):
+                    deltas[key] = deltas.get(key, 0) + 1
+            FacetteService.apply_deltas(deltas)
+        cache_service.invalidate_tags_on_commit(
+            ['organisations'] + [organisation_tag(org_id) for org_id in processed_ids]
+        )
+
+        audit_log_service.log_actions_bulk(
+            user=acting_user,
+            action=AuditLog.AuditAction.UPDATE,
+            entity_type='Organisation',
+            entries=[
+                {'entity_id': org_id, 'old_values': {'statut': 'en_attente'}, 'new_values': {'statut': new_status}}
+                for org_id in processed_ids
+            ],
+            request=request
+        )
+
+        noms = {organisation.id: organisation.nom_organisation for organisation in pending}
+        notifications = [
+            {
+                'email': admin['profil__user__email'],
+                'nom': admin['profil__nom_complet'],
+                'organisation': noms[admin['organisation_id']],
+            }
+            for admin in MembreOrganisation.objects.filter(
+                organisation_id__in=processed_ids,
+                role_organisation='administrateur_page',
+                est_actif=True
+            ).values('organisation_id', 'profil__nom_complet', 'profil__user__email')
+        ]
+        if notifications:
+            transaction.on_commit(lambda: notify_organisation_decisions_task(decision, notifications))
+
+        logger.info(
+            f"{len(processed_ids)} organisation(s) passée(s) au statut '{new_status}' par {acting_user.email}."
+        )
+        processed = set(processed_ids)
+        return {
+            'traitees': processed_ids,
+            'ignorees': [org_id for org_id in org_ids if org_id not in processed],
+        }
+
     @staticmethod
     def get_organisation_by_id(org_id: UUID) -> Organisation:
         """
@@ -184,15 +318,28 @@ class OrganisationService:
 
     @staticmethod
     @transaction.atomic
-    def soft_delete_organisation(acting_user: User, org_id: UUID):
+    def soft_delete_organisation(acting_user: User, org_id: UUID, dry_run: bool = False) -> Dict[str, int]:
         """
-        Soft deletes an organisation. Restricted to site admins.
+        Soft deletes an organisation with its members, followers, posts and offers. Restricted to site admins.
+        Returns the number of affected rows per model; with `dry_run`, nothing is deleted.
         """
         if not OrganisationService._is_site_admin(acting_user):
             raise PermissionDeniedAPIException("Seuls les administrateurs du site peuvent supprimer une organisation.")
 
         organisation = get_object_or_404(Organisation, id=org_id)
-        organisation.soft_delete()
+        if dry_run:
+            return soft_delete_service.soft_delete(Organisation.objects.filter(id=org_id), dry_run=True)
+
+        contributions = FacetteService._contributions(organisation)
+        counts = soft_delete_service.soft_delete(Organisation.objects.filter(id=org_id))
+
+        # La cascade est ensembliste et ne déclenche pas les signaux
+        FacetteService.apply_change(contributions, [])
+        cache_service.invalidate_tags_on_commit(
+            organisation_cache_tags(org_id) + [membres_tag(org_id), abonnes_tag(org_id)]
+        )
+        logger.info(f"Organisation {org_id} supprimée (soft delete) par {acting_user.email}.")
+        return counts
 
 # Instantiate the service
 organisation_service = OrganisationService()
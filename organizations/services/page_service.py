@@ -0,0 +1,152 @@
+# organizations/services/page_service.py
+import asyncio
+from typing import Any, Callable, Dict, List
+from uuid import UUID
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from core.services.cache_service import cache_service
+from organizations.models import MembreOrganisation, AbonnementOrganisation
+from organizations.services.organisation_service import OrganisationService
+from organizations.services.cache_tags import organisation_tag, membres_tag, abonnes_tag
+from feeds.models import Post, Evenement
+from opportunities.models import Stage, Emploi
+from organizations.api.schemas import OrganisationOutSchema, MembreOrganisationOutSchema
+from feeds.api.schemas import PostOutSchema, EvenementOutSchema
+from opportunities.api.schemas import StageOutSchema, EmploiOutSchema
+
+
+class OrganisationPageService:
+    """
+    Service assembling the organisation page in a single response.
+    Each section is cached separately, and the sections missing from the cache
+    are computed concurrently, each in its own thread and database connection.
+    """
+    MEMBRES_PREVIEW = 6
+    POSTS_LIMIT = 5
+    OFFRES_LIMIT = 5
+    EVENEMENTS_LIMIT = 5
+    # Posts, offres et événements n'ont pas encore d'invalidation par tag : durée de vie courte
+    CONTENUS_TIMEOUT = 60
+
+    @staticmethod
+    def _section(org_id: UUID, name: str, tags: List[str], compute: Callable[[], Any], timeout=None) -> Any:
+        key = cache_service.build_key('organisation_page', [org_id, name], tags)
+        return cache_service.get_or_set(key, compute, timeout)
+
+    @staticmethod
+    def get_organisation(org_id: UUID) -> Dict:
+        return OrganisationPageService._section(
+            org_id, 'organisation', [organisation_tag(org_id)],
+            lambda: OrganisationOutSchema.from_orm(OrganisationService.get_organisation_by_id(org_id)).model_dump(mode='json', by_alias=True)
+        )
+
+    @staticmethod
+    def get_compteurs(org_id: UUID) -> Dict:
+        return OrganisationPageService._section(
+            org_id, 'compteurs', [membres_tag(org_id), abonnes_tag(org_id)],
+            lambda: {
+                'membres': MembreOrganisation.objects.filter(organisation_id=org_id, est_actif=True).count(),
+                'abonnes': AbonnementOrganisation.objects.filter(organisation_id=org_id).count(),
+            }
+        )
+
+    @staticmethod
+    def get_membres(org_id: UUID) -> List[Dict]:
+        queryset = MembreOrganisation.objects.filter(
+            organisation_id=org_id, est_actif=True
+        ).select_related('profil').order_by('date_joindre')[:OrganisationPageService.MEMBRES_PREVIEW]
+        return OrganisationPageService._section(
+            org_id, 'membres', [membres_tag(org_id)],
+            lambda: [MembreOrganisationOutSchema.from_orm(membre).model_dump(mode='json', by_alias=True) for membre in queryset]
+        )
+
+    @staticmethod
+    def get_posts(org_id: UUID) -> List[Dict]:
+        queryset = Post.objects.filter(auteur_organisation_id=org_id).order_by('-created_at')[:OrganisationPageService.POSTS_LIMIT]
+        return OrganisationPageService._section(
+            org_id, 'posts', [organisation_tag(org_id)],
+            lambda: [PostOutSchema.from_orm(post).model_dump(mode='json', by_alias=True) for post in queryset],
+            OrganisationPageService.CONTENUS_TIMEOUT
+        )
+
+    @staticmethod
+    def active_stages(org_id: UUID) -> QuerySet[Stage]:
+        return Stage.objects.filter(
+            organisation_id=org_id, statut='active'
+        ).order_by('-created_at')[:OrganisationPageService.OFFRES_LIMIT]
+
+    @staticmethod
+    def active_emplois(org_id: UUID) -> QuerySet[Emploi]:
+        today = timezone.localdate()
+        return Emploi.objects.filter(
+            Q(date_expiration__isnull=True) | Q(date_expiration__gte=today),
+            organisation_id=org_id, statut='active'
+        ).order_by('-date_publication')[:OrganisationPageService.OFFRES_LIMIT]
+
+    @staticmethod
+    def get_offres(org_id: UUID) -> Dict:
+        stages = OrganisationPageService.active_stages(org_id)
+        emplois = OrganisationPageService.active_emplois(org_id)
+        return OrganisationPageService._section(
+            org_id, 'offres', [organisation_tag(org_id)],
+            lambda: {
+                'stages': [StageOutSchema.from_orm(stage).model_dump(mode='json', by_alias=True) for stage in stages],
+                'emplois': [EmploiOutSchema.from_orm(emploi).model_dump(mode='json', by_alias=True) for emploi in emplois],
+            },
+            OrganisationPageService.CONTENUS_TIMEOUT
+        )
+
+    @staticmethod
+    def get_evenements(org_id: UUID) -> List[Dict]:
+        queryset = Evenement.objects.filter(
+            organisateur_organisation_id=org_id, date_debut__gte=timezone.now()
+        ).order_by('date_debut')[:OrganisationPageService.EVENEMENTS_LIMIT]
+        return OrganisationPageService._section(
+            org_id, 'evenements', [organisation_tag(org_id)],
+            lambda: [EvenementOutSchema.from_orm(evenement).model_dump(mode='json', by_alias=True) for evenement in queryset],
+            OrganisationPageService.CONTENUS_TIMEOUT
+        )
+
+    @staticmethod
+    def _in_thread(section: Callable[[UUID], Any]) -> Callable[[UUID], Any]:
+        """
+        Runs a section in a worker thread and closes that thread's DB connections afterwards.
+        close_old_connections() would not do: it only drops connections past CONN_MAX_AGE or
+        broken, and a connection opened by a pool thread is never reused by a request.
+        """
+        def run(org_id: UUID) -> Any:
+            try:
+                return section(org_id)
+            finally:
+                connections.close_all()
+        return sync_to_async(run, thread_sensitive=False)
+
+    @staticmethod
+    async def get_page(org_id: UUID) -> Dict:
+        """
+        Returns every section of the organisation page.
+        The organisation itself is loaded first so an unknown or inactive organisation fails fast (404).
+        """
+        run = OrganisationPageService._in_thread
+        organisation = await run(OrganisationPageService.get_organisation)(org_id)
+        compteurs, membres, posts, offres, evenements = await asyncio.gather(
+            run(OrganisationPageService.get_compteurs)(org_id),
+            run(OrganisationPageService.get_membres)(org_id),
+            run(OrganisationPageService.get_posts)(org_id),
+            run(OrganisationPageService.get_offres)(org_id),
+            run(OrganisationPageService.get_evenements)(org_id),
+        )
+        return {
+            'organisation': organisation,
+            'compteurs': compteurs,
+            'membres': membres,
+            'posts': posts,
+            'stages': offres['stages'],
+            'emplois': offres['emplois'],
+            'evenements': evenements,
+        }
+
+# Instantiate the service
+organisation_page_service = OrganisationPageService()
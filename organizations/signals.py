@@ -0,0 +1,56 @@
+# organizations/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from organizations.models import Organisation, MembreOrganisation, AbonnementOrganisation
+from organizations.services.facette_service import FacetteService
+from core.services.cache_service import cache_service
+from organizations.services.cache_tags import organisation_cache_tags, membres_tag, abonnes_tag
+
+# Champs dont dépend la contribution d'une organisation aux facettes de l'annuaire
+FACETTE_FIELDS = set(FacetteService.DIMENSIONS) | {'statut', 'deleted'}
+
+
+def _touches_facettes(update_fields) -> bool:
+    return update_fields is None or bool(FACETTE_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=Organisation)
+def capture_organisation_facettes(sender, instance, update_fields=None, **kwargs):
+    """Mémorise les contributions actuellement en base avant l'enregistrement."""
+    if instance._state.adding or not _touches_facettes(update_fields):
+        instance._facettes_avant = None
+        return
+    instance._facettes_avant = FacetteService.snapshot(instance)
+
+
+@receiver(post_save, sender=Organisation)
+def update_organisation_facettes(sender, instance, created, update_fields=None, **kwargs):
+    """Applique la différence de contributions après l'enregistrement."""
+    old = [] if created else getattr(instance, '_facettes_avant', None)
+    if old is None:
+        return
+    FacetteService.apply_change(old, FacetteService._contributions(instance))
+
+
+@receiver(post_delete, sender=Organisation)
+def remove_organisation_facettes(sender, instance, **kwargs):
+    FacetteService.apply_change(FacetteService._contributions(instance), [])
+
+
+@receiver(post_save, sender=Organisation)
+@receiver(post_delete, sender=Organisation)
+def invalidate_organisation_cache(sender, instance, **kwargs):
+    """Détails, logo, statut ou suppression logique : toute écriture invalide le détail et l'annuaire."""
+    cache_service.invalidate_tags_on_commit(organisation_cache_tags(instance.pk))
+
+
+@receiver(post_save, sender=MembreOrganisation)
+@receiver(post_delete, sender=MembreOrganisation)
+def invalidate_membres_cache(sender, instance, **kwargs):
+    cache_service.invalidate_tags_on_commit([membres_tag(instance.organisation_id)])
+
+
+@receiver(post_save, sender=AbonnementOrganisation)
+@receiver(post_delete, sender=AbonnementOrganisation)
+def invalidate_abonnes_cache(sender, instance, **kwargs):
+    cache_service.invalidate_tags_on_commit([abonnes_tag(instance.organisation_id)])
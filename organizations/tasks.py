@@ -0,0 +1,50 @@
+# organizations/tasks.py
+import logging
+from typing import Dict, List
+from django.conf import settings
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, task
+from core.services.email_service import EmailService
+from organizations.services.facette_service import FacetteService
+
+logger = logging.getLogger('app')
+
+
+@db_periodic_task(crontab(minute='0', hour='3'))
+def rebuild_facettes_task():
+    """
+    Reconstruction nocturne des facettes de l'annuaire.
+    Rattrape les mises à jour en masse (queryset.update) qui ne déclenchent pas les signaux.
+    """
+    FacetteService.rebuild()
+
+
+@task()
+def notify_organisation_decisions_task(decision: str, notifications: List[Dict]):
+    """
+    Envoie, dans une seule tâche, les emails de décision d'une modération groupée
+    aux administrateurs de page des organisations traitées.
+    """
+    approved = decision == 'approuver'
+    sent = 0
+    for notification in notifications:
+        if approved:
+            title = f"Votre organisation {notification['organisation']} a été approuvée"
+            message = "Votre page est désormais visible dans l'annuaire ENSPM Hub."
+        else:
+            title = f"Votre organisation {notification['organisation']} n'a pas été approuvée"
+            message = "Contactez le support pour plus d'informations sur cette décision."
+
+        sent += EmailService.send_email_sync(
+            subject=title,
+            to_emails=[notification['email']],
+            template_name='emails/notification.html',
+            context={
+                'user_name': notification['nom'],
+                'notification_title': title,
+                'notification_message': message,
+                'action_url': f"{settings.SITE_URL}/organisations" if approved else None,
+                'action_text': "Voir l'annuaire" if approved else None,
+            }
+        )
+    logger.info(f"Notifications de modération envoyées : {sent}/{len(notifications)}.")
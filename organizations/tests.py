@@ -0,0 +1,306 @@
+import uuid
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from core.api.exceptions import NotFoundAPIException, PermissionDeniedAPIException
+from core.models import Profil, User
+from core.testing import create_user
+from feeds.models import Evenement, Post
+from organizations.models import AbonnementOrganisation, MembreOrganisation, Organisation, OrganisationFacette
+from organizations.services.membre_service import MembreService
+from organizations.services.organisation_service import OrganisationService
+from organizations.services.page_service import OrganisationPageService
+
+
+class ListQueryCountTests(TestCase):
+    """Le nombre de requêtes des listes ne dépend pas de la taille de la page."""
+    MEMBRES = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organisation = Organisation.objects.create(nom_organisation='ENSPM', type_organisation='universite', statut='active')
+        for i in range(cls.MEMBRES):
+            profil = create_user(f'membre{i}@example.com').profil  # type: ignore
+            MembreOrganisation.objects.create(profil=profil, organisation=cls.organisation, role_organisation='membre', est_actif=True)
+            AbonnementOrganisation.objects.create(profil=profil, organisation=cls.organisation)
+
+    def setUp(self):
+        cache.clear()
+
+    def assertConstantQueries(self, expected: int, url: str, param: str):
+        for page_size in (2, 25):
+            with self.assertNumQueries(expected):
+                response = self.client.get(url, {param: page_size})
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(len(body['items']), page_size)
+
+    def test_members_queries(self):
+        self.assertConstantQueries(3, f'/api/v1/organizations/{self.organisation.id}/members', 'limit')
+
+    def test_followers_queries(self):
+        self.assertConstantQueries(2, f'/api/v1/organizations/{self.organisation.id}/followers', 'page_size')
+
+
+class OrganisationPageTests(TransactionTestCase):
+    """Les sections sont calculées dans des threads du pool : les données doivent être validées (TransactionTestCase)."""
+
+    def setUp(self):
+        cache.clear()
+        self.organisation = Organisation.objects.create(nom_organisation='ENSPM', type_organisation='universite', statut='active')
+        for i in range(3):
+            profil = create_user(f'membre{i}@example.com').profil  # type: ignore
+            MembreOrganisation.objects.create(profil=profil, organisation=self.organisation, role_organisation='membre', est_actif=True)
+        AbonnementOrganisation.objects.create(profil=profil, organisation=self.organisation)
+        Post.objects.create(contenu='Annonce', auteur_organisation=self.organisation)
+        Evenement.objects.create(
+            titre='Conférence', description='Test', date_debut=timezone.now() + timezone.timedelta(days=1),
+            organisateur_organisation=self.organisation
+        )
+
+    async def test_sections_assembled_and_thread_connections_closed(self):
+        with mock.patch.object(connections, 'close_all', wraps=connections.close_all) as close_all:
+            page = await OrganisationPageService.get_page(self.organisation.id)
+        self.assertEqual(page['organisation']['id'], str(self.organisation.id))
+        self.assertEqual(page['compteurs'], {'membres': 3, 'abonnes': 1})
+        self.assertEqual(len(page['membres']), 3)
+        self.assertEqual(len(page['posts']), 1)
+        self.assertEqual(len(page['evenements']), 1)
+        self.assertEqual((page['stages'], page['emplois']), ([], []))
+        # Une fermeture par section, chacune dans son thread
+        self.assertEqual(close_all.call_count, 6)
+
+    async def test_unknown_organisation_fails_fast(self):
+        with self.assertRaises(NotFoundAPIException):
+            await OrganisationPageService.get_page(uuid.uuid4())
+
+
+class BulkAddMembresTests(TestCase):
+    def setUp(self):
+        self.organisation = Organisation.objects.create(nom_organisation='ENSPM', type_organisation='universite', statut='active')
+        self.admin = create_user('admin@example.com')
+        MembreOrganisation.objects.create(profil=self.admin.profil, organisation=self.organisation, role_organisation='administrateur_page')
+        self.alice = create_user('alice@example.com').profil  # type: ignore
+        self.carol = create_user('carol@example.com').profil  # type: ignore
+        # Carol a déjà un historique : une adhésion archivée et une adhésion active
+        self.ancienne = MembreOrganisation.objects.create(
+            profil=self.carol, organisation=self.organisation, poste='Stagiaire', est_actif=False
+        )
+        self.actuelle = MembreOrganisation.objects.create(profil=self.carol, organisation=self.organisation, poste='Ingénieure')
+
+    def test_results_per_row(self):
+        results = MembreService.bulk_add_membres(self.admin, self.organisation.id, [
+            {'email': ' Alice@Example.com ', 'role_organisation': 'employe'},
+            {'profil_id': self.carol.id, 'role_organisation': 'administrateur_page', 'poste': 'Directrice'},
+            {'email': 'inconnu@example.com', 'role_organisation': 'employe'},
+            {'profil_id': uuid.uuid4(), 'role_organisation': 'employe'},
+            {'profil_id': self.alice.id, 'role_organisation': 'employe'},
+            {'email': 'admin@example.com', 'role_organisation': 'president'},
+            {'role_organisation': 'employe'},
+        ])
+        self.assertEqual([result['ligne'] for result in results], list(range(1, 8)))
+        self.assertEqual(
+            [result['statut'] for result in results],
+            ['cree', 'remplace', 'erreur', 'erreur', 'erreur', 'erreur', 'erreur']
+        )
+        self.assertEqual(results[0]['profil_id'], self.alice.id)
+        self.assertEqual(results[2]['detail'], "Profil introuvable.")
+        self.assertEqual(results[3]['detail'], "Profil introuvable.")
+        self.assertEqual(results[4]['detail'], "Profil déjà présent à la ligne 1.")
+        self.assertTrue(results[5]['detail'].startswith("Rôle invalide."))
+        self.assertEqual(results[6]['detail'], "Un identifiant de profil ou un email est requis.")
+        # La ligne en double n'a pas créé de seconde adhésion
+        self.assertEqual(MembreOrganisation.objects.filter(profil=self.alice, organisation=self.organisation).count(), 1)
+
+    def test_replacement_archives_the_active_row_and_drops_the_old_archive(self):
+        MembreService.bulk_add_membres(self.admin, self.organisation.id, [
+            {'profil_id': self.carol.id, 'role_organisation': 'administrateur_page', 'poste': 'Directrice'},
+        ])
+        rows = MembreOrganisation.all_objects.filter(profil=self.carol, organisation=self.organisation)
+        self.assertEqual(
+            sorted(rows.values_list('est_actif', 'poste')), [(False, 'Ingénieure'), (True, 'Directrice')]
+        )
+        # unique_together (profil, organisation, est_actif) : l'ancienne archive est supprimée réellement
+        self.assertFalse(MembreOrganisation.all_objects.filter(id=self.ancienne.id).exists())
+        self.assertEqual(MembreOrganisation.all_objects.get(id=self.actuelle.id).est_actif, False)
+
+    def test_duplicate_rows_keep_the_first(self):
+        results = MembreService.bulk_add_membres(self.admin, self.organisation.id, [
+            {'email': 'carol@example.com', 'role_organisation': 'employe', 'poste': 'Première'},
+            {'profil_id': self.carol.id, 'role_organisation': 'employe', 'poste': 'Seconde'},
+        ])
+        self.assertEqual([result['statut'] for result in results], ['remplace', 'erreur'])
+        self.assertEqual(MembreOrganisation.objects.get(profil=self.carol, est_actif=True).poste, 'Première')
+
+    def test_only_page_admins_can_import(self):
+        with self.assertRaises(PermissionDeniedAPIException):
+            MembreService.bulk_add_membres(self.alice.user, self.organisation.id, [
+                {'profil_id': self.alice.id, 'role_organisation': 'administrateur_page'},
+            ])
+        self.assertFalse(MembreOrganisation.objects.filter(profil=self.alice).exists())
+
+
+class PartialIndexPlanTests(TestCase):
+    """Chaque requête de service passe par son index partiel (le plan EXPLAIN le nomme)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(email='admin@example.com', est_actif=True, role_systeme='admin_site')
+        cls.organisation = Organisation.objects.create(nom_organisation='ENSPM', type_organisation='universite', statut='active')
+        cls.profil = create_user('membre@example.com').profil  # type: ignore
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Sur des tables de test presque vides, PostgreSQL préfère un parcours séquentiel
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_organisation_queries(self):
+        self.assertUsesIndex(OrganisationService.list_organisations({}), 'organisation_active_nom_idx')
+        self.assertUsesIndex(OrganisationService.list_pending_organisations(self.admin), 'organisation_attente_idx')
+
+    def test_membre_queries(self):
+        self.assertUsesIndex(MembreService.list_membres(self.organisation.id), 'membre_org_actif_idx')
+        self.assertUsesIndex(
+            MembreOrganisation.objects.filter(profil=self.profil, est_actif=True).values_list('organisation_id', flat=True),
+            'membre_profil_actif_idx'
+        )
+
+    def test_offre_queries(self):
+        self.assertUsesIndex(OrganisationPageService.active_stages(self.organisation.id), 'stage_active_org_date_idx')
+        self.assertUsesIndex(OrganisationPageService.active_emplois(self.organisation.id), 'emploi_active_org_date_idx')
+
+
+class DirectoryFacettesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for nom, type_organisation, ville in [
+            ('ENSPM', 'universite', 'Maroua'),
+            ('Université de Maroua', 'universite', 'maroua '),
+            ('Polytechnique', 'universite', 'Yaoundé'),
+            ('Cimencam', 'entreprise', 'MAROUA'),
+            ('Fermée', 'entreprise', 'Maroua'),
+        ]:
+            Organisation.objects.create(
+                nom_organisation=nom, type_organisation=type_organisation, ville=ville,
+                statut='inactive' if nom == 'Fermée' else 'active'
+            )
+
+    def setUp(self):
+        # Les réponses de l'annuaire sont mises en cache et l'invalidation attend un commit qui n'arrive pas en TestCase
+        cache.clear()
+
+    def facettes(self, **filters):
+        response = self.client.get('/api/v1/organizations/', filters)
+        self.assertEqual(response.status_code, 200)
+        return {
+            dimension: {facette['valeur']: facette['total'] for facette in valeurs}
+            for dimension, valeurs in response.json()['facettes'].items()
+        }
+
+    def test_values_are_case_insensitive(self):
+        self.assertEqual(
+            set(OrganisationFacette.objects.filter(dimension='ville').values_list('valeur', 'total')),
+            {('maroua', 3), ('yaoundé', 1)}
+        )
+        self.assertEqual(self.facettes()['ville'], {'maroua': 3, 'yaoundé': 1})
+
+    def test_counts_follow_the_other_filters(self):
+        facettes = self.facettes(ville='Maroua')
+        # Les villes restent comptées sans leur propre filtre, mais avec les autres
+        self.assertEqual(facettes['ville'], {'maroua': 3, 'yaoundé': 1})
+        self.assertEqual(facettes['type_organisation'], {'universite': 2, 'entreprise': 1})
+
+        facettes = self.facettes(ville='maroua', type_organisation='entreprise')
+        self.assertEqual(facettes['ville'], {'maroua': 1})
+        self.assertEqual(facettes['type_organisation'], {'universite': 2, 'entreprise': 1})
+
+    def test_non_ascii_values_filter_and_count(self):
+        """LOWER() de SQLite ignore les lettres accentuées : la facette 'ébolowa' doit quand même filtrer."""
+        Organisation.objects.create(nom_organisation='Lycée', type_organisation='autre', ville='Ébolowa ', statut='active')
+        Organisation.objects.create(nom_organisation='Mairie', type_organisation='autre', ville='ÉBOLOWA', statut='active')
+        self.assertEqual(self.facettes()['ville']['ébolowa'], 2)
+        for ville in ('Ébolowa', 'ébolowa'):
+            response = self.client.get('/api/v1/organizations/', {'ville': ville})
+            self.assertEqual(sorted(item['nom_organisation'] for item in response.json()['items']), ['Lycée', 'Mairie'])
+            self.assertEqual(self.facettes(ville=ville)['type_organisation'], {'autre': 2})
+
+    def test_counts_follow_the_search(self):
+        facettes = self.facettes(search='Maroua')
+        self.assertEqual(facettes['ville'], {'maroua': 1})
+        self.assertEqual(facettes['type_organisation'], {'universite': 1})
+
+
+class BulkDecisionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('admin@example.com')
+        User.objects.filter(id=cls.admin.id).update(role_systeme='admin_site')
+        cls.admin.refresh_from_db()
+
+    def create_pending(self, count: int):
+        organisations = []
+        for i in range(count):
+            organisation = Organisation.objects.create(
+                nom_organisation=f'Demande {len(self.created) + i}', type_organisation='startup', ville='Garoua', statut='en_attente'
+            )
+            responsable = create_user(f'responsable{len(self.created) + i}@example.com')
+            MembreOrganisation.objects.create(
+                profil=responsable.profil, organisation=organisation, role_organisation='administrateur_page', est_actif=True  # type: ignore
+            )
+            organisations.append(organisation)
+        self.created.extend(organisations)
+        return [organisation.id for organisation in organisations]
+
+    def setUp(self):
+        self.created = []
+
+    def decide(self, org_ids, decision='approuver'):
+        with mock.patch('organizations.services.organisation_service.notify_organisation_decisions_task') as notify:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = OrganisationService.bulk_decide_pending_organisations(self.admin, org_ids, decision)
+        return result, notify
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        # Facettes déjà présentes : seule la création d'une nouvelle valeur coûte des requêtes en plus
+        Organisation.objects.create(nom_organisation='Existante', type_organisation='startup', ville='Garoua', statut='active')
+        counts = []
+        for size in (2, 8):
+            org_ids = self.create_pending(size)
+            with CaptureQueriesContext(connection) as queries:
+                self.decide(org_ids)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_processed_and_skipped_split(self):
+        pending = self.create_pending(2)
+        already_active = Organisation.objects.create(nom_organisation='Active', type_organisation='startup', statut='active')
+        deleted = Organisation.objects.create(nom_organisation='Supprimée', type_organisation='startup', statut='en_attente')
+        deleted.soft_delete()
+        unknown = uuid.uuid4()
+
+        result, _notify = self.decide(pending + [already_active.id, deleted.id, unknown], decision='rejeter')
+        self.assertEqual(set(result['traitees']), set(pending))
+        self.assertEqual(result['ignorees'], [already_active.id, deleted.id, unknown])
+        self.assertEqual(set(Organisation.objects.filter(id__in=pending).values_list('statut', flat=True)), {'inactive'})
+
+    def test_approval_updates_facets_and_notifies_once(self):
+        org_ids = self.create_pending(3)
+        result, notify = self.decide(org_ids)
+        self.assertEqual(len(result['traitees']), 3)
+        self.assertEqual(OrganisationFacette.objects.get(dimension='ville', valeur='garoua').total, 3)
+
+        notify.assert_called_once()
+        decision, notifications = notify.call_args.args
+        self.assertEqual(decision, 'approuver')
+        self.assertEqual(
+            sorted(notification['email'] for notification in notifications),
+            [f'responsable{i}@example.com' for i in range(3)]
+        )